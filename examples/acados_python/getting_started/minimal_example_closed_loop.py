@@ -136,17 +136,11 @@ def main(use_RTI=False):
 
         if use_RTI:
             # preparation phase
-            ocp_solver.options_set('rti_phase', 1)
-            status = ocp_solver.solve()
+            status = ocp_solver.prepare()
             t_preparation[i] = ocp_solver.get_stats('time_tot')
 
-            # set initial state
-            ocp_solver.set(0, "lbx", simX[i, :])
-            ocp_solver.set(0, "ubx", simX[i, :])
-
-            # feedback phase
-            ocp_solver.options_set('rti_phase', 2)
-            status = ocp_solver.solve()
+            # set initial state and run feedback phase
+            status = ocp_solver.feedback(x0=simX[i, :])
             t_feedback[i] = ocp_solver.get_stats('time_tot')
 
             simU[i, :] = ocp_solver.get(0, "u")
@@ -68,6 +68,10 @@ def main():
         simX[i+1,:] = acados_integrator.simulate(x=simX[i,:], u=u0, xdot=xdot_init)
 
     S_forw = acados_integrator.get("S_forw")
+
+    # native rollout has to match the step-wise simulation
+    simX_traj = acados_integrator.simulate_trajectory(x0, np.tile(u0, (N_sim, 1)))
+    assert np.allclose(simX_traj, simX, atol=1e-6)
     print("S_forw, sensitivities of simulation result wrt x,u:\n", S_forw)
 
     plot_pendulum(np.linspace(0, N_sim*Tf, N_sim+1), 10, np.repeat(u0, N_sim), simX,
@@ -128,6 +128,8 @@ def main():
     multiphase_ocp.solver_options.tf = Tf
     multiphase_ocp.solver_options.nlp_solver_tol_eq = 1e-4
     multiphase_ocp.solver_options.nlp_solver_tol_ineq = 1e-4
+    # generate external functions in parallel
+    multiphase_ocp.solver_options.ext_fun_codegen_num_processes = 2
 
     multiphase_ocp.mocp_opts.integrator_type = ['DISCRETE', 'DISCRETE']
 
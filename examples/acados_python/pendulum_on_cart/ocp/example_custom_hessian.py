@@ -141,4 +141,10 @@ print(iterate.x_traj)
 iterates = ocp_solver.get_iterates()
 # print(iterates.iterate_traj[-1])
 
+# the flat iterates have to be consistent with the stage-wise trajectories
+x_iterates = iterates.as_array("x")
+assert x_iterates.shape == (ocp_solver.get_stats('nlp_iter')+1, N+1, nx)
+assert np.array_equal(x_iterates[iteration], np.array(iterate.x_traj))
+assert np.array_equal(iterates.as_array("u")[iteration], np.array(iterates.iterate_list[iteration].u_traj))
+
 plot_pendulum(np.linspace(0, Tf, N+1), Fmax, simU, simX, latexify=False)
@@ -140,6 +140,18 @@ def main():
         simU[i,:] = ocp_solver.get(i, "u")
     simX[N,:] = ocp_solver.get(N, "x")
 
+    # test allocation free getters with preallocated output buffers
+    X_buffer = np.zeros((N+1, nx))
+    U_buffer = np.zeros((N, nu))
+    x_buffer = np.zeros((nx,))
+    ocp_solver.get_trajectory("x", out=X_buffer)
+    ocp_solver.get_trajectory("u", out=U_buffer)
+    ocp_solver.get(N, "x", out=x_buffer)
+    assert np.allclose(X_buffer, simX)
+    assert np.allclose(U_buffer, simU)
+    assert np.allclose(x_buffer, simX[N,:])
+    assert np.allclose(ocp_solver.get_trajectory("pi"), ocp_solver.get_flat("pi").reshape((N, nx)))
+
     ocp_solver.print_statistics() # encapsulates: stat = ocp_solver.get_stats("statistics")
 
     cost = ocp_solver.get_cost()
@@ -45,6 +45,8 @@ This example shows how the AcadosOcpBatchSolver can be used to parallelize multi
 If you want to use the batch solver, make sure to compile acados with openmp and num_threads set to 1,
 i.e. with the flags -DACADOS_WITH_OPENMP=ON -DACADOS_NUM_THREADS=1
 The number of threads for the batch solver is then set via the option `num_threads_in_batch_solve`, see below.
+Alternatively, a solver generated with `num_threads_in_batch_solve = 1` can be parallelized on a Python thread pool
+via the argument `num_threads` of the batch solver, which does not require acados to be compiled with openmp.
 """
 
 def setup_ocp(num_threads_in_batch_solve=1, tol=1e-7):
@@ -119,15 +121,21 @@ def main_sequential(x0, N_sim, tol):
     return simX, simU
 
 
-def main_batch(Xinit, simU, tol, num_threads_in_batch_solve=1):
+def main_batch(Xinit, simU, tol, num_threads_in_batch_solve=1, num_threads=1):
 
     N_batch = Xinit.shape[0] - 1
     ocp = setup_ocp(num_threads_in_batch_solve, tol)
-    batch_solver = AcadosOcpBatchSolver(ocp, N_batch, verbose=False)
+    t0 = time.time()
+    batch_solver = AcadosOcpBatchSolver(ocp, N_batch, verbose=False, num_threads=num_threads)
+    t_elapsed = 1e3 * (time.time() - t0)
 
-    for n in range(N_batch):
-        batch_solver.ocp_solvers[n].constraints_set(0, "lbx", Xinit[n])
-        batch_solver.ocp_solvers[n].constraints_set(0, "ubx", Xinit[n])
+    print(f"main_batch: with {num_threads_in_batch_solve} openmp and {num_threads} python threads, create batch solver: {t_elapsed:.3f}ms")
+
+    # set initial state constraints in one call
+    batch_solver.set_x0(Xinit[:N_batch])
+    for n in [0, N_batch-1]:
+        if not np.array_equal(batch_solver.ocp_solvers[n].constraints_get(0, "lbx"), Xinit[n]):
+            raise Exception(f"set_x0 did not set lbx at stage 0 for {n}th solver")
 
     # set initial guess
     Xinit_batch = np.array([np.tile(Xinit[i], (ocp.solver_options.N_horizon+1,)) for i in range(N_batch)])
@@ -135,21 +143,40 @@ def main_batch(Xinit, simU, tol, num_threads_in_batch_solve=1):
     batch_solver.set_flat('x', Xinit_batch)
     t_elapsed = 1e3 * (time.time() - t0)
 
-    print(f"main_batch: with {num_threads_in_batch_solve} threads, set_flat: {t_elapsed:.3f}ms")
+    print(f"main_batch: with {num_threads_in_batch_solve} openmp and {num_threads} python threads, set_flat: {t_elapsed:.3f}ms")
 
     # solve
     t0 = time.time()
     batch_solver.solve()
     t_elapsed = 1e3 * (time.time() - t0)
 
-    print(f"main_batch: with {num_threads_in_batch_solve} threads, solve: {t_elapsed:.3f}ms")
+    print(f"main_batch: with {num_threads_in_batch_solve} openmp and {num_threads} python threads, solve: {t_elapsed:.3f}ms")
+
+    status = batch_solver.get_status()
+    if not np.all(status == 0) or any(solver.status != s for solver, s in zip(batch_solver.ocp_solvers, status)):
+        raise Exception(f"batch solve failed or status not consistent, got {status}")
+
+    print(f"main_batch: time per thread: {1e3 * batch_solver.time_per_thread} ms")
 
     U_batch = batch_solver.get_flat("u")
 
+    # the number of threads can be changed at runtime
+    batch_solver.set_flat('x', Xinit_batch)
+    batch_solver.solve(num_threads=2)
+    if not np.all(batch_solver.get_status() == 0) or batch_solver.time_per_thread.shape != (2,):
+        raise Exception(f"batch solve with 2 threads failed, got status {batch_solver.get_status()}")
+
     for n in range(N_batch):
         if not np.linalg.norm(U_batch[n, :ocp.dims.nu] -simU[n]) < tol*10:
             raise Exception(f"solution should match sequential call up to {tol*10} got error {np.linalg.norm(u-simU[n])} for {n}th batch solve")
 
+    # sweep over more initial states than solvers in the batch
+    X0_sweep = np.vstack((Xinit[:N_batch], Xinit[:N_batch//2]))
+    U0_sweep, status_sweep, time_sweep = batch_solver.solve_for_x0_batch(X0_sweep)
+    print(f"main_batch: solve_for_x0_batch for {X0_sweep.shape[0]} initial states, total solve time: {1e3 * np.sum(time_sweep):.3f}ms")
+    if not np.all(status_sweep == 0) or not np.allclose(U0_sweep, np.vstack((simU[:N_batch], simU[:N_batch//2])), atol=tol*10):
+        raise Exception(f"solve_for_x0_batch does not match sequential solves, got status {status_sweep}")
+
 
 if __name__ == "__main__":
 
@@ -161,4 +188,5 @@ if __name__ == "__main__":
 
     main_batch(Xinit=simX, simU=simU, tol=tol, num_threads_in_batch_solve=1)
     main_batch(Xinit=simX, simU=simU, tol=tol, num_threads_in_batch_solve=4)
+    main_batch(Xinit=simX, simU=simU, tol=tol, num_threads_in_batch_solve=1, num_threads=4)
 
@@ -44,6 +44,8 @@ This example shows how the AcadosSimBatchSolver can be used to parallelize mulit
 If you want to use the batch solver, make sure to compile acados with openmp and num_threads set to 1,
 i.e. with the flags -DACADOS_WITH_OPENMP=ON -DACADOS_NUM_THREADS=1
 The number of threads for the batch solver is then set via the option `num_threads_in_batch_solve`, see below.
+Alternatively, an integrator generated with `num_threads_in_batch_solve = 1` can be parallelized on a Python thread pool
+via the argument `num_threads` of the batch solver, which does not require acados to be compiled with openmp.
 """
 
 
@@ -82,26 +84,40 @@ def main_sequential(x0, u0, N_sim):
     return simX
 
 
-def main_batch(Xinit, u0, num_threads_in_batch_solve=1):
+def main_batch(Xinit, u0, num_threads_in_batch_solve=1, num_threads=1):
 
     N_batch = Xinit.shape[0] - 1
     sim = setup_integrator(num_threads_in_batch_solve)
-    batch_integrator = AcadosSimBatchSolver(sim, N_batch, verbose=False)
+    batch_integrator = AcadosSimBatchSolver(sim, N_batch, verbose=False, num_threads=num_threads)
 
-    for n in range(N_batch):
-        batch_integrator.sim_solvers[n].set("u", u0)
-        batch_integrator.sim_solvers[n].set("x", Xinit[n])
+    U = np.tile(u0, (N_batch, 1))
+    batch_integrator.set_batch("u", U)
+    batch_integrator.set_batch("x", Xinit[:N_batch])
 
     t0 = time.time()
     batch_integrator.solve()
     t_elapsed = 1e3 * (time.time() - t0)
 
-    print(f"main_batch: with {num_threads_in_batch_solve} threads, timing: {t_elapsed:.3f}ms")
+    print(f"main_batch: with {num_threads_in_batch_solve} openmp and {num_threads} python threads, timing: {t_elapsed:.3f}ms")
 
     for n in range(N_batch):
         x = batch_integrator.sim_solvers[n].get("x")
         assert np.linalg.norm(x-Xinit[n+1]) < 1e-10
 
+    assert np.linalg.norm(batch_integrator.get_batch("x") - Xinit[1:]) < 1e-10
+
+    # set, solve and get in one call
+    X_next = batch_integrator.simulate_batch(Xinit[:N_batch], U)
+    assert np.linalg.norm(X_next - Xinit[1:]) < 1e-10
+
+    # batched sensitivities
+    S_forw = batch_integrator.get_batch("S_forw")
+    Sx = batch_integrator.get_batch("Sx")
+    nx = Xinit.shape[1]
+    for n in [0, N_batch-1]:
+        assert np.array_equal(S_forw[n], batch_integrator.sim_solvers[n].get("S_forw"))
+        assert np.array_equal(Sx[n], S_forw[n][:, :nx])
+
 
 if __name__ == "__main__":
 
@@ -113,4 +129,5 @@ if __name__ == "__main__":
 
     main_batch(Xinit=simX, u0=u0, num_threads_in_batch_solve=1)
     main_batch(Xinit=simX, u0=u0, num_threads_in_batch_solve=4)
+    main_batch(Xinit=simX, u0=u0, num_threads_in_batch_solve=1, num_threads=4)
 
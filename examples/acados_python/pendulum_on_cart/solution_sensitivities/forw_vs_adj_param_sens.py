@@ -177,6 +177,15 @@ def main(qp_solver_ric_alg: int, use_cython=False, generate_solvers=True, plot_t
         else:
             print(f"Success: adj_p_vec and adj_p_mat[{i}, :] match!")
 
+    # test dense forward sensitivities at all stages
+    out_dict = sensitivity_solver.eval_solution_sensitivity(list(range(N_horizon+1)), "p_global")
+    out_dict_all_stages = sensitivity_solver.eval_solution_sensitivity_all_stages("p_global")
+    if not np.array_equal(out_dict_all_stages['sens_x'], np.array(out_dict['sens_x'])):
+        raise Exception("sens_x of eval_solution_sensitivity_all_stages and eval_solution_sensitivity should match.")
+    if not np.array_equal(out_dict_all_stages['sens_u'], np.array(out_dict['sens_u'])):
+        raise Exception("sens_u of eval_solution_sensitivity_all_stages and eval_solution_sensitivity should match.")
+    print("Success: dense forward sensitivities match!")
+
     if plot_trajectory:
         nx = ocp.dims.nx
         nu = ocp.dims.nu
@@ -90,7 +90,7 @@ def main_batch(Xinit, simU, param_vals, adjoints_ref, tol, num_threads_in_batch_
         batch_solver.ocp_solvers[n].constraints_set(0, "lbx", Xinit[n])
         batch_solver.ocp_solvers[n].constraints_set(0, "ubx", Xinit[n])
         batch_solver.ocp_solvers[n].reset()
-        batch_solver.ocp_solvers[n].set_p_global_and_precompute_dependencies(param_vals[n])
+    batch_solver.set_p_global_and_precompute_dependencies(np.array(param_vals))
     t_elapsed = 1e3 * (time.time() - t0)
 
     print(f"main_batch: with {num_threads_in_batch_solve} threads, reset, set x_0 and p_global: {t_elapsed:.3f} ms")
@@ -120,6 +120,40 @@ def main_batch(Xinit, simU, param_vals, adjoints_ref, tol, num_threads_in_batch_
         if not diff < tol:
             raise Exception(f"solution should match sequential call up to {tol} got error {diff} for {n}th batch solve")
 
+    # eval forward sensitivities, contracted with the adjoint seeds
+    t0 = time.time()
+    sens_forw = batch_solver.eval_solution_sensitivity_all_stages("p_global")
+    t_elapsed = 1e3 * (time.time() - t0)
+
+    print(f"main_batch: with {num_threads_in_batch_solve} threads, forward solution sens: {t_elapsed:.3f} ms\n")
+
+    sens_adj_from_forw = np.sum(sens_forw["sens_x"][:, 1], axis=1) + np.sum(sens_forw["sens_u"][:, 1], axis=1)
+    diff = np.max(np.abs(sens_adj_from_forw - sens_adj[:, 0, :]))
+    if not diff < 1e-10:
+        raise Exception(f"forward and adjoint solution sensitivities should match, got error {diff}")
+
+    # sparse parameter updates, for all solvers and for a single one
+    p_flat = batch_solver.get_flat("p")
+    p_ref = p_flat.reshape(N_batch, ocp.solver_options.N_horizon+1, ocp.dims.np).copy()
+    values = np.tile(np.arange(N_batch, dtype=np.float64).reshape(N_batch, 1, 1), (1, ocp.solver_options.N_horizon+1, 1))
+    batch_solver.set_params_sparse(np.array([0]), values)
+    p_ref[:, :, 0] = values[:, :, 0]
+    batch_solver.set_params_sparse(np.array([0]), np.array([-1.0]), stages=[0], batch_index=3)
+    p_ref[3, 0, 0] = -1.0
+    if not np.array_equal(batch_solver.get_flat("p"), p_ref.reshape(N_batch, -1)):
+        raise Exception("set_params_sparse did not set the expected parameter values.")
+    batch_solver.set_flat("p", p_flat)
+
+    # shared p_global, the dependencies are only evaluated once
+    batch_solver.set_p_global_and_precompute_dependencies(param_vals[0])
+    batch_solver.set_x0(np.tile(Xinit[0], (N_batch, 1)))
+    for solver in batch_solver.ocp_solvers:
+        solver.reset()
+    batch_solver.solve()
+    diff = np.max(np.abs(batch_solver.get_flat("u")[:, :ocp.dims.nu] - simU[0]))
+    if not diff < tol:
+        raise Exception(f"solution with shared p_global should match sequential call up to {tol} got error {diff}")
+
 
 if __name__ == "__main__":
 
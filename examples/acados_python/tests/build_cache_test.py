@@ -0,0 +1,166 @@
+#
+# Copyright (c) The acados authors.
+#
+# This file is part of acados.
+#
+# The 2-Clause BSD License
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.;
+#
+
+import sys
+sys.path.insert(0, '../pendulum_on_cart/common')
+sys.path.insert(0, '../generic_dyn_disc')
+
+import os
+import shutil
+import time
+
+from acados_template import AcadosOcp, AcadosOcpSolver
+from pendulum_model import export_pendulum_ode_model
+from main import linear_mass_spring_model
+import numpy as np
+import scipy.linalg
+import casadi as ca
+
+BUILD_CACHE_DIR = 'acados_build_cache'
+
+
+def setup_ocp(Fmax=80):
+
+    ocp = AcadosOcp()
+    ocp.model = export_pendulum_ode_model()
+
+    ocp.solver_options.N_horizon = 20
+    ocp.solver_options.tf = 1.0
+
+    Q_mat = 2*np.diag([1e3, 1e3, 1e-2, 1e-2])
+    R_mat = 2*np.diag([1e-2])
+
+    ocp.cost.cost_type = 'NONLINEAR_LS'
+    ocp.cost.cost_type_e = 'NONLINEAR_LS'
+    ocp.cost.W = scipy.linalg.block_diag(Q_mat, R_mat)
+    ocp.cost.W_e = Q_mat
+    ocp.model.cost_y_expr = ca.vertcat(ocp.model.x, ocp.model.u)
+    ocp.model.cost_y_expr_e = ocp.model.x
+    ocp.cost.yref = np.zeros((5,))
+    ocp.cost.yref_e = np.zeros((4,))
+
+    ocp.constraints.lbu = np.array([-Fmax])
+    ocp.constraints.ubu = np.array([+Fmax])
+    ocp.constraints.idxbu = np.array([0])
+    ocp.constraints.x0 = np.array([0.0, np.pi, 0.0, 0.0])
+
+    ocp.solver_options.qp_solver = 'PARTIAL_CONDENSING_HPIPM'
+    ocp.solver_options.hessian_approx = 'GAUSS_NEWTON'
+    ocp.solver_options.integrator_type = 'ERK'
+    ocp.solver_options.nlp_solver_type = 'SQP'
+
+    return ocp
+
+
+def create_solver(Fmax=80):
+    ocp = setup_ocp(Fmax)
+    ocp.code_export_directory = 'c_generated_code_build_cache'
+    t0 = time.time()
+    solver = AcadosOcpSolver(ocp, json_file='acados_ocp_build_cache.json', verbose=False, build_cache_dir=BUILD_CACHE_DIR)
+    t_elapsed = time.time() - t0
+    return solver, t_elapsed
+
+
+def solve(solver):
+    status = solver.solve()
+    if status != 0:
+        raise Exception(f'acados returned status {status}.')
+    return solver.get_flat('u')
+
+
+def main():
+    if os.path.exists(BUILD_CACHE_DIR):
+        shutil.rmtree(BUILD_CACHE_DIR)
+
+    # cache miss: generate, build and store in cache
+    solver, t_miss = create_solver()
+    u_ref = solve(solver)
+    del solver
+    if len(os.listdir(BUILD_CACHE_DIR)) != 1:
+        raise Exception(f'expected exactly one build cache entry, got {os.listdir(BUILD_CACHE_DIR)}.')
+
+    # cache hit: load cached library
+    solver, t_hit = create_solver()
+    u_hit = solve(solver)
+    del solver
+    print(f'solver creation with cache miss: {t_miss:.3f}s, with cache hit: {t_hit:.3f}s')
+    if not np.allclose(u_ref, u_hit):
+        raise Exception('solution obtained with cached solver differs from reference.')
+    if len(os.listdir(BUILD_CACHE_DIR)) != 1:
+        raise Exception(f'expected exactly one build cache entry, got {os.listdir(BUILD_CACHE_DIR)}.')
+
+    # changed problem: new cache entry
+    solver, _ = create_solver(Fmax=40)
+    solve(solver)
+    del solver
+    if len(os.listdir(BUILD_CACHE_DIR)) != 2:
+        raise Exception(f'expected two build cache entries after changing the problem, got {os.listdir(BUILD_CACHE_DIR)}.')
+
+    shutil.rmtree(BUILD_CACHE_DIR)
+    print('build cache test passed.')
+
+
+def create_generic_dynamics_solver():
+    ocp = linear_mass_spring_model(casadi_dynamics=False, casadi_cost=True)
+    ocp.code_export_directory = 'c_generated_code_build_cache_generic'
+    ocp.solver_options.print_level = 0
+    return AcadosOcpSolver(ocp, json_file='acados_ocp_build_cache_generic.json', verbose=False, build_cache_dir=BUILD_CACHE_DIR)
+
+
+def main_generic_source():
+    if os.path.exists(BUILD_CACHE_DIR):
+        shutil.rmtree(BUILD_CACHE_DIR)
+
+    # the generic dynamics source is referenced relative to the working directory
+    shutil.copyfile('../generic_dyn_disc/generic_disc_dyn.c', 'generic_disc_dyn.c')
+
+    solver = create_generic_dynamics_solver()
+    del solver
+    solver = create_generic_dynamics_solver()
+    del solver
+    if len(os.listdir(BUILD_CACHE_DIR)) != 1:
+        raise Exception(f'expected exactly one build cache entry, got {os.listdir(BUILD_CACHE_DIR)}.')
+
+    # edited source file: cache miss
+    with open('generic_disc_dyn.c', 'a') as f:
+        f.write('\n// edited\n')
+    solver = create_generic_dynamics_solver()
+    del solver
+    if len(os.listdir(BUILD_CACHE_DIR)) != 2:
+        raise Exception(f'expected two build cache entries after editing the generic dynamics source, got {os.listdir(BUILD_CACHE_DIR)}.')
+
+    os.remove('generic_disc_dyn.c')
+    shutil.rmtree(BUILD_CACHE_DIR)
+    print('build cache test with generic source passed.')
+
+
+if __name__ == '__main__':
+    main()
+    main_generic_source()
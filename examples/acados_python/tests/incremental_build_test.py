@@ -0,0 +1,78 @@
+#
+# Copyright (c) The acados authors.
+#
+# This file is part of acados.
+#
+# The 2-Clause BSD License
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.;
+#
+
+import glob
+import os
+
+from acados_template import AcadosOcpSolver
+import numpy as np
+from build_cache_test import setup_ocp
+
+
+def get_model_object_timestamps(code_export_directory):
+    object_files = glob.glob(os.path.join(code_export_directory, '*_model', '*.o'))
+    if len(object_files) == 0:
+        raise Exception(f'no model object files found in {code_export_directory}.')
+    return {f: os.path.getmtime(f) for f in object_files}
+
+
+def main():
+    ocp = setup_ocp()
+    ocp.code_export_directory = 'c_generated_code_incremental_build'
+    solver = AcadosOcpSolver(ocp, json_file='acados_ocp_incremental_build.json', verbose=False, incremental_build=True)
+    solver.solve()
+    u_ref = solver.get_flat('u')
+    del solver
+    timestamps_ref = get_model_object_timestamps(ocp.code_export_directory)
+
+    # change the control weight: only the solver source changes, the model functions are unchanged
+    ocp = setup_ocp()
+    ocp.code_export_directory = 'c_generated_code_incremental_build'
+    W = ocp.cost.W.copy()
+    W[4, 4] *= 100
+    ocp.cost.W = W
+    solver = AcadosOcpSolver(ocp, json_file='acados_ocp_incremental_build.json', verbose=False, incremental_build=True)
+    status = solver.solve()
+    if status != 0:
+        raise Exception(f'acados returned status {status}.')
+    u = solver.get_flat('u')
+    del solver
+
+    timestamps = get_model_object_timestamps(ocp.code_export_directory)
+    if timestamps != timestamps_ref:
+        raise Exception('incremental build recompiled unchanged model functions.')
+    if np.allclose(u, u_ref):
+        raise Exception('solution should change after changing the cost weights, solver library was not rebuilt.')
+
+    print('incremental build test passed.')
+
+
+if __name__ == '__main__':
+    main()
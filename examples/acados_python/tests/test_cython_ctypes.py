@@ -28,7 +28,11 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.;
 #
+import os
 import sys
+import time
+import asyncio
+import weakref
 
 sys.path.insert(0, '../pendulum_on_cart/common')
 
@@ -40,6 +44,10 @@ from utils import plot_pendulum
 
 PLOT = False
 
+async def solve_in_event_loop(ocp_solver):
+    return await asyncio.wrap_future(ocp_solver.solve_async())
+
+
 def main(interface_type='ctypes'):
 
     # create ocp object to formulate the OCP
@@ -137,6 +145,79 @@ def main(interface_type='ctypes'):
         simU0[i, :] = ocp_solver.get(i, "u")
     simX0[N_horizon, :] = ocp_solver.get(N_horizon, "x")
 
+    # bulk getters have to be consistent with stage-wise getters
+    assert np.array_equal(ocp_solver.get_trajectory("x"), simX0)
+    assert np.array_equal(ocp_solver.get_flat("u"), simU0.flatten())
+    x_buffer = np.zeros((N_horizon + 1, nx))
+    ocp_solver.get_trajectory("x", out=x_buffer)
+    assert np.array_equal(x_buffer, simX0)
+    u_buffer = np.zeros((nu,))
+    ocp_solver.get(1, "u", out=u_buffer)
+    assert np.array_equal(u_buffer, simU0[1])
+
+    # iterate objects
+    flat_iterate = ocp_solver.store_iterate_to_flat_obj()
+    iterate = ocp_solver.store_iterate_to_obj()
+    ocp_solver.set_flat("x", np.zeros_like(flat_iterate.x))
+    ocp_solver.set_stages("u", np.zeros((N_horizon, nu)))
+    ocp_solver.load_iterate_from_flat_obj(flat_iterate)
+    assert np.array_equal(ocp_solver.get_flat("x"), flat_iterate.x)
+    ocp_solver.load_iterate_from_obj(iterate)
+    assert np.array_equal(ocp_solver.get_flat("u"), flat_iterate.u)
+
+    if interface_type == 'ctypes':
+        # warm start shifting
+        ocp_solver.shift_iterate(u_terminal=np.zeros((nu,)))
+        assert np.array_equal(ocp_solver.get_trajectory("x"), np.vstack((simX0[1:], simX0[-1:])))
+        assert np.array_equal(ocp_solver.get_flat("u"), np.append(simU0[1:].flatten(), 0.0))
+        ocp_solver.load_iterate_from_obj(iterate)
+
+        # binary iterate storage
+        ocp_solver.store_iterate(filename='final_iterate_ctypes.npz', overwrite=True, verbose=False)
+        ocp_solver.load_iterate(filename='final_iterate_ctypes.npz', verbose=False)
+        assert np.array_equal(ocp_solver.get_flat("x"), flat_iterate.x)
+        if os.path.isfile('iterates_ctypes.bin'):
+            os.remove('iterates_ctypes.bin')
+        for _ in range(3):
+            ocp_solver.append_iterate_to_binary('iterates_ctypes.bin')
+        iterates = ocp_solver.read_iterates_from_binary('iterates_ctypes.bin')
+        assert iterates.N_batch == 3 and np.array_equal(iterates.lam[2], flat_iterate.lam)
+        # raw records without header are rejected
+        np.concatenate([flat_iterate.x, flat_iterate.u, flat_iterate.z, flat_iterate.sl, flat_iterate.su, flat_iterate.pi, flat_iterate.lam]).tofile('iterates_ctypes.bin')
+        try:
+            ocp_solver.read_iterates_from_binary('iterates_ctypes.bin')
+            raise AssertionError('read_iterates_from_binary should fail for a file without header.')
+        except Exception as e:
+            assert 'not a binary iterate file' in str(e)
+
+        # asynchronous solve, started from the solution
+        status_async, time_tot = asyncio.run(solve_in_event_loop(ocp_solver))
+        assert status_async == 0 and time_tot >= 0
+        assert np.allclose(ocp_solver.get_trajectory("x"), simX0)
+
+        # drop a solver while its asynchronous solve is pending, it is then deleted by the worker thread
+        unraisable = []
+        unraisablehook_bkp = sys.unraisablehook
+        sys.unraisablehook = unraisable.append
+        async_solver = AcadosOcpSolver(ocp, json_file='acados_ocp.json', build=False, generate=False, verbose=False)
+        async_solver_ref = weakref.ref(async_solver)
+        future = async_solver.solve_async()
+        del async_solver
+        assert future.result()[0] == 0
+        t0 = time.time()
+        while async_solver_ref() is not None and time.time() - t0 < 10.0:
+            time.sleep(1e-3)
+        sys.unraisablehook = unraisablehook_bkp
+        assert async_solver_ref() is None
+        assert len(unraisable) == 0, f"deleting the solver raised {unraisable[0].exc_value}"
+
+    # cost and constraints getters
+    assert np.array_equal(ocp_solver.cost_get(1, "W"), ocp.cost.W)
+    assert np.array_equal(ocp_solver.constraints_get(1, "ubu"), ocp.constraints.ubu)
+
+    qp_diagnostics = ocp_solver.qp_diagnostics()
+    print(f"{interface_type}: condition number of last QP Hessian {qp_diagnostics['condition_number_global']:.3e}")
+
     ocp_solver.store_iterate(filename=f'final_iterate_{interface_type}_variant{nvariant}.json', overwrite=True)
 
     if PLOT:# plot but don't halt
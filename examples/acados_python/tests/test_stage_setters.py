@@ -0,0 +1,143 @@
+#
+# Copyright (c) The acados authors.
+#
+# This file is part of acados.
+#
+# The 2-Clause BSD License
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.;
+#
+
+import sys
+sys.path.insert(0, '../pendulum_on_cart/common')
+
+from acados_template import AcadosOcp, AcadosOcpSolver
+from pendulum_model import export_pendulum_ode_model
+import numpy as np
+import scipy.linalg
+
+
+def setup_ocp(N=20):
+    ocp = AcadosOcp()
+    ocp.model = export_pendulum_ode_model()
+    nx = ocp.model.x.rows()
+    nu = ocp.model.u.rows()
+    ny = nx + nu
+
+    ocp.solver_options.N_horizon = N
+    ocp.solver_options.tf = 1.0
+
+    Q = 2*np.diag([1e3, 1e3, 1e-2, 1e-2])
+    R = 2*np.diag([1e-2])
+    ocp.cost.cost_type = 'LINEAR_LS'
+    ocp.cost.cost_type_e = 'LINEAR_LS'
+    ocp.cost.W = scipy.linalg.block_diag(Q, R)
+    ocp.cost.W_e = Q
+    ocp.cost.Vx = np.zeros((ny, nx))
+    ocp.cost.Vx[:nx,:nx] = np.eye(nx)
+    ocp.cost.Vu = np.zeros((ny, nu))
+    ocp.cost.Vu[nx, 0] = 1.0
+    ocp.cost.Vx_e = np.eye(nx)
+    ocp.cost.yref = np.zeros((ny, ))
+    ocp.cost.yref_e = np.zeros((nx, ))
+
+    Fmax = 80
+    ocp.constraints.lbu = np.array([-Fmax])
+    ocp.constraints.ubu = np.array([+Fmax])
+    ocp.constraints.idxbu = np.array([0])
+    ocp.constraints.lbx = np.array([-5.0])
+    ocp.constraints.ubx = np.array([5.0])
+    ocp.constraints.idxbx = np.array([0])
+    ocp.constraints.x0 = np.array([0.0, np.pi, 0.0, 0.0])
+
+    ocp.solver_options.qp_solver = 'PARTIAL_CONDENSING_HPIPM'
+    ocp.solver_options.hessian_approx = 'GAUSS_NEWTON'
+    ocp.solver_options.integrator_type = 'ERK'
+    ocp.solver_options.nlp_solver_type = 'SQP'
+
+    return ocp
+
+
+def main():
+    ocp = setup_ocp()
+    ocp.code_export_directory = 'c_generated_code_stage_setters'
+    ocp_solver = AcadosOcpSolver(ocp, json_file='acados_ocp_stage_setters.json', verbose=False)
+    N = ocp.solver_options.N_horizon
+    nx = ocp.dims.nx
+    nu = ocp.dims.nu
+
+    rng = np.random.default_rng(0)
+    yref = 0.1 * rng.standard_normal((N, nx + nu))
+    ubx = 4.0 + rng.random((N-1, 1))
+    ubu = 70.0 + rng.random((N, 1))
+    x_init = np.tile(ocp.constraints.x0, (N+1, 1))
+
+    # reference: stage-wise setters
+    for i in range(N):
+        ocp_solver.cost_set(i, 'yref', yref[i])
+        ocp_solver.constraints_set(i, 'ubu', ubu[i])
+    for i in range(1, N):
+        ocp_solver.constraints_set(i, 'ubx', ubx[i-1])
+    for i in range(N+1):
+        ocp_solver.set(i, 'x', x_init[i])
+    status = ocp_solver.solve()
+    if status != 0:
+        raise Exception(f'acados returned status {status}.')
+    X_ref = ocp_solver.get_trajectory('x')
+    U_ref = ocp_solver.get_trajectory('u')
+
+    # reset and set everything again with batched stage setters
+    ocp_solver.reset()
+    for i in range(N):
+        ocp_solver.cost_set(i, 'yref', np.zeros(nx + nu))
+        ocp_solver.constraints_set(i, 'ubu', ocp.constraints.ubu)
+
+    ocp_solver.set_stages('yref', yref, stages=range(N))
+    ocp_solver.set_stages('ubu', ubu)
+    ocp_solver.set_stages('ubx', ubx, stages=range(1, N))
+    ocp_solver.set_stages('x', x_init)
+
+    for i in range(N):
+        assert np.allclose(ocp_solver.cost_get(i, 'yref'), yref[i])
+        assert np.allclose(ocp_solver.constraints_get(i, 'ubu'), ubu[i])
+
+    status = ocp_solver.solve()
+    if status != 0:
+        raise Exception(f'acados returned status {status}.')
+
+    if not np.allclose(ocp_solver.get_trajectory('x'), X_ref) or not np.allclose(ocp_solver.get_trajectory('u'), U_ref):
+        raise Exception('solution obtained with set_stages() does not match solution obtained with stage-wise setters.')
+
+    # test wrong dimensions
+    try:
+        ocp_solver.set_stages('ubu', ubu[:-1])
+    except Exception as e:
+        print(f'caught expected exception: {e}')
+    else:
+        raise Exception('set_stages() should raise an exception for wrong dimensions.')
+
+    print('test_stage_setters: success')
+
+
+if __name__ == '__main__':
+    main()
@@ -1290,6 +1290,66 @@ void ocp_nlp_eval_param_sens(ocp_nlp_solver *solver, char *field, int stage, int
     return;
 }
 
+
+
+void ocp_nlp_eval_param_sens_all(ocp_nlp_solver *solver, char *field, int n_seeds, ocp_nlp_out *sens_nlp_out,
+        double *sens_x, double *sens_u, double *sens_pi, double *sens_lam, double *sens_sl, double *sens_su,
+        double *time_solution_sens)
+{
+    ocp_nlp_config *config = solver->config;
+    ocp_nlp_dims *dims = solver->dims;
+
+    int N = dims->N;
+    const char *fields[6] = {"x", "u", "pi", "lam", "sl", "su"};
+    double *outs[6] = {sens_x, sens_u, sens_pi, sens_lam, sens_sl, sens_su};
+    int n_fields = 6;
+    int ii, jj, kk, ll, last_stage, dim, offset, max_dim = 0;
+    double time_seed;
+
+    for (jj = 0; jj < n_fields; jj++)
+    {
+        last_stage = strcmp(fields[jj], "u") && strcmp(fields[jj], "pi") ? N : N-1;
+        for (ii = 0; ii <= last_stage; ii++)
+        {
+            dim = ocp_nlp_dims_get_from_attr(config, dims, sens_nlp_out, ii, fields[jj]);
+            max_dim = dim > max_dim ? dim : max_dim;
+        }
+    }
+    double *tmp = malloc(max_dim * sizeof(double));
+
+    if (time_solution_sens != NULL)
+        *time_solution_sens = 0.0;
+
+    // the factorization of the last QP is reused for all seeds
+    for (kk = 0; kk < n_seeds; kk++)
+    {
+        ocp_nlp_eval_param_sens(solver, field, 0, kk, sens_nlp_out);
+        if (time_solution_sens != NULL)
+        {
+            ocp_nlp_get(solver, "time_solution_sensitivities", &time_seed);
+            *time_solution_sens += time_seed;
+        }
+
+        // write column kk of the row-major blocks (dim, n_seeds), stacked over the stages
+        for (jj = 0; jj < n_fields; jj++)
+        {
+            if (outs[jj] == NULL)
+                continue;
+            last_stage = strcmp(fields[jj], "u") && strcmp(fields[jj], "pi") ? N : N-1;
+            offset = 0;
+            for (ii = 0; ii <= last_stage; ii++)
+            {
+                dim = ocp_nlp_dims_get_from_attr(config, dims, sens_nlp_out, ii, fields[jj]);
+                ocp_nlp_out_get(config, dims, sens_nlp_out, ii, fields[jj], tmp);
+                for (ll = 0; ll < dim; ll++)
+                    outs[jj][offset + ll*n_seeds + kk] = tmp[ll];
+                offset += dim * n_seeds;
+            }
+        }
+    }
+    free(tmp);
+}
+
 void ocp_nlp_eval_lagrange_grad_p(ocp_nlp_solver *solver, ocp_nlp_in *nlp_in, const char *field, double *out)
 {
     solver->config->eval_lagr_grad_p(solver->config, solver->dims, nlp_in, solver->opts, solver->mem, solver->work, field, out);
@@ -1542,6 +1602,32 @@ void ocp_nlp_get_from_iterate(ocp_nlp_solver *solver, int iter, int stage, const
 }
 
 
+void ocp_nlp_get_all_from_iterates(ocp_nlp_solver *solver, int first_iter, int n_iter, const char *field, double *value)
+{
+    ocp_nlp_config *config = solver->config;
+    ocp_nlp_memory *nlp_mem;
+    ocp_nlp_dims *dims = solver->dims;
+
+    config->get(config, solver->dims, solver->mem, "nlp_mem", &nlp_mem);
+
+    ocp_nlp_opts *nlp_opts;
+    config->opts_get(config, solver->dims, solver->opts, "nlp_opts", &nlp_opts);
+
+    if (!nlp_opts->store_iterates)
+    {
+        printf("\nerror: ocp_nlp_get_all_from_iterates: store_iterates needs to be set to true in order to get iterates.\n");
+        exit(1);
+    }
+
+    // one row of the concatenation over all stages per iteration
+    int size = ocp_nlp_dims_get_total_from_attr(config, dims, field);
+    for (int ii = 0; ii < n_iter; ii++)
+    {
+        ocp_nlp_get_all(solver, NULL, nlp_mem->iterates[first_iter + ii], field, value + ii*size);
+    }
+}
+
+
 void ocp_nlp_get_all(ocp_nlp_solver *solver, ocp_nlp_in *in, ocp_nlp_out *out, const char *field, void *value)
 {
     ocp_nlp_dims *dims = solver->dims;
@@ -1747,6 +1833,107 @@ void ocp_nlp_set_all(ocp_nlp_solver *solver, ocp_nlp_in *in, ocp_nlp_out *out, c
 }
 
 
+void ocp_nlp_set_stages(ocp_nlp_solver *solver, ocp_nlp_in *in, ocp_nlp_out *out, const char *field,
+        const int *stages, int n_stages, void *value)
+{
+    ocp_nlp_config *config = solver->config;
+    ocp_nlp_dims *dims = solver->dims;
+
+    double *double_values = value;
+    int tmp_offset = 0;
+    int N = dims->N;
+    int tmp_int, stage, ii;
+
+    for (ii = 0; ii < n_stages; ii++)
+    {
+        stage = stages[ii];
+        if (stage < 0 || stage > N || (stage == N && !strcmp(field, "pi")))
+        {
+            printf("\nerror: ocp_nlp_set_stages: invalid stage %d for field %s\n", stage, field);
+            exit(1);
+        }
+        tmp_int = ocp_nlp_dims_get_from_attr(config, dims, out, stage, field);
+
+        if (!strcmp(field, "p"))
+        {
+            ocp_nlp_in_set(config, dims, in, stage, "parameter_values", double_values + tmp_offset);
+        }
+        else if (!strcmp(field, "yref") || !strcmp(field, "y_ref"))
+        {
+            ocp_nlp_cost_model_set(config, dims, in, stage, "yref", double_values + tmp_offset);
+        }
+        else if (!strcmp(field, "lbx") || !strcmp(field, "ubx") || !strcmp(field, "lbu") || !strcmp(field, "ubu") ||
+                 !strcmp(field, "lg") || !strcmp(field, "ug") || !strcmp(field, "lh") || !strcmp(field, "uh"))
+        {
+            ocp_nlp_constraints_model_set(config, dims, in, stage, field, double_values + tmp_offset);
+        }
+        else if (!strcmp(field, "x") || !strcmp(field, "u") || !strcmp(field, "pi") || !strcmp(field, "lam") ||
+                 !strcmp(field, "sl") || !strcmp(field, "su"))
+        {
+            ocp_nlp_out_set(config, dims, out, stage, field, double_values + tmp_offset);
+        }
+        else if (!strcmp(field, "z"))
+        {
+            ocp_nlp_out_set(config, dims, out, stage, field, double_values + tmp_offset);
+            // also set z_guess, when setting z.
+            ocp_nlp_set(solver, stage, "z_guess", double_values + tmp_offset);
+        }
+        else
+        {
+            printf("\nerror: ocp_nlp_set_stages: field %s not available\n", field);
+            exit(1);
+        }
+        tmp_offset += tmp_int;
+    }
+}
+
+
+void ocp_nlp_shift_iterate(ocp_nlp_solver *solver, ocp_nlp_out *out, double *x_N, double *u_N)
+{
+    ocp_nlp_config *config = solver->config;
+    ocp_nlp_dims *dims = solver->dims;
+
+    int N = dims->N;
+    const char *fields[7] = {"x", "u", "z", "pi", "lam", "sl", "su"};
+    int n_fields = 7;
+    int ii, jj, last_stage, dim, max_dim = 0;
+
+    for (jj = 0; jj < n_fields; jj++)
+    {
+        last_stage = strcmp(fields[jj], "pi") ? N : N-1;
+        for (ii = 0; ii <= last_stage; ii++)
+        {
+            dim = ocp_nlp_dims_get_from_attr(config, dims, out, ii, fields[jj]);
+            max_dim = dim > max_dim ? dim : max_dim;
+        }
+    }
+    double *tmp = malloc(max_dim * sizeof(double));
+
+    for (jj = 0; jj < n_fields; jj++)
+    {
+        last_stage = strcmp(fields[jj], "pi") ? N : N-1;
+        for (ii = 0; ii < last_stage; ii++)
+        {
+            // stages with differing dimensions, e.g. lam at stage 0 and N, keep their values
+            dim = ocp_nlp_dims_get_from_attr(config, dims, out, ii, fields[jj]);
+            if (dim > 0 && dim == ocp_nlp_dims_get_from_attr(config, dims, out, ii+1, fields[jj]))
+            {
+                ocp_nlp_out_get(config, dims, out, ii+1, fields[jj], tmp);
+                ocp_nlp_out_set(config, dims, out, ii, fields[jj], tmp);
+                if (!strcmp(fields[jj], "z"))
+                    ocp_nlp_set(solver, ii, "z_guess", tmp);
+            }
+        }
+    }
+    free(tmp);
+
+    if (x_N != NULL)
+        ocp_nlp_out_set(config, dims, out, N, "x", x_N);
+    if (u_N != NULL)
+        ocp_nlp_out_set(config, dims, out, N-1, "u", u_N);
+}
+
+
 void ocp_nlp_set(ocp_nlp_solver *solver, int stage, const char *field, void *value)
 {
     ocp_nlp_memory *mem;
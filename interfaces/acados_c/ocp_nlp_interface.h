@@ -311,12 +311,29 @@ ACADOS_SYMBOL_EXPORT void ocp_nlp_get_at_stage(ocp_nlp_solver *solver, int stage
 
 ACADOS_SYMBOL_EXPORT void ocp_nlp_get_from_iterate(ocp_nlp_solver *solver, int iter, int stage, const char *field, void *value);
 
+/// Gets the concatenation of field over all stages for the stored iterates first_iter, ..., first_iter+n_iter-1
+/// as n_iter consecutive rows, the field "p" is not supported.
+ACADOS_SYMBOL_EXPORT void ocp_nlp_get_all_from_iterates(ocp_nlp_solver *solver, int first_iter, int n_iter, const char *field, double *value);
+
 
 ACADOS_SYMBOL_EXPORT void ocp_nlp_get_all(ocp_nlp_solver *solver, ocp_nlp_in *in, ocp_nlp_out *out, const char *field, void *value);
 
 
 ACADOS_SYMBOL_EXPORT void ocp_nlp_set_all(ocp_nlp_solver *solver, ocp_nlp_in *in, ocp_nlp_out *out, const char *field, void *value);
 
+/// Sets a field at multiple stages, the values for all stages are concatenated in value.
+/// \param field The name of the field, either x, u, z, pi, lam, sl, su, p, yref, lbx, ubx, lbu, ubu, lg, ug, lh, uh.
+/// \param stages Array of stage indices.
+/// \param n_stages Number of stages.
+ACADOS_SYMBOL_EXPORT void ocp_nlp_set_stages(ocp_nlp_solver *solver, ocp_nlp_in *in, ocp_nlp_out *out, const char *field,
+        const int *stages, int n_stages, void *value);
+
+/// Shifts the primal-dual iterate by one stage for warm starting, i.e. stage i takes the values of stage i+1.
+/// Values at stages with differing dimensions are kept, in particular the values at the last stage are duplicated.
+/// \param x_N Optional guess for the states at stage N, NULL to keep the current values.
+/// \param u_N Optional guess for the controls at stage N-1, NULL to keep the current values.
+ACADOS_SYMBOL_EXPORT void ocp_nlp_shift_iterate(ocp_nlp_solver *solver, ocp_nlp_out *out, double *x_N, double *u_N);
+
 
 // TODO(andrea): remove this once/if the MATLAB interface uses the new setters below?
 ACADOS_SYMBOL_EXPORT int ocp_nlp_dims_get_from_attr(ocp_nlp_config *config, ocp_nlp_dims *dims, ocp_nlp_out *out,
@@ -430,6 +447,12 @@ ACADOS_SYMBOL_EXPORT void ocp_nlp_eval_residuals(ocp_nlp_solver *solver, ocp_nlp
 //
 ACADOS_SYMBOL_EXPORT void ocp_nlp_eval_param_sens(ocp_nlp_solver *solver, char *field, int stage, int index, ocp_nlp_out *sens_nlp_out);
 
+// Evaluates the solution sensitivities for all n_seeds directions of field and writes the ones with non-NULL pointers
+// as row-major blocks of shape (dim, n_seeds) stacked over the stages; the time is summed into time_solution_sens if non-NULL.
+ACADOS_SYMBOL_EXPORT void ocp_nlp_eval_param_sens_all(ocp_nlp_solver *solver, char *field, int n_seeds, ocp_nlp_out *sens_nlp_out,
+        double *sens_x, double *sens_u, double *sens_pi, double *sens_lam, double *sens_sl, double *sens_su,
+        double *time_solution_sens);
+
 // Computes the gradient of the Lagrange function wrt parameters
 ACADOS_SYMBOL_EXPORT void ocp_nlp_eval_lagrange_grad_p(ocp_nlp_solver *solver, ocp_nlp_in *nlp_in, const char *field, double *out);
 
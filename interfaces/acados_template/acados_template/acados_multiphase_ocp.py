@@ -43,7 +43,7 @@ from .acados_ocp_constraints import AcadosOcpConstraints
 from .acados_ocp_options import AcadosOcpOptions, INTEGRATOR_TYPES, COLLOCATION_TYPES, COST_DISCRETIZATION_TYPES
 from .acados_ocp import AcadosOcp
 from .casadi_function_generation import GenerateContext
-from .utils import make_object_json_dumpable, get_acados_path, format_class_dict, get_shared_lib_ext, render_template, is_empty
+from .utils import make_object_json_dumpable, get_acados_path, format_class_dict, get_shared_lib_ext, render_template_list, is_empty
 
 
 def find_non_default_fields_of_obj(obj: Union[AcadosOcpCost, AcadosOcpConstraints, AcadosOcpOptions], stage_type='all') -> list:
@@ -389,7 +389,7 @@ class AcadosMultiphaseOcp:
         template_list.append(('main_multi.in.c', f'main_{name}.c'))
         template_list.append(('acados_multi_solver.in.h', f'acados_solver_{name}.h'))
         template_list.append(('acados_multi_solver.in.c', f'acados_solver_{name}.c'))
-        # template_list.append(('acados_solver.in.pxd', f'acados_solver.pxd'))
+        template_list.append(('acados_solver.in.pxd', f'acados_solver.pxd'))
         if cmake_builder is not None:
             template_list.append(('multi_CMakeLists.in.txt', 'CMakeLists.txt'))
         else:
@@ -419,9 +419,7 @@ class AcadosMultiphaseOcp:
             tmp_json_path = os.path.abspath(dummy_ocp.json_file)
 
             # render templates
-            for tup in template_list:
-                output_dir = self.code_export_directory if len(tup) <= 2 else tup[2]
-                render_template(tup[0], tup[1], output_dir, tmp_json_path)
+            render_template_list(template_list, self.code_export_directory, tmp_json_path)
 
         print("rendered model templates successfully")
 
@@ -434,9 +432,7 @@ class AcadosMultiphaseOcp:
         template_list = self.__get_template_list(cmake_builder=cmake_builder)
 
         # Render templates
-        for tup in template_list:
-            output_dir = self.code_export_directory if len(tup) <= 2 else tup[2]
-            render_template(tup[0], tup[1], output_dir, json_path)
+        render_template_list(template_list, self.code_export_directory, json_path)
 
         # # Custom templates
         # acados_template_path = os.path.dirname(os.path.abspath(__file__))
@@ -448,7 +444,7 @@ class AcadosMultiphaseOcp:
         return
 
 
-    def generate_external_functions(self) -> GenerateContext:
+    def generate_external_functions(self, verbose: bool = False) -> GenerateContext:
 
         # options for code generation
         code_gen_opts = dict()
@@ -456,6 +452,8 @@ class AcadosMultiphaseOcp:
         code_gen_opts['with_solution_sens_wrt_params'] = self.solver_options.with_solution_sens_wrt_params
         code_gen_opts['with_value_sens_wrt_params'] = self.solver_options.with_value_sens_wrt_params
         code_gen_opts['code_export_directory'] = self.code_export_directory
+        code_gen_opts['num_processes'] = self.solver_options.ext_fun_codegen_num_processes
+        code_gen_opts['verbose'] = verbose
 
         context = GenerateContext(self.model[0].p_global, self.name, code_gen_opts)
 
@@ -45,7 +45,7 @@ from .acados_ocp_constraints import AcadosOcpConstraints
 from .acados_dims import AcadosOcpDims
 from .acados_ocp_options import AcadosOcpOptions
 
-from .utils import (get_acados_path, format_class_dict, make_object_json_dumpable, render_template,
+from .utils import (get_acados_path, format_class_dict, make_object_json_dumpable, render_template_list,
                     get_shared_lib_ext, is_column, is_empty, casadi_length, check_if_square,
                     check_casadi_version)
 from .penalty_utils import symmetric_huber_penalty, one_sided_huber_penalty
@@ -1008,15 +1008,12 @@ class AcadosOcp:
         template_list = self.__get_template_list(cmake_builder=cmake_builder)
 
         # Render templates
-        for tup in template_list:
-            output_dir = self.code_export_directory if len(tup) <= 2 else tup[2]
-            render_template(tup[0], tup[1], output_dir, json_path)
+        render_template_list(template_list, self.code_export_directory, json_path)
 
         # Custom templates
         acados_template_path = os.path.dirname(os.path.abspath(__file__))
         custom_template_glob = os.path.join(acados_template_path, 'custom_update_templates', '*')
-        for tup in self.solver_options.custom_templates:
-            render_template(tup[0], tup[1], self.code_export_directory, json_path, template_glob=custom_template_glob)
+        render_template_list(self.solver_options.custom_templates, self.code_export_directory, json_path, template_glob=custom_template_glob)
         return
 
 
@@ -1025,7 +1022,7 @@ class AcadosOcp:
             json.dump(self.to_dict(), f, default=make_object_json_dumpable, indent=4, sort_keys=True)
         return
 
-    def generate_external_functions(self, context: Optional[GenerateContext] = None) -> GenerateContext:
+    def generate_external_functions(self, context: Optional[GenerateContext] = None, verbose: bool = False) -> GenerateContext:
 
         if context is None:
             # options for code generation
@@ -1034,6 +1031,8 @@ class AcadosOcp:
             code_gen_opts['with_solution_sens_wrt_params'] = self.solver_options.with_solution_sens_wrt_params
             code_gen_opts['with_value_sens_wrt_params'] = self.solver_options.with_value_sens_wrt_params
             code_gen_opts['code_export_directory'] = self.code_export_directory
+            code_gen_opts['num_processes'] = self.solver_options.ext_fun_codegen_num_processes
+            code_gen_opts['verbose'] = verbose
 
             context = GenerateContext(self.model.p_global, self.name, code_gen_opts)
 
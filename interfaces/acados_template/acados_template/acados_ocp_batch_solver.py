@@ -32,11 +32,57 @@
 from .acados_ocp_solver import AcadosOcpSolver
 from .acados_ocp import AcadosOcp
 from .acados_ocp_iterate import AcadosOcpFlattenedBatchIterate
-from typing import Optional, List, Tuple, Sequence
-from ctypes import (POINTER, c_int, c_void_p, cast, c_double, c_char_p)
+from typing import Optional, List, Tuple, Sequence, Dict
+from ctypes import (POINTER, addressof, c_int, c_void_p, cast, c_double, c_char_p, sizeof)
+from .utils import create_batch_thread_pool
 import numpy as np
 import time
 
+class _AcadosOcpBatchCapsules():
+    """
+    Private class owning the solver capsules of an `AcadosOcpBatchSolver`.
+    It is referenced by the batch solver and by the handles in `ocp_solvers`, but does not reference either of them,
+    such that the capsules are freed once all of them are deleted, before the first solver closes the shared library.
+
+        :param ocp_solver: the first solver of the batch, which owns its capsule and the shared library
+        :param N_batch: batch size
+    """
+    def __init__(self, ocp_solver: AcadosOcpSolver, N_batch: int):
+        self.__created = False
+        self.ocp_solver = ocp_solver
+        self.N_batch = N_batch
+        self.pointer = (c_void_p * N_batch)()
+        self.pointer[0] = ocp_solver.capsule
+
+        getattr(ocp_solver.shared_lib, f"{ocp_solver.name}_acados_batch_create").argtypes = [POINTER(c_void_p), c_int]
+        getattr(ocp_solver.shared_lib, f"{ocp_solver.name}_acados_batch_create").restype = c_int
+
+        getattr(ocp_solver.shared_lib, f"{ocp_solver.name}_acados_batch_free").argtypes = [POINTER(c_void_p), c_int]
+        getattr(ocp_solver.shared_lib, f"{ocp_solver.name}_acados_batch_free").restype = None
+
+        # create all but the first solver in one call, the first one is owned by ocp_solver
+        if N_batch > 1:
+            # on failure, the solvers created so far are already freed by batch_create
+            status = getattr(ocp_solver.shared_lib, f"{ocp_solver.name}_acados_batch_create")(self.__additional_solvers_pointer(), N_batch-1)
+            if status != 0:
+                raise Exception(f"AcadosOcpBatchSolver: creating {N_batch-1} solvers failed with status {status}.")
+            self.__created = True
+
+
+    def __additional_solvers_pointer(self):
+        """
+        Private function returning a pointer to the capsules of all but the first solver.
+        """
+        return cast(c_void_p(addressof(self.pointer) + sizeof(c_void_p)), POINTER(c_void_p))
+
+
+    def __del__(self):
+        # ocp_solver is only released after this, i.e. the shared library is still loaded
+        if self.__created:
+            getattr(self.ocp_solver.shared_lib, f"{self.ocp_solver.name}_acados_batch_free")(self.__additional_solvers_pointer(), self.N_batch-1)
+            self.__created = False
+
+
 class AcadosOcpBatchSolver():
     """
     Batch OCP solver for parallel solves.
@@ -47,63 +93,214 @@ class AcadosOcpBatchSolver():
         :param build: Flag indicating whether solver should be (re)compiled. If False an attempt is made to load an already compiled shared library for the solver. Default: True
         :param generate: Flag indicating whether problem functions should be code generated. Default: True
         :verbose: bool, default: True
+        :param num_threads: number of threads used in `solve`, see :py:attr:`num_threads`. Default: `ocp.solver_options.num_threads_in_batch_solve`
+        :param pin_threads: whether to pin the threads to CPUs, see :py:attr:`pin_threads`. Default: False
+
+    Only the first solver is created as a full :py:class:`~acados_template.acados_ocp_solver.AcadosOcpSolver`,
+    all other solvers are allocated with a single call to the shared library.
+    Python objects for the individual solvers are only created on first access to `ocp_solvers`.
     """
 
-    __ocp_solvers : List[AcadosOcpSolver]
+    __ocp_solvers : Optional[List[AcadosOcpSolver]]
 
-    def __init__(self, ocp: AcadosOcp, N_batch: int, json_file: str = 'acados_ocp.json',  build: bool = True, generate: bool = True, verbose: bool=True):
+    def __init__(self, ocp: AcadosOcp, N_batch: int, json_file: str = 'acados_ocp.json',  build: bool = True, generate: bool = True, verbose: bool=True,
+                 num_threads: Optional[int] = None, pin_threads: bool = False):
+
+        self.__thread_pool = None
 
         if not isinstance(N_batch, int) or N_batch <= 0:
             raise Exception("AcadosOcpBatchSolver: argument N_batch should be a positive integer.")
 
         self.__N_batch = N_batch
-        self.__ocp_solvers = [AcadosOcpSolver(ocp,
-                                              json_file=json_file,
-                                              build=n==0 if build else False,
-                                              generate=n==0 if generate else False,
-                                              verbose=verbose)
-                               for n in range(self.N_batch)]
+        self.__ocp_solver = AcadosOcpSolver(ocp, json_file=json_file, build=build, generate=generate, verbose=verbose)
+        self.__ocp_solvers = None
 
-        self.__shared_lib = self.ocp_solvers[0].shared_lib
-        self.__acados_lib = self.ocp_solvers[0].acados_lib
-        self.__name = self.ocp_solvers[0].name
-        self.__ocp_solvers_pointer = (c_void_p * self.N_batch)()
+        self.__shared_lib = self.__ocp_solver.shared_lib
+        self.__acados_lib = self.__ocp_solver.acados_lib
+        self.__name = self.__ocp_solver.name
 
-        for i in range(self.N_batch):
-            self.__ocp_solvers_pointer[i] = self.ocp_solvers[i].capsule
+        # the capsules are owned by a separate object, which is also referenced by the handles in ocp_solvers
+        self.__capsules = _AcadosOcpBatchCapsules(self.__ocp_solver, self.N_batch)
+        self.__ocp_solvers_pointer = self.__capsules.pointer
 
         # out data for solve
         self.__status = np.zeros((self.N_batch,), dtype=np.intc, order="C")
         self.__status_p = cast(self.__status.ctypes.data, POINTER(c_int))
 
-        getattr(self.__shared_lib, f"{self.__name}_acados_batch_solve").argtypes = [POINTER(c_void_p), POINTER(c_int), c_int]
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_solve").argtypes = [POINTER(c_void_p), POINTER(c_int), c_int, c_int, POINTER(c_double)]
         getattr(self.__shared_lib, f"{self.__name}_acados_batch_solve").restype = c_void_p
 
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_get_stats_double").argtypes = [POINTER(c_void_p), c_char_p, POINTER(c_double), c_int]
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_get_stats_double").restype = None
+
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_rti_phase").argtypes = [POINTER(c_void_p), c_int, c_int]
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_rti_phase").restype = None
+
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_reset_sens_out").argtypes = [POINTER(c_void_p), c_int]
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_reset_sens_out").restype = None
+
         getattr(self.__shared_lib, f"{self.__name}_acados_batch_eval_params_jac").argtypes = [POINTER(c_void_p), c_int]
         getattr(self.__shared_lib, f"{self.__name}_acados_batch_eval_params_jac").restype = c_void_p
 
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_p_global_and_precompute_dependencies").argtypes = [POINTER(c_void_p), POINTER(c_double), c_int, c_int, c_int, c_int]
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_p_global_and_precompute_dependencies").restype = None
+
         getattr(self.__shared_lib, f"{self.__name}_acados_batch_eval_solution_sens_adj_p").argtypes = [POINTER(c_void_p), c_char_p, c_int, POINTER(c_double), c_int, c_int]
         getattr(self.__shared_lib, f"{self.__name}_acados_batch_eval_solution_sens_adj_p").restype = c_void_p
 
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_eval_solution_sens").argtypes = [POINTER(c_void_p), c_char_p, c_int, POINTER(c_double), POINTER(c_double), c_int, c_int, c_int, c_int]
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_eval_solution_sens").restype = None
+
         getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_flat").argtypes = [POINTER(c_void_p), c_char_p, POINTER(c_double), c_int, c_int]
         getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_flat").restype = c_void_p
 
         getattr(self.__shared_lib, f"{self.__name}_acados_batch_get_flat").argtypes = [POINTER(c_void_p), c_char_p, POINTER(c_double), c_int, c_int]
         getattr(self.__shared_lib, f"{self.__name}_acados_batch_get_flat").restype = c_void_p
 
-        if self.ocp_solvers[0].acados_lib_uses_omp:
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_stages").argtypes = [POINTER(c_void_p), c_char_p, POINTER(c_int), c_int, POINTER(c_double), c_int, c_int, c_int]
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_stages").restype = c_void_p
+
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_update_params_sparse").argtypes = [POINTER(c_void_p), POINTER(c_int), c_int, POINTER(c_int), POINTER(c_double), c_int, c_int, c_int, c_int, c_int]
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_update_params_sparse").restype = None
+
+        self.__num_threads_in_batch_solve = self.__ocp_solver.acados_ocp.solver_options.num_threads_in_batch_solve
+        self.__num_threads = None
+        self.__pin_threads = False
+        self.pin_threads = pin_threads
+        self.num_threads = self.__num_threads_in_batch_solve if num_threads is None else num_threads
+
+        if self.__ocp_solver.acados_lib_uses_omp:
             msg = "Note: Please make sure that the acados shared library is compiled with the number of threads set to 1,\n"
-        else:
+        elif self.__num_threads_in_batch_solve > 1:
             msg = "Warning: Please compile the acados shared library with openmp and the number of threads set to 1,\n"
+        else:
+            msg = None
+
+        if msg is not None:
+            msg += "i.e. with the flags -DACADOS_WITH_OPENMP=ON -DACADOS_NUM_THREADS=1.\n" + \
+                    "See https://github.com/acados/acados/pull/1089 for more details."
+            print(msg)
+
+
+    def __solvers_pointer(self, start: int):
+        """
+        Private function returning a pointer to the capsules starting from solver `start`.
+        """
+        return cast(c_void_p(addressof(self.__ocp_solvers_pointer) + start * sizeof(c_void_p)), POINTER(c_void_p))
+
+
+    def __status_pointer(self, start: int):
+        """
+        Private function returning a pointer to the status array starting from solver `start`.
+        """
+        return cast(c_void_p(self.__status.ctypes.data + start * sizeof(c_int)), POINTER(c_int))
+
+
+    def __chunks(self, n_solvers: int) -> List[Tuple[int, int]]:
+        """
+        Private function splitting the first `n_solvers` solvers into `num_threads` contiguous chunks, returned as tuples (start, length).
+        """
+        bounds = np.linspace(0, n_solvers, self.__num_threads + 1).astype(int)
+        return [(int(start), int(end - start)) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
 
-        msg += "i.e. with the flags -DACADOS_WITH_OPENMP=ON -DACADOS_NUM_THREADS=1.\n" + \
-                   "See https://github.com/acados/acados/pull/1089 for more details."
-        print(msg)
+    def __run_chunked(self, call, n_solvers: int) -> None:
+        """
+        Private function calling `call(start, length)` for all chunks of the first `n_solvers` solvers, on the thread pool if it exists,
+        and storing the wall time of each chunk in `time_per_thread`.
+        """
+        def timed_call(k, start, length):
+            t0 = time.time()
+            call(start, length)
+            self.__time_per_thread[k] = time.time() - t0
+
+        if self.__thread_pool is None:
+            timed_call(0, 0, n_solvers)
+        else:
+            futures = [self.__thread_pool.submit(timed_call, k, start, length) for k, (start, length) in enumerate(self.__chunks(n_solvers))]
+            for future in futures:
+                future.result()
+
+
+    def __update_thread_pool(self) -> None:
+        """
+        Private function (re)creating the thread pool used if the solver was generated without OpenMP.
+        """
+        if self.__thread_pool is not None:
+            self.__thread_pool.shutdown()
+            self.__thread_pool = None
+
+        if self.__num_threads_in_batch_solve > 1:
+            if self.__pin_threads:
+                raise Exception('AcadosOcpBatchSolver: pin_threads is not supported for solvers generated with num_threads_in_batch_solve > 1,'
+                                ' please use the environment variables OMP_PROC_BIND and OMP_PLACES to pin the OpenMP threads.')
+        elif self.__num_threads > 1:
+            self.__thread_pool = create_batch_thread_pool(self.__num_threads, self.__pin_threads)
+
+
+    @property
+    def num_threads(self) -> int:
+        """
+        Number of threads used in `solve`, can be changed at runtime.
+        If the solver was generated with `num_threads_in_batch_solve > 1`, it is passed to the OpenMP parallelization of the generated code.
+        Otherwise, the batch is split into `num_threads` chunks, which are solved in parallel on a thread pool.
+        The calls into the shared library release the GIL, such that this does not require an acados build with OpenMP.
+        Default: `num_threads_in_batch_solve`.
+        """
+        return self.__num_threads
+
+
+    @num_threads.setter
+    def num_threads(self, num_threads: int):
+        if not isinstance(num_threads, int) or num_threads <= 0:
+            raise Exception('Invalid num_threads value. num_threads must be a positive integer.')
+
+        num_threads = min(num_threads, self.N_batch)
+        if num_threads != self.__num_threads:
+            self.__num_threads = num_threads
+            self.__time_per_thread = np.zeros((num_threads,), dtype=np.float64)
+            self.__time_per_thread_p = cast(self.__time_per_thread.ctypes.data, POINTER(c_double))
+            self.__update_thread_pool()
+
+
+    @property
+    def pin_threads(self) -> bool:
+        """
+        Whether the threads of the thread pool are pinned to the CPUs available to the process, one CPU per thread (Linux only).
+        Only supported for solvers generated with `num_threads_in_batch_solve = 1`;
+        for OpenMP, use the environment variables OMP_PROC_BIND and OMP_PLACES instead.
+        Default: False.
+        """
+        return self.__pin_threads
+
+
+    @pin_threads.setter
+    def pin_threads(self, pin_threads: bool):
+        if not isinstance(pin_threads, bool):
+            raise Exception('Invalid pin_threads value, expected bool.')
+
+        if pin_threads != self.__pin_threads:
+            self.__pin_threads = pin_threads
+            if self.__num_threads is not None:
+                self.__update_thread_pool()
+
+
+    @property
+    def time_per_thread(self) -> np.ndarray:
+        """
+        Wall time in seconds spent by each of the `num_threads` threads in the last call to `solve`.
+        """
+        return self.__time_per_thread.copy()
 
 
     @property
-    def ocp_solvers(self):
-        """List of AcadosOcpSolvers."""
+    def ocp_solvers(self) -> List[AcadosOcpSolver]:
+        """List of AcadosOcpSolvers, one for each solver in the batch; created on first access."""
+        if self.__ocp_solvers is None:
+            self.__ocp_solvers = [self.__ocp_solver] + \
+                [self.__ocp_solver._create_solver_handle(self.__ocp_solvers_pointer[n], owner=self.__capsules) for n in range(1, self.N_batch)]
+            for s, solver in zip(self.__status, self.__ocp_solvers):
+                solver.status = s
         return self.__ocp_solvers
 
 
@@ -113,16 +310,146 @@ class AcadosOcpBatchSolver():
         return self.__N_batch
 
 
-    def solve(self):
+    def solve(self, num_threads: Optional[int] = None):
         """
         Call solve for all `N_batch` solvers.
+
+            :param num_threads: if given, sets :py:attr:`num_threads` before solving.
         """
+        if num_threads is not None:
+            self.num_threads = num_threads
+
+        self.__solve(self.N_batch)
 
-        getattr(self.__shared_lib, f"{self.__name}_acados_batch_solve")(self.__ocp_solvers_pointer, self.__status_p, self.__N_batch)
+
+    def __solve(self, n_solvers: int) -> None:
+        """
+        Private function calling solve for the first `n_solvers` solvers.
+        """
+        batch_solve = getattr(self.__shared_lib, f"{self.__name}_acados_batch_solve")
+        if self.__num_threads_in_batch_solve > 1:
+            batch_solve(self.__ocp_solvers_pointer, self.__status_p, n_solvers, self.__num_threads, self.__time_per_thread_p)
+        else:
+            self.__run_chunked(lambda start, length: batch_solve(self.__solvers_pointer(start), self.__status_pointer(start), length, 1, None), n_solvers)
 
         # to be consistent with non-batched solve
-        for s, solver in zip(self.__status, self.ocp_solvers):
-            solver.status = s
+        if self.__ocp_solvers is not None:
+            for s, solver in zip(self.__status, self.__ocp_solvers):
+                solver.status = s
+
+
+    def __solve_rti_phase(self, rti_phase: int) -> None:
+        """
+        Private function solving with the given rti_phase for all solvers and resetting it to 0 afterwards.
+        """
+        if self.__ocp_solver.acados_ocp.solver_options.nlp_solver_type != 'SQP_RTI':
+            raise Exception('AcadosOcpBatchSolver: prepare() and feedback() are only supported for nlp_solver_type SQP_RTI.')
+
+        set_rti_phase = getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_rti_phase")
+        set_rti_phase(self.__ocp_solvers_pointer, rti_phase, self.N_batch)
+        self.solve()
+        set_rti_phase(self.__ocp_solvers_pointer, 0, self.N_batch)
+
+
+    def prepare(self) -> None:
+        """
+        Run the preparation phase of the real-time iteration for all `N_batch` solvers, see :py:meth:`AcadosOcpSolver.prepare`.
+        """
+        self.__solve_rti_phase(1)
+
+
+    def feedback(self, x0: Optional[np.ndarray] = None) -> None:
+        """
+        Run the feedback phase of the real-time iteration for all `N_batch` solvers, see :py:meth:`AcadosOcpSolver.feedback`.
+
+            :param x0: if given, np.array of shape (N_batch, nx), the initial state constraints are set before the feedback phase
+        """
+        if x0 is not None:
+            self.set_x0(x0)
+
+        self.__solve_rti_phase(2)
+
+
+    def get_status(self) -> np.ndarray:
+        """
+        Returns the status of the last batch solve as an array of shape (N_batch,).
+        """
+        return self.__status.copy()
+
+
+    def get_stats(self, field_: str) -> np.ndarray:
+        """
+        Get timing information of the last solve of all `N_batch` solvers with a single call to the shared library.
+
+            :param field_: string in ['time_tot', 'time_lin', 'time_sim', 'time_sim_ad', 'time_sim_la', 'time_qp', 'time_qp_solver_call', 'time_reg', 'time_preparation', 'time_feedback']
+            :returns: np.array of shape (N_batch,)
+        """
+        fields = ['time_tot', 'time_lin', 'time_sim', 'time_sim_ad', 'time_sim_la', 'time_qp', 'time_qp_solver_call', 'time_reg', 'time_preparation', 'time_feedback']
+        if field_ not in fields:
+            raise Exception(f'AcadosOcpBatchSolver.get_stats(): \'{field_}\' is not a valid argument.\n'
+                            f' Possible values are {fields}.')
+
+        out = np.zeros((self.N_batch,), dtype=np.float64)
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_get_stats_double")(self.__ocp_solvers_pointer, field_.encode('utf-8'),
+                                                                                       cast(out.ctypes.data, POINTER(c_double)), self.N_batch)
+        return out
+
+
+    def solve_for_x0_batch(self, X0: np.ndarray, warm_start_from_neighbour: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Solve the OCP for many initial states, e.g. to tabulate or validate a controller over a grid of initial states.
+        The initial states are processed in rounds of `N_batch`, each round is solved in parallel.
+
+            :param X0: np.array of shape (M, nx), M can be larger than `N_batch`
+            :param warm_start_from_neighbour: if True, each solver is initialized with the solution of the closest initial state solved successfully in a previous round;
+                otherwise, the solvers are initialized with their current iterate. Default: True
+            :returns: tuple (U0, status, time_tot) of arrays of shapes (M, nu), (M,), (M,) containing the first controls, solver status and solve times
+        """
+        nx = self.__ocp_solver.dims_get("x", 0)
+        nu = self.__ocp_solver.dims_get("u", 0)
+
+        X0 = np.ascontiguousarray(X0, dtype=np.float64)
+        if X0.ndim != 2 or X0.shape[1] != nx:
+            raise Exception(f'AcadosOcpBatchSolver.solve_for_x0_batch(): X0 must have shape (M, {nx}), got {X0.shape}.')
+        M = X0.shape[0]
+
+        U0 = np.zeros((M, nu))
+        status = np.zeros((M,), dtype=np.intc)
+        time_tot = np.zeros((M,))
+
+        iterate_fields = ['x', 'u', 'z', 'sl', 'su', 'pi', 'lam']
+        if warm_start_from_neighbour:
+            solutions = {field: np.zeros((M, self.__ocp_solver.get_dim_flat(field))) for field in iterate_fields}
+
+        for start in range(0, M, self.N_batch):
+            n_solvers = min(self.N_batch, M - start)
+            # the last round is padded with the last initial state, padded solvers are not solved
+            X0_round = X0[np.minimum(np.arange(start, start + self.N_batch), M - 1)]
+            self.set_x0(X0_round)
+
+            if warm_start_from_neighbour and start > 0:
+                candidates = np.flatnonzero(status[:start] == 0)
+                if candidates.size > 0:
+                    distances = np.sum((X0_round[:, None, :] - X0[None, candidates, :])**2, axis=2)
+                    nearest = candidates[np.argmin(distances, axis=1)]
+                    for field in iterate_fields:
+                        self.set_flat(field, solutions[field][nearest])
+
+            self.__solve(n_solvers)
+
+            solved = slice(start, start + n_solvers)
+            status[solved] = self.__status[:n_solvers]
+            U0[solved] = self.get_flat("u")[:n_solvers, :nu]
+            time_tot[solved] = self.get_stats("time_tot")[:n_solvers]
+            if warm_start_from_neighbour:
+                for field in iterate_fields:
+                    solutions[field][solved] = self.get_flat(field)[:n_solvers]
+
+        if self.__ocp_solvers is not None:
+            for s, solver in zip(self.__status, self.__ocp_solvers):
+                solver.status = s
+
+        return U0, status, time_tot
 
 
     def eval_adjoint_solution_sensitivity(self,
@@ -172,15 +499,13 @@ class AcadosOcpBatchSolver():
             n_seeds = seed_u[0][1].shape[2]
 
         if sanity_checks:
-            N_horizon = self.__ocp_solvers[0].acados_ocp.solver_options.N_horizon
+            N_horizon = self.__ocp_solver.acados_ocp.solver_options.N_horizon
 
-            for n in range(self.N_batch):
-                self.__ocp_solvers[n]._sanity_check_solution_sensitivities()
+            # all solvers share the same options
+            self.__ocp_solver._sanity_check_solution_sensitivities()
 
-            nx = self.__acados_lib.ocp_nlp_dims_get_from_attr(
-                self.__ocp_solvers[0].nlp_config, self.__ocp_solvers[0].nlp_dims, self.__ocp_solvers[0].nlp_out, 0, "x".encode('utf-8'))
-            nu = self.__acados_lib.ocp_nlp_dims_get_from_attr(
-                self.__ocp_solvers[0].nlp_config, self.__ocp_solvers[0].nlp_dims, self.__ocp_solvers[0].nlp_out, 0, "u".encode('utf-8'))
+            nx = self.__ocp_solver.dims_get("x", 0)
+            nu = self.__ocp_solver.dims_get("u", 0)
 
             # check seeds
             for seed, name, dim in [(seed_x, "seed_x", nx,), (seed_u, "seed_u", nu)]:
@@ -195,8 +520,7 @@ class AcadosOcpBatchSolver():
         if with_respect_to == "p_global":
             field = "p_global".encode('utf-8')
 
-            np_global = self.__acados_lib.ocp_nlp_dims_get_from_attr(
-                self.__ocp_solvers[0].nlp_config, self.__ocp_solvers[0].nlp_dims, self.__ocp_solvers[0].nlp_out, 0, field)
+            np_global = self.__ocp_solver.dims_get("p_global", 0)
 
             # compute jacobian wrt params
             t0 = time.time()
@@ -232,11 +556,109 @@ class AcadosOcpBatchSolver():
             raise NotImplementedError(f"with_respect_to {with_respect_to} not implemented.")
 
 
-    def reset_sens_out(self, ):
-        # TODO batch this
-        for n in range(self.N_batch):
-            self.__acados_lib.ocp_nlp_out_set_values_to_zero(self.__ocp_solvers[n].nlp_config, self.__ocp_solvers[n].nlp_dims, self.__ocp_solvers[n].sens_out)
+    def eval_solution_sensitivity_all_stages(self,
+                                             with_respect_to: str,
+                                             return_sens_x: bool = True,
+                                             return_sens_u: bool = True,
+                                             sanity_checks: bool = True,
+                                             ) -> Dict:
+        """
+        Evaluate the forward sensitivities of the solutions of all `N_batch` solvers with respect to the initial state or the parameters at all stages,
+        see :py:meth:`AcadosOcpSolver.eval_solution_sensitivity_all_stages`. The solvers are processed in parallel.
+
+            :param with_respect_to: string in ["initial_state", "p_global"]
+            :param return_sens_x: Flag indicating whether sensitivities of x should be returned. Default: True.
+            :param return_sens_u: Flag indicating whether sensitivities of u should be returned. Default: True.
+            :param sanity_checks: bool - whether to perform sanity checks, turn off for minimal overhead, default: True
+            :returns: A dictionary with fields sens_x of shape (N_batch, N+1, nx, ngrad) and sens_u of shape (N_batch, N, nu, ngrad) if corresponding flags were set,
+                e.g. the jacobians du0/dx0 are given by sens_u[:, 0] for with_respect_to="initial_state".
+        """
+        N_horizon = self.__ocp_solver.acados_ocp.solver_options.N_horizon
+        nx = self.__ocp_solver.dims_get("x", 0)
+        nu = self.__ocp_solver.dims_get("u", 0)
+
+        if sanity_checks:
+            # all solvers share the same options
+            self.__ocp_solver._sanity_check_solution_sensitivities(parametric=with_respect_to == "p_global")
+            if self.__ocp_solver.get_dim_flat("x") != (N_horizon+1) * nx or self.__ocp_solver.get_dim_flat("u") != N_horizon * nu:
+                raise Exception("AcadosOcpBatchSolver.eval_solution_sensitivity_all_stages(): dimensions of x and u have to be the same at all stages.")
+
+        if with_respect_to == "initial_state":
+            field = "ex".encode('utf-8')
+            ngrad = nx
+        elif with_respect_to == "p_global":
+            field = "p_global".encode('utf-8')
+            ngrad = self.__ocp_solver.dims_get("p_global", 0)
+
+            # compute jacobian wrt params
+            t0 = time.time()
+            getattr(self.__shared_lib, f"{self.__name}_acados_batch_eval_params_jac")(self.__ocp_solvers_pointer, self.__N_batch)
+            self.time_solution_sens_lin = time.time() - t0
+        else:
+            raise Exception(f"AcadosOcpBatchSolver.eval_solution_sensitivity_all_stages(): Unknown field: with_respect_to = {with_respect_to}")
+
+        sens_x = np.zeros((self.N_batch, N_horizon+1, nx, ngrad)) if return_sens_x else None
+        sens_u = np.zeros((self.N_batch, N_horizon, nu, ngrad)) if return_sens_u else None
+        offset_x = (N_horizon+1) * nx * ngrad
+        offset_u = N_horizon * nu * ngrad
 
+        def sens_pointer(sens, offset, start):
+            return None if sens is None else cast(c_void_p(sens.ctypes.data + start * offset * sizeof(c_double)), POINTER(c_double))
+
+        t1 = time.time()
+        eval_solution_sens = getattr(self.__shared_lib, f"{self.__name}_acados_batch_eval_solution_sens")
+        if self.__num_threads_in_batch_solve > 1:
+            eval_solution_sens(self.__ocp_solvers_pointer, field, ngrad, sens_pointer(sens_x, offset_x, 0), sens_pointer(sens_u, offset_u, 0),
+                               offset_x, offset_u, self.N_batch, self.__num_threads)
+        else:
+            self.__run_chunked(lambda start, length: eval_solution_sens(self.__solvers_pointer(start), field, ngrad,
+                                                                        sens_pointer(sens_x, offset_x, start), sens_pointer(sens_u, offset_u, start),
+                                                                        offset_x, offset_u, length, 1), self.N_batch)
+        self.time_solution_sens_solve = time.time() - t1
+
+        out = {}
+        if return_sens_x:
+            out["sens_x"] = sens_x
+        if return_sens_u:
+            out["sens_u"] = sens_u
+        return out
+
+
+    def reset_sens_out(self) -> None:
+        """
+        Set the sensitivity output of all `N_batch` solvers to zero with a single call to the shared library.
+        """
+        getattr(self.__shared_lib, f"{self.__name}_acados_batch_reset_sens_out")(self.__ocp_solvers_pointer, self.N_batch)
+
+
+    def set_p_global_and_precompute_dependencies(self, data_: np.ndarray) -> None:
+        """
+        Sets values of p_global and precomputes all parts of the CasADi graphs of all other functions that only depend on p_global
+        for all `N_batch` solvers, see :py:meth:`AcadosOcpSolver.set_p_global_and_precompute_dependencies`.
+        The solvers are processed in parallel using :py:attr:`num_threads` threads.
+        If all solvers share the same p_global, the dependencies are evaluated once and copied to all solvers.
+
+            :param data_: np.array of shape (np_global,) to set the same p_global in all solvers, or of shape (N_batch, np_global)
+        """
+        np_global = self.__ocp_solver.dims_get("p_global", 0)
+
+        data = np.ascontiguousarray(data_, dtype=np.float64)
+        if data.shape == (np_global,):
+            stride = 0
+        elif data.shape == (self.N_batch, np_global):
+            stride = 0 if np.all(data == data[0]) else np_global
+        else:
+            raise Exception(f'AcadosOcpBatchSolver.set_p_global_and_precompute_dependencies(): data must have shape ({np_global},) or ({self.N_batch}, {np_global}), got {data.shape}.')
+
+        set_p_global = getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_p_global_and_precompute_dependencies")
+
+        def data_pointer(start):
+            return cast(c_void_p(data.ctypes.data + start * stride * sizeof(c_double)), POINTER(c_double))
+
+        if stride == 0 or self.__num_threads_in_batch_solve > 1:
+            set_p_global(self.__ocp_solvers_pointer, data_pointer(0), np_global, stride, self.N_batch, self.__num_threads)
+        else:
+            self.__run_chunked(lambda start, length: set_p_global(self.__solvers_pointer(start), data_pointer(start), np_global, stride, length, 1), self.N_batch)
 
 
     def set_flat(self, field_: str, value_: np.ndarray) -> None:
@@ -251,7 +673,7 @@ class AcadosOcpBatchSolver():
         if field_ not in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']:
             raise Exception(f'AcadosOcpSolver.get_flat(field={field_}): \'{field_}\' is an invalid argument.')
 
-        dim = self.ocp_solvers[0].get_dim_flat(field_)
+        dim = self.__ocp_solver.get_dim_flat(field_)
 
         if value_.shape != (self.N_batch, dim):
             raise Exception(f'AcadosOcpBatchSolver.set_flat(field={field_}, value): value has wrong shape, expected ({self.N_batch}, {dim}), got {value_.shape}.')
@@ -277,7 +699,7 @@ class AcadosOcpBatchSolver():
 
         field = field_.encode('utf-8')
 
-        dim = self.ocp_solvers[0].get_dim_flat(field_)
+        dim = self.__ocp_solver.get_dim_flat(field_)
 
         out = np.ascontiguousarray(np.zeros((self.N_batch, dim,)), dtype=np.float64)
         out_data = cast(out.ctypes.data, POINTER(c_double))
@@ -287,6 +709,140 @@ class AcadosOcpBatchSolver():
         return out
 
 
+    def set_stages(self, field_: str, value_: np.ndarray, stages: Optional[Sequence[int]] = None) -> None:
+        """
+        Set a field at multiple stages for all `N_batch` solvers with a single call to the shared library.
+        The solvers are updated in parallel using :py:attr:`num_threads` threads.
+
+            :param field_: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p', 'yref', 'lbx', 'ubx', 'lbu', 'ubu', 'lg', 'ug', 'lh', 'uh']
+            :param value_: np.array of shape (N_batch, n_stages, n_field) or (N_batch, n_field_total),
+                    where n_field_total is the sum of the dimensions of the field at the given stages
+            :param stages: stage indices, default: all stages at which the field is defined, i.e. 0, ..., N-1 for 'u', 'z', 'pi', 'lbu', 'ubu' and 0, ..., N otherwise
+        """
+        out_fields = ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su']
+        in_fields = ['p', 'yref', 'lbx', 'ubx', 'lbu', 'ubu', 'lg', 'ug', 'lh', 'uh']
+        if field_ not in out_fields + in_fields:
+            raise Exception(f'AcadosOcpBatchSolver.set_stages(field={field_}): \'{field_}\' is an invalid argument.\n'
+                            f' Possible values are {out_fields + in_fields}.')
+
+        N = self.__ocp_solver.N
+        if stages is None:
+            n_stages = N if field_ in ['u', 'z', 'pi', 'lbu', 'ubu'] else N + 1
+            stages = range(n_stages)
+
+        stages_ = np.ascontiguousarray(stages, dtype=np.intc)
+        if stages_.ndim != 1 or np.any(stages_ < 0) or np.any(stages_ > N) or (field_ == 'pi' and np.any(stages_ == N)):
+            raise Exception(f'AcadosOcpBatchSolver.set_stages(field={field_}): invalid stages {stages}.')
+
+        stage_dims = [self.__ocp_solver.dims_get(field_, int(stage)) for stage in stages_]
+
+        value_ = np.ascontiguousarray(value_, dtype=np.float64)
+        if value_.ndim == 3:
+            if value_.shape[:2] != (self.N_batch, len(stages_)) or any(d != value_.shape[2] for d in stage_dims):
+                raise Exception(f'AcadosOcpBatchSolver.set_stages(field={field_}): value has wrong shape, expected ({self.N_batch}, {len(stages_)}, n_field), got {value_.shape}, dimensions at stages are {stage_dims}.')
+        elif value_.shape != (self.N_batch, sum(stage_dims)):
+            raise Exception(f'AcadosOcpBatchSolver.set_stages(field={field_}): value has wrong shape, expected ({self.N_batch}, {sum(stage_dims)}), got {value_.shape}.')
+
+        field = field_.encode('utf-8')
+        stages_data = cast(stages_.ctypes.data, POINTER(c_int))
+        offset = sum(stage_dims)
+
+        def value_pointer(start):
+            return cast(c_void_p(value_.ctypes.data + start * offset * sizeof(c_double)), POINTER(c_double))
+
+        set_stages = getattr(self.__shared_lib, f"{self.__name}_acados_batch_set_stages")
+        if self.__num_threads_in_batch_solve > 1:
+            set_stages(self.__ocp_solvers_pointer, field, stages_data, len(stages_), value_pointer(0), value_.size, self.N_batch, self.__num_threads)
+        else:
+            self.__run_chunked(lambda start, length: set_stages(self.__solvers_pointer(start), field, stages_data, len(stages_), value_pointer(start),
+                                                                length * offset, length, 1), self.N_batch)
+
+
+    def set_params_sparse(self, idx_values_: np.ndarray, param_values_: np.ndarray,
+                          stages: Optional[Sequence[int]] = None, batch_index: Optional[int] = None) -> None:
+        """
+        Set parameters partially at multiple stages of all `N_batch` solvers or of a single solver:
+        Pseudo: solver.param[stage][idx_values] = param_values for all stages in `stages`.
+        The solvers are updated in parallel using :py:attr:`num_threads` threads.
+
+            :param idx_values_: 0 based np array (or iterable) of integers: indices of parameters to be set
+            :param param_values_: np.array of shape (n_update,), (n_stages, n_update) or (N_batch, n_stages, n_update),
+                    values without the leading dimensions are used for all stages and solvers
+            :param stages: stage indices, default: all stages 0, ..., N
+            :param batch_index: if given, only the solver with this index is updated and param_values_ can not have the leading dimension N_batch. Default: None
+        """
+        N = self.__ocp_solver.N
+        if stages is None:
+            stages = range(N + 1)
+
+        stages_ = np.ascontiguousarray(stages, dtype=np.intc)
+        if stages_.ndim != 1 or np.any(stages_ < 0) or np.any(stages_ > N):
+            raise Exception(f'AcadosOcpBatchSolver.set_params_sparse(): invalid stages {stages}.')
+
+        if batch_index is None:
+            n_batch = self.N_batch
+            solvers_pointer = self.__ocp_solvers_pointer
+        elif isinstance(batch_index, int) and 0 <= batch_index < self.N_batch:
+            n_batch = 1
+            solvers_pointer = self.__solvers_pointer(batch_index)
+        else:
+            raise Exception(f'AcadosOcpBatchSolver.set_params_sparse(): batch_index should be an integer in [0, {self.N_batch-1}], got {batch_index}.')
+
+        idx_values = np.ascontiguousarray(idx_values_, dtype=np.intc)
+        n_update = idx_values.size
+        p_dims = [self.__ocp_solver.dims_get("p", int(stage)) for stage in stages_]
+        if idx_values.ndim != 1 or np.any(idx_values < 0) or any(np.any(idx_values >= p_dim) for p_dim in p_dims):
+            raise Exception(f'AcadosOcpBatchSolver.set_params_sparse(): idx_values_ should be a 1D array of indices in [0, np), got {idx_values_}, np at stages are {p_dims}.')
+
+        param_values = np.ascontiguousarray(param_values_, dtype=np.float64)
+        n_stages = len(stages_)
+        if param_values.shape == (n_update,):
+            stride_stage, stride_batch = 0, 0
+        elif param_values.shape == (n_stages, n_update):
+            stride_stage, stride_batch = n_update, 0
+        elif batch_index is None and param_values.shape == (self.N_batch, n_stages, n_update):
+            stride_stage, stride_batch = n_update, n_stages * n_update
+        else:
+            raise Exception(f'AcadosOcpBatchSolver.set_params_sparse(): param_values_ has wrong shape, expected ({n_update},), ({n_stages}, {n_update})'
+                            + ('' if batch_index is not None else f' or ({self.N_batch}, {n_stages}, {n_update})') + f', got {param_values.shape}.')
+
+        update_params_sparse = getattr(self.__shared_lib, f"{self.__name}_acados_batch_update_params_sparse")
+        stages_data = cast(stages_.ctypes.data, POINTER(c_int))
+        idx_data = cast(idx_values.ctypes.data, POINTER(c_int))
+
+        def param_pointer(start):
+            return cast(c_void_p(param_values.ctypes.data + start * stride_batch * sizeof(c_double)), POINTER(c_double))
+
+        if batch_index is not None:
+            update_params_sparse(solvers_pointer, stages_data, n_stages, idx_data, param_pointer(0), n_update, stride_stage, stride_batch, n_batch, 1)
+        elif self.__num_threads_in_batch_solve > 1:
+            update_params_sparse(solvers_pointer, stages_data, n_stages, idx_data, param_pointer(0), n_update, stride_stage, stride_batch, n_batch, self.__num_threads)
+        else:
+            self.__run_chunked(lambda start, length: update_params_sparse(self.__solvers_pointer(start), stages_data, n_stages, idx_data, param_pointer(start),
+                                                                          n_update, stride_stage, stride_batch, length, 1), n_batch)
+
+
+    def set(self, stage_: int, field_: str, value_: np.ndarray) -> None:
+        """
+        Set a field at one stage for all `N_batch` solvers, see `set_stages()`.
+
+            :param stage_: integer corresponding to shooting node
+            :param field_: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p', 'yref', 'lbx', 'ubx', 'lbu', 'ubu', 'lg', 'ug', 'lh', 'uh']
+            :param value_: np.array of shape (N_batch, n_field)
+        """
+        self.set_stages(field_, value_, stages=[stage_])
+
+
+    def set_x0(self, x0: np.ndarray) -> None:
+        """
+        Set the initial state constraint for all `N_batch` solvers, i.e. lbx and ubx at stage 0.
+
+            :param x0: np.array of shape (N_batch, nx)
+        """
+        self.set_stages('lbx', x0, stages=[0])
+        self.set_stages('ubx', x0, stages=[0])
+
+
     def store_iterate_to_flat_obj(self) -> AcadosOcpFlattenedBatchIterate:
         """
         Returns the current iterate of the OCP solvers as an AcadosOcpFlattenedBatchIterate.
@@ -316,3 +872,9 @@ class AcadosOcpBatchSolver():
         self.set_flat("su", iterate.su)
         self.set_flat("pi", iterate.pi)
         self.set_flat("lam", iterate.lam)
+
+
+    def __del__(self):
+        if self.__thread_pool is not None:
+            self.__thread_pool.shutdown()
+            self.__thread_pool = None
@@ -30,7 +30,7 @@
 
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Dict, Optional
 import numpy as np
 
 
@@ -83,6 +83,8 @@ class AcadosOcpIterate:
 class AcadosOcpIterates:
 
     iterate_list: List[AcadosOcpIterate]
+    flat_iterates: Optional[AcadosOcpFlattenedBatchIterate] = None # shape (nlp_iter+1, n_field_total) for each field
+    stage_dims: Optional[Dict[str, List[int]]] = None # stage-wise dimensions of each field, required with flat_iterates
     __iterate_fields = ["x", "u", "z", "sl", "su", "pi", "lam"]
 
     def as_array(self, field: str, ) -> np.ndarray:
@@ -94,6 +96,12 @@ class AcadosOcpIterates:
         if field not in self.__iterate_fields:
             raise Exception(f"Invalid field: got {field}, expected value in {self.__iterate_fields}")
 
+        if self.flat_iterates is not None:
+            dims = self.stage_dims[field]
+            if any(d != dims[0] for d in dims):
+                raise Exception(f"Stage-wise dimensions are not the same for {field} trajectory.")
+            return getattr(self.flat_iterates, field).reshape(self.flat_iterates.N_batch, len(dims), dims[0])
+
         attr = f"{field}_traj"
         traj_ = [getattr(iterate, attr) for iterate in self.iterate_list]
 
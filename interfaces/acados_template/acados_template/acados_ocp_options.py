@@ -128,6 +128,7 @@ class AcadosOcpOptions:
         self.__custom_templates = []
         self.__custom_update_copy = True
         self.__num_threads_in_batch_solve: int = 1
+        self.__ext_fun_codegen_num_processes: int = 1
 
     @property
     def qp_solver(self):
@@ -1041,6 +1042,15 @@ class AcadosOcpOptions:
         """
         return self.__num_threads_in_batch_solve
 
+    @property
+    def ext_fun_codegen_num_processes(self):
+        """
+        Integer indicating how many processes should be used to generate the C code of the CasADi external functions.
+        If more than one process is used, the functions are generated in parallel using a process pool.
+        Default: 1.
+        """
+        return self.__ext_fun_codegen_num_processes
+
 
     @qp_solver.setter
     def qp_solver(self, qp_solver):
@@ -1697,5 +1707,12 @@ class AcadosOcpOptions:
         else:
             raise Exception('Invalid num_threads_in_batch_solve value. num_threads_in_batch_solve must be a positive integer.')
 
+    @ext_fun_codegen_num_processes.setter
+    def ext_fun_codegen_num_processes(self, ext_fun_codegen_num_processes):
+        if isinstance(ext_fun_codegen_num_processes, int) and ext_fun_codegen_num_processes > 0:
+            self.__ext_fun_codegen_num_processes = ext_fun_codegen_num_processes
+        else:
+            raise Exception('Invalid ext_fun_codegen_num_processes value. ext_fun_codegen_num_processes must be a positive integer.')
+
     def set(self, attr, value):
         setattr(self, attr, value)
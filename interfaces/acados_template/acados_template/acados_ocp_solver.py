@@ -34,6 +34,7 @@ import json
 import os
 import shutil
 import sys
+import threading
 import time
 
 from ctypes import (POINTER, byref, c_char_p, c_double, c_int, c_bool,
@@ -43,6 +44,8 @@ if os.name == 'nt':
     from ctypes import WinDLL as DllLoader
 else:
     from ctypes import CDLL as DllLoader
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
 from typing import Union, Optional, List, Tuple, Sequence, Dict
 
@@ -54,8 +57,9 @@ from .acados_multiphase_ocp import AcadosMultiphaseOcp
 from .gnsf.detect_gnsf_structure import detect_gnsf_structure
 from .utils import (get_shared_lib_ext, get_shared_lib_prefix, get_shared_lib_dir, get_shared_lib,
                     make_object_json_dumpable, set_up_imported_gnsf_model, verbose_system_call,
-                    acados_lib_is_compiled_with_openmp, is_empty, set_directory)
-from .acados_ocp_iterate import AcadosOcpIterate, AcadosOcpIterates, AcadosOcpFlattenedIterate
+                    acados_lib_is_compiled_with_openmp, is_empty, set_directory, get_build_hash,
+                    keep_timestamps_of_unchanged_files)
+from .acados_ocp_iterate import AcadosOcpIterate, AcadosOcpIterates, AcadosOcpFlattenedIterate, AcadosOcpFlattenedBatchIterate
 
 
 class AcadosOcpSolver:
@@ -64,6 +68,13 @@ class AcadosOcpSolver:
 
         :param acados_ocp: type :py:class:`~acados_template.acados_ocp.AcadosOcp` or :py:class:`~acados_template.acados_multiphase_ocp.AcadosMultiphaseOcp` - description of the OCP for acados
         :param json_file: name for the json file used to render the templated code - default: acados_ocp_nlp.json
+        :param build_cache_dir: directory in which built solver libraries are cached, keyed by a hash of the problem description, templates and compile flags.
+                If a matching entry exists, code generation and build are skipped and the cached library is loaded.
+                In this case, `shared_lib_name` points into the cache entry and only the json file is written to `code_export_directory`,
+                i.e. it does not contain the generated code and the library.
+                Requires `generate=True` and `build=True`; default: `None`, i.e. no caching.
+        :param incremental_build: if True, generated files with unchanged content keep their timestamps and object files are kept,
+                such that only changed sources are recompiled; default: False
     """
     if os.name == 'nt':
         dlclose = DllLoader('kernel32', use_last_error=True).FreeLibrary
@@ -91,7 +102,8 @@ class AcadosOcpSolver:
 
     # TODO move this to AcadosOcp
     @classmethod
-    def generate(cls, acados_ocp: Union[AcadosOcp, AcadosMultiphaseOcp], json_file: str, simulink_opts=None, cmake_builder: CMakeBuilder = None):
+    def generate(cls, acados_ocp: Union[AcadosOcp, AcadosMultiphaseOcp], json_file: str, simulink_opts=None, cmake_builder: CMakeBuilder = None, incremental: bool = False,
+                 verbose: bool = False):
         """
         Generates the code for an acados OCP solver, given the description in acados_ocp.
             :param acados_ocp: type Union[AcadosOcp, AcadosMultiphaseOcp] - description of the OCP for acados
@@ -101,6 +113,8 @@ class AcadosOcpSolver:
             :param cmake_builder: type :py:class:`~acados_template.builders.CMakeBuilder` generate a `CMakeLists.txt` and use
                    the `CMake` pipeline instead of a `Makefile` (`CMake` seems to be the better option in conjunction with
                    `MS Visual Studio`); default: `None`
+            :param incremental: if True, generated files with unchanged content keep their timestamps, such that an incremental build only recompiles changed files; default: False
+            :param verbose: if True, the time spent in the code generation of each CasADi function is printed; default: False
         """
         acados_ocp.code_export_directory = os.path.abspath(acados_ocp.code_export_directory)
         acados_ocp.simulink_opts = simulink_opts
@@ -124,22 +138,23 @@ class AcadosOcpSolver:
         if acados_ocp.solver_options.qp_solver in ['FULL_CONDENSING_QPOASES', 'PARTIAL_CONDENSING_QPDUNES', 'PARTIAL_CONDENSING_OSQP']:
             print(f"NOTE: The selected QP solver {acados_ocp.solver_options.qp_solver} does not support one-sided constraints yet.")
 
-        # generate code (external functions and templated code)
-        acados_ocp.generate_external_functions()
-        acados_ocp.dump_to_json()
-        acados_ocp.render_templates(cmake_builder=cmake_builder)
+        with keep_timestamps_of_unchanged_files(acados_ocp.code_export_directory) if incremental else nullcontext():
+            # generate code (external functions and templated code)
+            acados_ocp.generate_external_functions(verbose=verbose)
+            acados_ocp.dump_to_json()
+            acados_ocp.render_templates(cmake_builder=cmake_builder)
 
-        # copy custom update function
-        if acados_ocp.solver_options.custom_update_filename != "" and acados_ocp.solver_options.custom_update_copy:
-            target_location = os.path.join(acados_ocp.code_export_directory, acados_ocp.solver_options.custom_update_filename)
-            shutil.copyfile(acados_ocp.solver_options.custom_update_filename, target_location)
-        if acados_ocp.solver_options.custom_update_header_filename != "" and acados_ocp.solver_options.custom_update_copy:
-            target_location = os.path.join(acados_ocp.code_export_directory, acados_ocp.solver_options.custom_update_header_filename)
-            shutil.copyfile(acados_ocp.solver_options.custom_update_header_filename, target_location)
+            # copy custom update function
+            if acados_ocp.solver_options.custom_update_filename != "" and acados_ocp.solver_options.custom_update_copy:
+                target_location = os.path.join(acados_ocp.code_export_directory, acados_ocp.solver_options.custom_update_filename)
+                shutil.copyfile(acados_ocp.solver_options.custom_update_filename, target_location)
+            if acados_ocp.solver_options.custom_update_header_filename != "" and acados_ocp.solver_options.custom_update_copy:
+                target_location = os.path.join(acados_ocp.code_export_directory, acados_ocp.solver_options.custom_update_header_filename)
+                shutil.copyfile(acados_ocp.solver_options.custom_update_header_filename, target_location)
 
 
     @classmethod
-    def build(cls, code_export_dir, with_cython=False, cmake_builder: CMakeBuilder = None, verbose: bool = True):
+    def build(cls, code_export_dir, with_cython=False, cmake_builder: CMakeBuilder = None, verbose: bool = True, incremental: bool = False):
         """
         Builds the code for an acados OCP solver, that has been generated in code_export_dir
             :param code_export_dir: directory in which acados OCP solver has been generated, see generate()
@@ -148,6 +163,7 @@ class AcadosOcpSolver:
                    the `CMake` pipeline instead of a `Makefile` (`CMake` seems to be the better option in conjunction with
                    `MS Visual Studio`); default: `None`
             :param verbose: indicating if build command is printed
+            :param incremental: if True, existing object files are kept and only sources that changed are recompiled, see also `generate()`; default: False
         """
         code_export_dir = os.path.abspath(code_export_dir)
 
@@ -164,7 +180,8 @@ class AcadosOcpSolver:
                 if cmake_builder is not None:
                     cmake_builder.exec(code_export_dir, verbose)
                 else:
-                    verbose_system_call([make_cmd, 'clean_ocp_shared_lib'], verbose)
+                    if not incremental:
+                        verbose_system_call([make_cmd, 'clean_ocp_shared_lib'], verbose)
                     verbose_system_call([make_cmd, 'ocp_shared_lib'], verbose)
 
 
@@ -186,15 +203,26 @@ class AcadosOcpSolver:
         sys.path.append(os.path.dirname(code_export_directory))
         acados_ocp_solver_pyx = importlib.import_module(f'{os.path.split(code_export_directory)[1]}.acados_ocp_solver_pyx')
 
+        # multi-phase OCPs store the horizon length at the top level
+        if 'N_horizon' in acados_ocp_json:
+            N = acados_ocp_json['N_horizon']
+        else:
+            N = acados_ocp_json['dims']['N']
+
         AcadosOcpSolverCython = getattr(acados_ocp_solver_pyx, 'AcadosOcpSolverCython')
-        return AcadosOcpSolverCython(acados_ocp_json['model']['name'],
+        return AcadosOcpSolverCython(acados_ocp_json['name'],
                     acados_ocp_json['solver_options']['nlp_solver_type'],
-                    acados_ocp_json['dims']['N'])
+                    N,
+                    acados_ocp_json['solver_options'].get('store_iterates', False))
 
 
-    def __init__(self, acados_ocp: Union[AcadosOcp, AcadosMultiphaseOcp], json_file=None, simulink_opts=None, build=True, generate=True, cmake_builder: CMakeBuilder = None, verbose=True):
+    def __init__(self, acados_ocp: Union[AcadosOcp, AcadosMultiphaseOcp], json_file=None, simulink_opts=None, build=True, generate=True, cmake_builder: CMakeBuilder = None, verbose=True, build_cache_dir: Optional[str] = None, incremental_build: bool = False):
 
         self.solver_created = False
+        # worker thread and pending future of solve_async()
+        self.__async_executor = None
+        self.__async_future = None
+        self.__async_thread = None
 
         if not (isinstance(acados_ocp, AcadosOcp) or isinstance(acados_ocp, AcadosMultiphaseOcp)):
             raise Exception('acados_ocp should be of type AcadosOcp or AcadosMultiphaseOcp.')
@@ -202,8 +230,26 @@ class AcadosOcpSolver:
         if json_file is not None:
             acados_ocp.json_file = json_file
 
+        # look up build cache
+        build_cache_entry = None
+        build_cache_hit = False
+        if build_cache_dir is not None:
+            if not (generate and build):
+                raise Exception('build_cache_dir can only be used with generate=True and build=True.')
+            build_cache_entry = self.__get_build_cache_entry(acados_ocp, build_cache_dir, simulink_opts, cmake_builder)
+            build_cache_hit = os.path.isdir(build_cache_entry)
+            if build_cache_hit:
+                if verbose:
+                    print(f"Found solver in build cache {build_cache_entry}, skipping code generation and build.\n"
+                          f"Note: {acados_ocp.code_export_directory} does not contain the generated code, the solver library is loaded from the cache.")
+                acados_ocp.code_export_directory = os.path.abspath(acados_ocp.code_export_directory)
+                acados_ocp.simulink_opts = simulink_opts
+                shutil.copyfile(os.path.join(build_cache_entry, os.path.basename(acados_ocp.json_file)), acados_ocp.json_file)
+                generate = False
+                build = False
+
         if generate:
-            self.generate(acados_ocp, json_file=acados_ocp.json_file, simulink_opts=simulink_opts, cmake_builder=cmake_builder)
+            self.generate(acados_ocp, json_file=acados_ocp.json_file, simulink_opts=simulink_opts, cmake_builder=cmake_builder, incremental=incremental_build, verbose=verbose)
         else:
             acados_ocp.make_consistent()
 
@@ -221,12 +267,20 @@ class AcadosOcpSolver:
         code_export_directory = acados_ocp_json['code_export_directory']
 
         if build:
-            self.build(code_export_directory, with_cython=False, cmake_builder=cmake_builder, verbose=verbose)
+            self.build(code_export_directory, with_cython=False, cmake_builder=cmake_builder, verbose=verbose, incremental=incremental_build)
 
         # prepare library loading
         lib_ext = get_shared_lib_ext()
         lib_prefix = get_shared_lib_prefix()
         lib_dir = get_shared_lib_dir()
+        libacados_ocp_solver_name = f'{lib_prefix}acados_ocp_solver_{self.name}{lib_ext}'
+
+        if build_cache_entry is not None:
+            if not build_cache_hit:
+                self.__store_in_build_cache(build_cache_entry, acados_ocp.json_file,
+                                            os.path.join(code_export_directory, libacados_ocp_solver_name))
+            # load solver library from cache
+            code_export_directory = build_cache_entry
 
         # Load acados library to avoid unloading the library.
         # This is necessary if acados was compiled with OpenMP, since the OpenMP threads can't be destroyed.
@@ -240,7 +294,6 @@ class AcadosOcpSolver:
         # find out if acados was compiled with OpenMP
         self.__acados_lib_uses_omp = acados_lib_is_compiled_with_openmp(self.__acados_lib, verbose)
 
-        libacados_ocp_solver_name = f'{lib_prefix}acados_ocp_solver_{self.name}{lib_ext}'
         self.shared_lib_name = os.path.join(code_export_directory, libacados_ocp_solver_name)
 
         # get shared_lib
@@ -258,14 +311,20 @@ class AcadosOcpSolver:
 
         self.acados_ocp = acados_ocp
 
+        # field names encoded as c strings, see __field_handle()
+        self.__field_handles = {}
+
         # get pointers solver
         self.__get_pointers_solver()
+        self.__reset_dims_tables()
 
         self.status = 0
         self.time_solution_sens_solve = 0.0
         self.time_solution_sens_lin = 0.0
 
         # gettable fields
+        self.__iterate_fields = ['x', 'u', 'z', 'sl', 'su', 'pi', 'lam']
+        self.__sens_fields = ['x', 'u', 'pi', 'lam', 'sl', 'su']
         self.__qp_dynamics_fields = ['A', 'B', 'b']
         self.__qp_cost_fields = ['Q', 'R', 'S', 'q', 'r', 'zl', 'zu', 'Zl', 'Zu']
         self.__qp_constraint_fields = ['C', 'D', 'lg', 'ug', 'lbx', 'ubx', 'lbu', 'ubu']
@@ -284,6 +343,9 @@ class AcadosOcpSolver:
         self.__acados_lib.ocp_nlp_eval_param_sens.argtypes = [c_void_p, c_char_p, c_int, c_int, c_void_p]
         self.__acados_lib.ocp_nlp_eval_param_sens.restype = None
 
+        self.__acados_lib.ocp_nlp_eval_param_sens_all.argtypes = [c_void_p, c_char_p, c_int, c_void_p] + 7 * [POINTER(c_double)]
+        self.__acados_lib.ocp_nlp_eval_param_sens_all.restype = None
+
         self.__acados_lib.ocp_nlp_eval_solution_sens_adj_p.argtypes = [c_void_p, c_void_p, c_void_p, c_char_p, c_int, c_void_p]
         self.__acados_lib.ocp_nlp_eval_solution_sens_adj_p.restype = None
 
@@ -314,6 +376,8 @@ class AcadosOcpSolver:
 
         self.__acados_lib.ocp_nlp_get_from_iterate.argtypes = [c_void_p, c_int, c_int, c_char_p, c_void_p]
         self.__acados_lib.ocp_nlp_get_from_iterate.restypes = c_void_p
+        self.__acados_lib.ocp_nlp_get_all_from_iterates.argtypes = [c_void_p, c_int, c_int, c_char_p, POINTER(c_double)]
+        self.__acados_lib.ocp_nlp_get_all_from_iterates.restype = None
 
         self.__acados_lib.ocp_nlp_dims_get_total_from_attr.argtypes = [c_void_p, c_void_p, c_char_p]
         self.__acados_lib.ocp_nlp_dims_get_total_from_attr.restype = c_int
@@ -324,6 +388,12 @@ class AcadosOcpSolver:
         self.__acados_lib.ocp_nlp_set_all.argtypes = [c_void_p, c_void_p, c_void_p, c_char_p, c_void_p]
         self.__acados_lib.ocp_nlp_set_all.restype = None
 
+        self.__acados_lib.ocp_nlp_set_stages.argtypes = [c_void_p, c_void_p, c_void_p, c_char_p, POINTER(c_int), c_int, c_void_p]
+        self.__acados_lib.ocp_nlp_set_stages.restype = None
+
+        self.__acados_lib.ocp_nlp_shift_iterate.argtypes = [c_void_p, c_void_p, POINTER(c_double), POINTER(c_double)]
+        self.__acados_lib.ocp_nlp_shift_iterate.restype = None
+
         self.__acados_lib.ocp_nlp_out_set_values_to_zero.argtypes = [c_void_p, c_void_p, c_void_p]
 
         getattr(self.shared_lib, f"{self.name}_acados_solve").argtypes = [c_void_p]
@@ -360,8 +430,89 @@ class AcadosOcpSolver:
             getattr(self.shared_lib, f"{self.name}_acados_update_time_steps").argtypes = [c_void_p, c_int, c_void_p]
             getattr(self.shared_lib, f"{self.name}_acados_update_time_steps").restype = c_int
 
+        # cache frequently called functions of the generated solver
+        self.__solve_fun = getattr(self.shared_lib, f"{self.name}_acados_solve")
+        self.__update_params_fun = getattr(self.shared_lib, f"{self.name}_acados_update_params")
+
+        # fill dimension table for the iterate fields
+        for field in ['x', 'u', 'z', 'lam', 'sl', 'su', 'p']:
+            for stage in range(self.N + 1):
+                self.__get_dims(stage, field)
+            self.__get_total_dims(field)
+        for stage in range(self.N):
+            self.__get_dims(stage, 'pi')
+        self.__get_total_dims('pi')
+
         return
 
+    def _create_solver_handle(self, capsule: c_void_p, owner=None) -> 'AcadosOcpSolver':
+        """
+        Returns an `AcadosOcpSolver` interacting with another solver capsule of the same shared library, e.g. created by `AcadosOcpBatchSolver`.
+        The returned solver shares the loaded libraries, ctypes prototypes and dimension tables with this solver.
+        It does not own the capsule, i.e. the capsule is not freed when the returned solver is deleted,
+        and the solver can not be recreated, e.g. with `set_new_time_steps()`.
+
+            :param capsule: pointer to the solver capsule
+            :param owner: object owning the capsule, a reference is kept to ensure the capsule outlives the returned solver
+        """
+        handle = object.__new__(type(self))
+        handle.__dict__.update(self.__dict__)
+        handle.capsule = capsule
+        handle.solver_created = False
+        handle.status = 0
+        handle.__capsule_owner = owner
+        handle.__async_executor = None
+        handle.__async_future = None
+        handle.__async_thread = None
+        handle.__get_pointers_solver()
+        return handle
+
+
+    def __get_build_cache_entry(self, acados_ocp: Union[AcadosOcp, AcadosMultiphaseOcp], build_cache_dir: str, simulink_opts, cmake_builder: CMakeBuilder) -> str:
+        """
+        Private function to get the build cache directory corresponding to the given problem description.
+        """
+        acados_ocp.code_export_directory = os.path.abspath(acados_ocp.code_export_directory)
+        acados_ocp.simulink_opts = simulink_opts
+
+        problem_dict = acados_ocp.to_dict()
+        code_export_directory = acados_ocp.code_export_directory
+
+        # source files referenced by name, resolved as in code generation and the Makefile:
+        # generic dynamics and copied custom update files are copied from the current working directory,
+        # generic cost sources and custom update files which are not copied are compiled relative to the export directory
+        custom_update_dir = os.getcwd() if acados_ocp.solver_options.custom_update_copy else code_export_directory
+        extra_files = [(f, custom_update_dir) for f in [acados_ocp.solver_options.custom_update_filename, acados_ocp.solver_options.custom_update_header_filename]]
+        model_dicts = problem_dict['model'] if isinstance(problem_dict['model'], list) else [problem_dict['model']]
+        cost_dicts = problem_dict['cost'] if isinstance(problem_dict['cost'], list) else [problem_dict['cost']]
+        for model_dict, cost_dict in zip(model_dicts, cost_dicts):
+            extra_files += [(v, os.getcwd()) for k, v in model_dict.items() if k.endswith('_source')]
+            cost_dir = os.path.join(code_export_directory, f"{model_dict['name']}_cost")
+            extra_files += [(v, cost_dir) for k, v in cost_dict.items() if k.startswith('cost_source_')]
+        extra_files = list(dict.fromkeys((f, os.path.join(base_dir, f)) for f, base_dir in extra_files if isinstance(f, str) and f != ""))
+
+        build_hash = get_build_hash(problem_dict, cmake_builder, extra_files)
+        return os.path.join(os.path.abspath(build_cache_dir), build_hash)
+
+
+    def __store_in_build_cache(self, build_cache_entry: str, json_file: str, shared_lib_file: str):
+        """
+        Private function to copy the json file and the solver library into the build cache.
+        The entry is written to a temporary directory first and then renamed, such that concurrent processes never see incomplete entries.
+        """
+        build_cache_parent = os.path.dirname(build_cache_entry)
+        os.makedirs(build_cache_parent, exist_ok=True)
+        tmp_entry = f'{build_cache_entry}_tmp_{os.getpid()}'
+        os.makedirs(tmp_entry, exist_ok=True)
+        shutil.copyfile(json_file, os.path.join(tmp_entry, os.path.basename(json_file)))
+        shutil.copyfile(shared_lib_file, os.path.join(tmp_entry, os.path.basename(shared_lib_file)))
+        try:
+            os.replace(tmp_entry, build_cache_entry)
+        except OSError:
+            # entry was created by another process in the meantime
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+
     def __get_pointers_solver(self):
         """
         Private function to get the pointers for solver
@@ -396,6 +547,80 @@ class AcadosOcpSolver:
         self.nlp_solver = getattr(self.shared_lib, f"{self.name}_acados_get_nlp_solver")(self.capsule)
 
 
+    def __reset_dims_tables(self):
+        """
+        Private function to reset the dimension tables, which have to be refilled after the solver is (re)created.
+        """
+        self.__dims_table = {}
+        self.__total_dims_table = {}
+        self.__cost_dims_table = {}
+        self.__constraint_dims_table = {}
+
+
+    def __field_handle(self, field: str) -> bytes:
+        """
+        Private function returning the field name encoded as c string, encoding is done only once per field.
+        """
+        handle = self.__field_handles.get(field)
+        if handle is None:
+            handle = field.encode('utf-8')
+            self.__field_handles[field] = handle
+        return handle
+
+
+    def __get_dims(self, stage: int, field: str) -> int:
+        """
+        Private function returning the dimension of a field at a stage, the C interface is only queried once per (stage, field).
+        """
+        key = (stage, field)
+        dims = self.__dims_table.get(key)
+        if dims is None:
+            dims = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, stage, self.__field_handle(field))
+            self.__dims_table[key] = dims
+        return dims
+
+
+    def __get_total_dims(self, field: str) -> int:
+        """
+        Private function returning the dimension of a field summed over all stages, the C interface is only queried once per field.
+        """
+        dims = self.__total_dims_table.get(field)
+        if dims is None:
+            dims = self.__acados_lib.ocp_nlp_dims_get_total_from_attr(self.nlp_config, self.nlp_dims, self.__field_handle(field))
+            self.__total_dims_table[field] = dims
+        return dims
+
+
+    def __get_cost_dims(self, stage: int, field: str) -> Tuple[int, int]:
+        """
+        Private function returning the 2D dimension of a cost field at a stage, the C interface is only queried once per (stage, field).
+        """
+        key = (stage, field)
+        dims = self.__cost_dims_table.get(key)
+        if dims is None:
+            dims_ = np.zeros((2,), dtype=np.intc, order="C")
+            self.__acados_lib.ocp_nlp_cost_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, stage,
+                                                               self.__field_handle(field), cast(dims_.ctypes.data, POINTER(c_int)))
+            dims = (int(dims_[0]), int(dims_[1]))
+            self.__cost_dims_table[key] = dims
+        return dims
+
+
+    def __get_constraint_dims(self, stage: int, field: str) -> Tuple[int, int]:
+        """
+        Private function returning the 2D dimension of a constraint field at a stage, the C interface is only queried once per (stage, field).
+        """
+        key = (stage, field)
+        dims = self.__constraint_dims_table.get(key)
+        if dims is None:
+            dims_ = np.zeros((2,), dtype=np.intc, order="C")
+            self.__acados_lib.ocp_nlp_constraint_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, stage,
+                                                                     self.__field_handle(field), cast(dims_.ctypes.data, POINTER(c_int)))
+            dims = (int(dims_[0]), int(dims_[1]))
+            self.__constraint_dims_table[key] = dims
+        return dims
+
+
     def solve_for_x0(self, x0_bar, fail_on_nonzero_status=True, print_stats_on_failure=True):
         """
         Wrapper around `solve()` which sets initial state constraint, solves the OCP, and returns u0.
@@ -423,11 +648,79 @@ class AcadosOcpSolver:
 
         :return: status of the solver
         """
-        self.status = getattr(self.shared_lib, f"{self.name}_acados_solve")(self.capsule)
+        self.status = self.__solve_fun(self.capsule)
+
+        return self.status
+
+
+    def __solve_rti_phase(self, rti_phase: int) -> int:
+        """
+        Private function solving with the given rti_phase and resetting it to 0 afterwards.
+        """
+        if self.__solver_options['nlp_solver_type'] != 'SQP_RTI':
+            raise Exception('AcadosOcpSolver: prepare() and feedback() are only supported for nlp_solver_type SQP_RTI.')
+
+        field = self.__field_handle('rti_phase')
+        self.__acados_lib.ocp_nlp_solver_opts_set(self.nlp_config, self.nlp_opts, field, byref(c_int(rti_phase)))
+        self.status = self.__solve_fun(self.capsule)
+        self.__acados_lib.ocp_nlp_solver_opts_set(self.nlp_config, self.nlp_opts, field, byref(c_int(0)))
 
         return self.status
 
 
+    def prepare(self) -> int:
+        """
+        Run the preparation phase of the real-time iteration, i.e. linearize and condense the problem at the current iterate.
+        To be called ahead of time, e.g. right after applying the last control, such that only `feedback()` adds latency.
+        Only supported for nlp_solver_type SQP_RTI.
+
+        :return: status of the solver
+        """
+        return self.__solve_rti_phase(1)
+
+
+    def feedback(self, x0: Optional[np.ndarray] = None) -> int:
+        """
+        Run the feedback phase of the real-time iteration, i.e. solve the prepared QP, after a call to `prepare()`.
+        The time of this call, reported as `time_feedback` by `get_stats`, is the latency seen by the controller.
+        Only supported for nlp_solver_type SQP_RTI.
+
+        :param x0: if given, the initial state constraint is set to x0 before the feedback phase
+        :return: status of the solver
+        """
+        if x0 is not None:
+            self.set(0, "lbx", x0)
+            self.set(0, "ubx", x0)
+
+        return self.__solve_rti_phase(2)
+
+
+    def solve_async(self) -> Future:
+        """
+        Start solving the ocp with current input on a worker thread and return immediately.
+        The call into the shared library releases the GIL, such that Python code, e.g. I/O or solves of other solver instances, can run concurrently.
+        Within an asyncio event loop, the future can be awaited using `await asyncio.wrap_future(solver.solve_async())`.
+
+        The solver must not be accessed until the returned future is done.
+        Its result is a tuple `(status, time_tot)` with the status of the solver and the total solve time in seconds.
+
+        :return: future of type :py:class:`concurrent.futures.Future`
+        """
+        if self.__async_future is not None and not self.__async_future.done():
+            raise Exception('AcadosOcpSolver.solve_async(): the previous asynchronous solve is still running.')
+
+        if self.__async_executor is None:
+            self.__async_executor = ThreadPoolExecutor(max_workers=1)
+
+        def solve_and_get_time():
+            self.__async_thread = threading.current_thread()
+            status = self.solve()
+            return status, self.get_stats('time_tot')
+
+        self.__async_future = self.__async_executor.submit(solve_and_get_time)
+        return self.__async_future
+
+
     def get_dim_flat(self, field: str):
         """
         Get dimension of flattened iterate.
@@ -435,7 +728,28 @@ class AcadosOcpSolver:
         if field not in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']:
             raise Exception(f'AcadosOcpSolver.get_dim_flat(field={field}): \'{field}\' is an invalid argument.')
 
-        return self.__acados_lib.ocp_nlp_dims_get_total_from_attr(self.nlp_config, self.nlp_dims, field.encode('utf-8'))
+        return self.__get_total_dims(field)
+
+
+    def __get_stage_dims(self, field: str) -> List[int]:
+        """
+        Private function returning the dimension of a field at all stages it is defined at, i.e. the stages contained in `get_flat(field)`.
+        """
+        n_stages = self.N if field in ['u', 'z', 'pi'] else self.N + 1
+        return [self.__get_dims(stage, field) for stage in range(n_stages)]
+
+
+    def __check_or_create_output_buffer(self, out: Optional[np.ndarray], dims: int, caller: str) -> np.ndarray:
+        """
+        Private function returning a new output array of size dims if out is None, otherwise checks that out can be written to directly.
+        """
+        if out is None:
+            return np.zeros((dims,), dtype=np.float64, order="C")
+        if not isinstance(out, np.ndarray) or out.dtype != np.float64 or not out.flags['C_CONTIGUOUS'] or not out.flags['WRITEABLE']:
+            raise Exception(f'AcadosOcpSolver.{caller}: out must be a writeable C-contiguous numpy array of dtype float64.')
+        if out.size != dims:
+            raise Exception(f'AcadosOcpSolver.{caller}: out has wrong size, expected {dims}, got {out.size}.')
+        return out
 
 
     def custom_update(self, data_: np.ndarray):
@@ -502,6 +816,7 @@ class AcadosOcpSolver:
 
             # get pointers solver
             self.__get_pointers_solver()
+            self.__reset_dims_tables()
 
         # store time_steps, N
         self.__solver_options['time_steps'] = new_time_steps
@@ -540,6 +855,7 @@ class AcadosOcpSolver:
 
             # get pointers solver
             self.__get_pointers_solver()
+            self.__reset_dims_tables()
 
 
     def eval_and_get_optimal_value_gradient(self, with_respect_to: str = "initial_state") -> np.ndarray:
@@ -569,18 +885,18 @@ class AcadosOcpSolver:
             if not self.acados_ocp.constraints.has_x0:
                 raise Exception("OCP does not have an initial state constraint.")
 
-            nx = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "x".encode('utf-8'))
-            nbu = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "lbu".encode('utf-8'))
-            ns = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "s".encode('utf-8'))
+            nx = self.__get_dims(0, "x")
+            nbu = self.__get_dims(0, "lbu")
+            ns = self.__get_dims(0, "s")
 
             lam = self.get(0, 'lam')
             nlam_non_slack = lam.shape[0]//2 - ns
             grad = lam[nbu:nbu+nx] - lam[nlam_non_slack+nbu : nlam_non_slack+nbu+nx]
 
         elif with_respect_to == "initial_control":
-            nu = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "u".encode('utf-8'))
-            nbu = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "lbu".encode('utf-8'))
-            ns = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "s".encode('utf-8'))
+            nu = self.__get_dims(0, "u")
+            nbu = self.__get_dims(0, "lbu")
+            ns = self.__get_dims(0, "s")
             lbu = self.get_from_qp_in(0, 'lbu')
             ubu = self.get_from_qp_in(0, 'ubu')
 
@@ -592,7 +908,7 @@ class AcadosOcpSolver:
             grad = lam[:nbu] - lam[nlam_non_slack : nlam_non_slack+nbu]
 
         elif with_respect_to == "p_global":
-            np_global = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "p_global".encode('utf-8'))
+            np_global = self.__get_dims(0, "p_global")
 
             field = "p_global".encode('utf-8')
             t0 = time.time()
@@ -684,114 +1000,99 @@ class AcadosOcpSolver:
         stages_is_list = isinstance(stages, list)
         stages_ = stages if stages_is_list else [stages]
 
-        sens_x = []
-        sens_u = []
-        sens_pi = []
-        sens_lam = []
-        sens_sl = []
-        sens_su = []
-
         N = self.acados_ocp.solver_options.N_horizon
 
         for s in stages_:
             if not isinstance(s, int) or s < 0 or s > N:
                 raise Exception(f"AcadosOcpSolver.eval_solution_sensitivity(): stages need to be int or list[int] and in [0, N], got stages = {stages_}.")
 
-        if with_respect_to == "initial_state":
-            nx = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "x".encode('utf-8'))
-            ngrad = nx
-            field = "ex"
-            self._sanity_check_solution_sensitivities(parametric=False)
+        field, ngrad = self.__prepare_solution_sensitivity(with_respect_to, 'eval_solution_sensitivity')
 
-        elif with_respect_to == "p_global":
-            np_global = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "p_global".encode('utf-8'))
-            ngrad = np_global
-            field = "p_global"
-            self._sanity_check_solution_sensitivities()
+        sens_fields = [f for f, flag in zip(self.__sens_fields, [return_sens_x, return_sens_u, return_sens_pi,
+                                                                 return_sens_lam, return_sens_sl, return_sens_su]) if flag]
+        sens_flat = self.__eval_param_sens_all(field, ngrad, sens_fields)
 
-            # compute jacobians wrt params in all modules
-            t0 = time.time()
-            self.__acados_lib.ocp_nlp_eval_params_jac(self.nlp_solver, self.nlp_in, self.nlp_out)
-            self.time_solution_sens_lin = time.time() - t0
+        # split into the jacobians of shape (nfield[s], ngrad), stages without the field are skipped
+        out = {}
+        for f in sens_fields:
+            offsets = np.cumsum([0] + self.__get_stage_dims(f)) * ngrad
+            sens = [sens_flat[f][offsets[s]:offsets[s+1]].reshape(-1, ngrad) for s in stages_ if s < len(offsets) - 1]
+            out[f"sens_{f}"] = sens if stages_is_list else sens[0]
 
-        else:
-            raise Exception(f"AcadosOcpSolver.eval_solution_sensitivity(): Unknown field: with_respect_to = {with_respect_to}")
+        return out
 
-        # initialize jacobians with zeros
-        for s in stages_:
 
-            if return_sens_x:
-                nx = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, s, "x".encode('utf-8'))
-                sens_x.append(np.zeros((nx, ngrad)))
+    def eval_solution_sensitivity_all_stages(self,
+                                             with_respect_to: str,
+                                             return_sens_x: bool = True,
+                                             return_sens_u: bool = True,
+                                             return_sens_pi: bool = False,
+                                             return_sens_lam: bool = False,
+                                             return_sens_su: bool = False,
+                                             return_sens_sl: bool = False,
+                                             ) \
+                -> Dict:
+        """
+        Evaluate the sensitivities of the current solution with respect to the initial state or the parameters at all stages.
+        All seed directions are solved with a single call to the C interface, which writes directly into dense tensors.
+        The dimension of the returned fields has to be the same at all stages, otherwise use `eval_solution_sensitivity()`.
 
-            if return_sens_lam:
-                nlam = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, s, "lam".encode('utf-8'))
-                sens_lam.append(np.zeros((nlam, ngrad)))
+            :param with_respect_to: string in ["initial_state", "p_global"]
+            :param return_sens_x, ..., return_sens_sl: flags as in `eval_solution_sensitivity()`.
+            :returns: A dictionary with the solution sensitivities as np.ndarrays of shape (n_stages, nfield, ngrad),
+                    e.g. sens_x of shape (N+1, nx, ngrad) and sens_u of shape (N, nu, ngrad).
 
-            if return_sens_sl:
-                ns = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, s, "s".encode('utf-8'))
-                sens_sl.append(np.zeros((ns, ngrad)))
+        .. note:: The requirements listed in `eval_solution_sensitivity()` apply.
+        """
+        field, ngrad = self.__prepare_solution_sensitivity(with_respect_to, 'eval_solution_sensitivity_all_stages')
 
-            if return_sens_su:
-                ns = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, s, "s".encode('utf-8'))
-                sens_su.append(np.zeros((ns, ngrad)))
+        sens_fields = [f for f, flag in zip(self.__sens_fields, [return_sens_x, return_sens_u, return_sens_pi,
+                                                                 return_sens_lam, return_sens_sl, return_sens_su]) if flag]
+        for f in sens_fields:
+            stage_dims = self.__get_stage_dims(f)
+            if any(d != stage_dims[0] for d in stage_dims):
+                raise Exception(f'AcadosOcpSolver.eval_solution_sensitivity_all_stages(): dimension of {f} varies along the horizon, got {stage_dims}, use eval_solution_sensitivity() instead.')
 
-            if s < N:
-                if return_sens_u:
-                    nu = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, s, "u".encode('utf-8'))
-                    sens_u.append(np.zeros((nu, ngrad)))
+        sens_flat = self.__eval_param_sens_all(field, ngrad, sens_fields)
 
-                if return_sens_pi:
-                    npi = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, s, "pi".encode('utf-8'))
-                    sens_pi.append(np.zeros((npi, ngrad)))
+        return {f"sens_{f}": sens_flat[f].reshape(len(self.__get_stage_dims(f)), -1, ngrad) for f in sens_fields}
 
-        self.time_solution_sens_solve = 0.0
-        for k in range(ngrad):
-            # evaluate sensitivity
-            self.__acados_lib.ocp_nlp_eval_param_sens(self.nlp_solver, field.encode('utf-8'), 0, k, self.sens_out)
-
-            # get timing
-            self.time_solution_sens_solve += self.get_stats("time_solution_sensitivities")
-
-            # extract sensitivities
-            for n, s in enumerate(stages_):
-
-                if return_sens_x:
-                    sens_x[n][:, k] = self.get(s, "sens_x")
-                if return_sens_lam:
-                    sens_lam[n][:, k] = self.get(s, "sens_lam")
-                if return_sens_sl:
-                    sens_sl[n][:, k] = self.get(s, "sens_sl")
-                if return_sens_su:
-                    sens_su[n][:, k] = self.get(s, "sens_su")
-
-                if s < N:
-                    if return_sens_u:
-                        sens_u[n][:, k] = self.get(s, "sens_u")
-                    if return_sens_pi:
-                        sens_pi[n][:, k] = self.get(s, "sens_pi")
 
-        out = {}
+    def __prepare_solution_sensitivity(self, with_respect_to: str, caller: str) -> Tuple[str, int]:
+        """
+        Private function checking the requirements for the forward solution sensitivities and, for p_global,
+        evaluating the jacobians wrt the parameters in all modules. Returns the C field and the number of seeds.
+        """
+        if with_respect_to == "initial_state":
+            self._sanity_check_solution_sensitivities(parametric=False)
+            return "ex", self.__get_dims(0, "x")
 
-        if return_sens_x:
-            out["sens_x"] = sens_x if stages_is_list else sens_x[0]
+        elif with_respect_to == "p_global":
+            self._sanity_check_solution_sensitivities()
 
-        if return_sens_u:
-            out["sens_u"] = sens_u if stages_is_list else sens_u[0]
+            # compute jacobians wrt params in all modules
+            t0 = time.time()
+            self.__acados_lib.ocp_nlp_eval_params_jac(self.nlp_solver, self.nlp_in, self.nlp_out)
+            self.time_solution_sens_lin = time.time() - t0
+            return "p_global", self.__get_dims(0, "p_global")
 
-        if return_sens_pi:
-            out["sens_pi"] = sens_pi if stages_is_list else sens_pi[0]
+        raise Exception(f"AcadosOcpSolver.{caller}(): Unknown field: with_respect_to = {with_respect_to}")
 
-        if return_sens_lam:
-            out["sens_lam"] = sens_lam if stages_is_list else sens_lam[0]
 
-        if return_sens_sl:
-            out["sens_sl"] = sens_sl if stages_is_list else sens_sl[0]
+    def __eval_param_sens_all(self, field: str, ngrad: int, sens_fields: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Private function evaluating the solution sensitivities for all ngrad seeds with a single call to the C interface.
+        Returns the flat sensitivities of the fields in sens_fields, i.e. row-major blocks of shape (nfield[s], ngrad) stacked over the stages.
+        """
+        sens_flat = {f: np.zeros((sum(self.__get_stage_dims(f)) * ngrad,)) for f in sens_fields}
+        sens_data = [cast(sens_flat[f].ctypes.data, POINTER(c_double)) if f in sens_flat else None for f in self.__sens_fields]
 
-        if return_sens_su:
-            out["sens_su"] = sens_su if stages_is_list else sens_su[0]
+        time_solution_sens = c_double(0.0)
+        self.__acados_lib.ocp_nlp_eval_param_sens_all(self.nlp_solver, self.__field_handle(field), ngrad, self.sens_out,
+                                                      *sens_data, byref(time_solution_sens))
+        self.time_solution_sens_solve = time_solution_sens.value
 
-        return out
+        return sens_flat
 
 
     def eval_adjoint_solution_sensitivity(self,
@@ -841,8 +1142,8 @@ class AcadosOcpSolver:
         if sanity_checks:
             N_horizon = self.acados_ocp.solver_options.N_horizon
             self._sanity_check_solution_sensitivities()
-            nx = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "x".encode('utf-8'))
-            nu = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "u".encode('utf-8'))
+            nx = self.__get_dims(0, "x")
+            nu = self.__get_dims(0, "u")
 
             # check seeds
             for seed, name, dim in [(seed_x, "seed_x", nx), (seed_u, "seed_u", nu)]:
@@ -857,7 +1158,7 @@ class AcadosOcpSolver:
         if with_respect_to == "p_global":
             field = "p_global".encode('utf-8')
 
-            nparam = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, field)
+            nparam = self.__get_dims(0, "p_global")
 
             grad_p = np.zeros((n_seeds, nparam), order='C', dtype=np.float64)
 
@@ -916,13 +1217,13 @@ class AcadosOcpSolver:
         if field == "ex":
             if not stage == 0:
                 raise Exception('AcadosOcpSolver.eval_param_sens(): only stage == 0 is supported.')
-            nx = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, stage, "x".encode('utf-8'))
+            nx = self.__get_dims(stage, "x")
 
             if index < 0 or index > nx:
                 raise Exception(f'AcadosOcpSolver.eval_param_sens(): index must be in [0, nx-1], got: {index}.')
 
         elif field == "p_global":
-            nparam = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "p".encode('utf-8'))
+            nparam = self.__get_dims(0, "p")
 
             if index < 0 or index > nparam:
                 raise Exception(f'AcadosOcpSolver.eval_param_sens(): index must be in [0, nparam-1], got: {index}.')
@@ -933,12 +1234,13 @@ class AcadosOcpSolver:
         return
 
 
-    def get(self, stage_: int, field_: str):
+    def get(self, stage_: int, field_: str, out: Optional[np.ndarray] = None):
         """
         Get the last solution of the solver:
 
             :param stage: integer corresponding to shooting node
             :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p', 'sens_u', 'sens_pi', 'sens_x', 'sens_lam', 'sens_sl', 'sens_su']
+            :param out: optional preallocated C-contiguous float64 array the result is written to, avoids allocating a new array
 
             .. note:: regarding lam: \n
                     the inequalities are internally organized in the following order: \n
@@ -971,11 +1273,10 @@ class AcadosOcpSolver:
             raise Exception(f'AcadosOcpSolver.get(stage={stage_}, field={field_}): field \'{field_}\' does not exist at final stage {stage_}.')
 
         field = field_.replace('sens_', '') if field_ in sens_fields else field_
-        field = field.encode('utf-8')
-
-        dims = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, stage_, field)
+        dims = self.__get_dims(stage_, field)
+        field = self.__field_handle(field)
 
-        out = np.zeros((dims,), dtype=np.float64, order="C")
+        out = self.__check_or_create_output_buffer(out, dims, f'get(stage={stage_}, field={field_})')
         out_data = cast(out.ctypes.data, POINTER(c_double))
 
         if field_ in in_fields:
@@ -987,36 +1288,65 @@ class AcadosOcpSolver:
         return out
 
 
-    def get_flat(self, field_: str) -> np.ndarray:
+    def get_flat(self, field_: str, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Get concatenation of all stages of last solution of the solver.
 
             :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']
+            :param out: optional preallocated C-contiguous float64 array the result is written to, avoids allocating a new array
         """
         if field_ not in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']:
             raise Exception(f'AcadosOcpSolver.get_flat(field={field_}): \'{field_}\' is an invalid argument.')
 
-        field = field_.encode('utf-8')
-
-        dims = self.__acados_lib.ocp_nlp_dims_get_total_from_attr(self.nlp_config, self.nlp_dims, field)
+        field = self.__field_handle(field_)
+        dims = self.__get_total_dims(field_)
 
-        out = np.zeros((dims,), dtype=np.float64, order="C")
+        out = self.__check_or_create_output_buffer(out, dims, f'get_flat(field={field_})')
         out_data = cast(out.ctypes.data, POINTER(c_double))
 
         self.__acados_lib.ocp_nlp_get_all(self.nlp_solver, self.nlp_in, self.nlp_out, field, out_data)
         return out
 
 
+    def get_trajectory(self, field_: str, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get the trajectory of a field of the last solution of the solver as a 2D array of shape (n_stages, n_field),
+        where n_stages is N for 'u', 'z', 'pi' and N+1 otherwise.
+        The trajectory is obtained with a single call to the C interface.
+        The dimension of the field has to be the same at all stages, otherwise use `get_flat()`.
+
+            :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']
+            :param out: optional preallocated C-contiguous float64 array of shape (n_stages, n_field), which is filled and returned.
+                    Reusing the same array avoids allocations, e.g. in a closed-loop simulation.
+        """
+        if field_ not in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']:
+            raise Exception(f'AcadosOcpSolver.get_trajectory(field={field_}): \'{field_}\' is an invalid argument.')
+
+        stage_dims = self.__get_stage_dims(field_)
+        if any(d != stage_dims[0] for d in stage_dims):
+            raise Exception(f'AcadosOcpSolver.get_trajectory(field={field_}): dimension of field varies along the horizon, got {stage_dims}, use get_flat() instead.')
+
+        shape = (len(stage_dims), stage_dims[0])
+        if out is not None:
+            if not isinstance(out, np.ndarray) or out.shape != shape:
+                raise Exception(f'AcadosOcpSolver.get_trajectory(field={field_}): out has wrong shape, expected {shape}.')
+            self.__check_or_create_output_buffer(out, out.size, f'get_trajectory(field={field_})')
+            self.get_flat(field_, out=out.reshape(-1))
+            return out
+
+        return self.get_flat(field_).reshape(shape)
+
+
     def set_flat(self, field_: str, value_: np.ndarray) -> None:
         """
         Set concatenation solver initialization .
 
             :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']
         """
-        field = field_.encode('utf-8')
         if field_ not in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']:
             raise Exception(f'AcadosOcpSolver.get_flat(field={field_}): \'{field_}\' is an invalid argument.')
-        dims = self.__acados_lib.ocp_nlp_dims_get_total_from_attr(self.nlp_config, self.nlp_dims, field)
+        field = self.__field_handle(field_)
+        dims = self.__get_total_dims(field_)
 
         if len(value_) != dims:
             raise Exception(f'AcadosOcpSolver.set_flat(field={field_}, value): value has wrong length, expected {dims}, got {len(value_)}.')
@@ -1029,6 +1359,79 @@ class AcadosOcpSolver:
         return
 
 
+    def set_stages(self, field_: str, value_: np.ndarray, stages: Optional[Sequence[int]] = None) -> None:
+        """
+        Set a field at multiple stages with a single call to the C interface.
+
+            :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p', 'yref', 'lbx', 'ubx', 'lbu', 'ubu', 'lg', 'ug', 'lh', 'uh']
+            :param value: 2D array of shape (n_stages, n_field) or 1D array containing the concatenation of the values at all stages
+            :param stages: stage indices, default: all stages at which the field is defined, i.e. 0, ..., N-1 for 'u', 'z', 'pi', 'lbu', 'ubu' and 0, ..., N otherwise
+        """
+        out_fields = ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su']
+        in_fields = ['p', 'yref', 'lbx', 'ubx', 'lbu', 'ubu', 'lg', 'ug', 'lh', 'uh']
+        if field_ not in out_fields + in_fields:
+            raise Exception(f'AcadosOcpSolver.set_stages(field={field_}): \'{field_}\' is an invalid argument.\n'
+                            f' Possible values are {out_fields + in_fields}.')
+
+        if stages is None:
+            n_stages = self.N if field_ in ['u', 'z', 'pi', 'lbu', 'ubu'] else self.N + 1
+            stages = range(n_stages)
+
+        stages_ = np.ascontiguousarray(stages, dtype=np.intc)
+        if stages_.ndim != 1 or np.any(stages_ < 0) or np.any(stages_ > self.N) or (field_ == 'pi' and np.any(stages_ == self.N)):
+            raise Exception(f'AcadosOcpSolver.set_stages(field={field_}): invalid stages {stages}.')
+
+        field = self.__field_handle(field_)
+        stage_dims = [self.__get_dims(int(stage), field_) for stage in stages_]
+
+        value_ = np.ascontiguousarray(value_, dtype=np.float64)
+        if value_.ndim == 2:
+            if value_.shape[0] != len(stages_) or any(d != value_.shape[1] for d in stage_dims):
+                raise Exception(f'AcadosOcpSolver.set_stages(field={field_}): value has wrong shape, expected ({len(stages_)}, n_field), got {value_.shape}, dimensions at stages are {stage_dims}.')
+        elif value_.ndim != 1 or value_.size != sum(stage_dims):
+            raise Exception(f'AcadosOcpSolver.set_stages(field={field_}): value has wrong size, expected {sum(stage_dims)}, got {value_.size}.')
+
+        stages_data = cast(stages_.ctypes.data, POINTER(c_int))
+        value_data = cast(value_.ctypes.data, c_void_p)
+        self.__acados_lib.ocp_nlp_set_stages(self.nlp_solver, self.nlp_in, self.nlp_out, field, stages_data, len(stages_), value_data)
+        return
+
+
+    def shift_iterate(self, x_terminal: Optional[np.ndarray] = None, u_terminal: Optional[np.ndarray] = None, sim_solver = None) -> None:
+        """
+        Shift the current iterate by one stage in place to warm start the next solve of a receding horizon controller,
+        i.e. the values x, u, z, pi, lam, sl, su at stage i are replaced by the ones at stage i+1 with a single call to the C interface.
+        Values at stages with differing dimensions are kept, e.g. lam at stage 0 if the initial state constraint differs from the path constraints.
+        By default, the values at the last stage are duplicated.
+
+            :param x_terminal: guess for the states at stage N after the shift, default: keep the current values
+            :param u_terminal: guess for the controls at stage N-1 after the shift, e.g. from a terminal controller, default: keep the current values
+            :param sim_solver: optional :py:class:`~acados_template.acados_sim_solver.AcadosSimSolver`, used to compute `x_terminal`
+                by simulating the states at stage N with the controls `u_terminal`, or the controls at stage N-1 if `u_terminal` is not given
+        """
+        N = self.N
+        nx = self.__get_dims(N, 'x')
+        nu = self.__get_dims(N-1, 'u')
+
+        if sim_solver is not None:
+            if x_terminal is not None:
+                raise Exception('AcadosOcpSolver.shift_iterate(): x_terminal and sim_solver cannot be given both.')
+            x_terminal = sim_solver.simulate(x=self.get(N, 'x'), u=self.get(N-1, 'u') if u_terminal is None else u_terminal)
+
+        terminal_data = []
+        for name, value, dim in [('x_terminal', x_terminal, nx), ('u_terminal', u_terminal, nu)]:
+            if value is None:
+                terminal_data.append(None)
+                continue
+            value = np.ascontiguousarray(value, dtype=np.float64).ravel()
+            if value.shape != (dim,):
+                raise Exception(f'AcadosOcpSolver.shift_iterate(): {name} has wrong shape, expected ({dim},), got {value.shape}.')
+            terminal_data.append(value)
+
+        x_data, u_data = [None if value is None else cast(value.ctypes.data, POINTER(c_double)) for value in terminal_data]
+        self.__acados_lib.ocp_nlp_shift_iterate(self.nlp_solver, self.nlp_out, x_data, u_data)
+
+
     def print_statistics(self):
         """
         prints statistics of previous solver run as a table:
@@ -1107,9 +1510,21 @@ class AcadosOcpSolver:
         return
 
 
+    @staticmethod
+    def __timestamped_filename(filename: str) -> str:
+        """
+        Private function appending a timestamp to filename before its extension, if the file exists.
+        """
+        if os.path.isfile(filename):
+            root, ext = os.path.splitext(filename)
+            filename = root + datetime.now().strftime('%Y-%m-%d-%H:%M:%S.%f') + ext
+        return filename
+
+
     def store_iterate(self, filename: str = '', overwrite: bool = False, verbose: bool = True):
         """
-        Stores the current iterate of the OCP solver in a json file.
+        Stores the current iterate of the OCP solver in a json file,
+        or in a binary numpy file if filename ends with '.npz', containing the flattened iterate, see `store_iterate_to_flat_obj()`.
         Note: This does not contain the iterate of the integrators, and the parameters.
 
             :param filename: if not set, use f'{self.name}_iterate.json'
@@ -1119,10 +1534,13 @@ class AcadosOcpSolver:
             filename = f'{self.name}_iterate.json'
 
         if not overwrite:
-            # append timestamp
-            if os.path.isfile(filename):
-                filename = filename[:-5]
-                filename += datetime.now().strftime('%Y-%m-%d-%H:%M:%S.%f') + '.json'
+            filename = self.__timestamped_filename(filename)
+
+        if filename.endswith('.npz'):
+            np.savez(filename, **self.store_iterate_to_flat_obj().__dict__)
+            if verbose:
+                print("stored current iterate in ", os.path.join(os.getcwd(), filename))
+            return
 
         # get iterate:
         solution = dict()
@@ -1238,23 +1656,10 @@ class AcadosOcpSolver:
             return qp_diagnostic
 
 
-    def dump_last_qp_to_json(self, filename: str = '', overwrite=False):
+    def __get_last_qp_data(self) -> dict:
         """
-        Dumps the latest QP data into a json file
-
-            :param filename: if not set, use name + timestamp + '.json'
-            :param overwrite: if false and filename exists add timestamp to filename
+        Private function returning the latest QP data as a dictionary with keys '<field>_<stage>'.
         """
-        if filename == '':
-            filename = f'{self.name}_QP.json'
-
-        if not overwrite:
-            # append timestamp
-            if os.path.isfile(filename):
-                filename = filename[:-5]
-                filename += datetime.now().strftime('%Y-%m-%d-%H:%M:%S.%f') + '.json'
-
-        # get QP data:
         qp_data = dict()
 
         lN = len(str(self.N+1))
@@ -1271,21 +1676,66 @@ class AcadosOcpSolver:
             if len(qp_data[k]) == 0:
                 del qp_data[k]
 
+        return qp_data
+
+
+    def dump_last_qp_to_json(self, filename: str = '', overwrite=False):
+        """
+        Dumps the latest QP data into a json file
+
+            :param filename: if not set, use name + timestamp + '.json'
+            :param overwrite: if false and filename exists add timestamp to filename
+        """
+        if filename == '':
+            filename = f'{self.name}_QP.json'
+
+        if not overwrite:
+            filename = self.__timestamped_filename(filename)
+
+        qp_data = self.__get_last_qp_data()
+
         # save
         with open(filename, 'w') as f:
             json.dump(qp_data, f, default=make_object_json_dumpable, indent=4, sort_keys=True)
         print("stored qp from solver memory in ", os.path.join(os.getcwd(), filename))
 
 
+    def dump_last_qp_to_npz(self, filename: str = '', overwrite=False):
+        """
+        Dumps the latest QP data into a binary numpy file, with the same keys as the json file written by `dump_last_qp_to_json()`.
+
+            :param filename: if not set, use name + timestamp + '.npz'
+            :param overwrite: if false and filename exists add timestamp to filename
+        """
+        if filename == '':
+            filename = f'{self.name}_QP.npz'
+
+        if not overwrite:
+            filename = self.__timestamped_filename(filename)
+
+        qp_data = self.__get_last_qp_data()
+
+        # save
+        np.savez(filename, **qp_data)
+        print("stored qp from solver memory in ", os.path.join(os.getcwd(), filename))
+
+
 
     def load_iterate(self, filename:str, verbose: bool = True):
         """
-        Loads the iterate stored in json file with filename into the ocp solver.
+        Loads the iterate stored in json or npz file with filename into the ocp solver, see `store_iterate()`.
         Note: This does not contain the iterate of the integrators, and the parameters.
         """
         if not os.path.isfile(filename):
             raise Exception('load_iterate: failed, file does not exist: ' + os.path.join(os.getcwd(), filename))
 
+        if filename.endswith('.npz'):
+            if verbose:
+                print(f"loading iterate {filename}")
+            with np.load(filename) as data:
+                self.load_iterate_from_flat_obj(AcadosOcpFlattenedIterate(**{field: data[field] for field in self.__iterate_fields}))
+            return
+
         with open(filename, 'r') as f:
             solution = json.load(f)
 
@@ -1302,12 +1752,10 @@ class AcadosOcpSolver:
         """
         d = {}
         for field in ["x", "u", "z", "sl", "su", "pi", "lam"]:
-            traj = []
-            for n in range(self.N+1):
-                if n < self.N or not (field in ["u", "pi", "z"]):
-                    traj.append(self.get(n, field))
-
-            d[f"{field}_traj"] = traj
+            stage_dims = self.__get_stage_dims(field)
+            flat = self.get_flat(field)
+            # split into stage-wise views of the flat array
+            d[f"{field}_traj"] = np.split(flat[:sum(stage_dims)], np.cumsum(stage_dims)[:-1])
 
         return AcadosOcpIterate(**d)
 
@@ -1351,6 +1799,92 @@ class AcadosOcpSolver:
         self.set_flat("lam", iterate.lam)
 
 
+    def __iterate_binary_header(self) -> bytes:
+        """
+        Private function returning the header of binary iterate files, see `append_iterate_to_binary()`.
+        """
+        header = b'ACADOSIT' + np.array([len(self.__iterate_fields)], dtype='<i8').tobytes()
+        for field in self.__iterate_fields:
+            header += field.encode('utf-8').ljust(8, b'\0') + np.array([self.get_dim_flat(field)], dtype='<i8').tobytes()
+        return header
+
+
+    def __check_iterate_binary_header(self, filename: str, caller: str) -> int:
+        """
+        Private function checking that the header of a binary iterate file matches the fields and dimensions of this solver,
+        returns the size of the header in bytes.
+        """
+        header = self.__iterate_binary_header()
+        with open(filename, 'rb') as f:
+            file_header = f.read(len(header))
+
+        if file_header[:8] != header[:8]:
+            raise Exception(f'{caller}: {filename} is not a binary iterate file written by append_iterate_to_binary().')
+
+        if file_header != header:
+            n_fields = int(np.frombuffer(file_header[8:16], dtype='<i8')[0]) if len(file_header) >= 16 else 0
+            file_dims = {}
+            for k in range(n_fields):
+                entry = file_header[16 + 16*k: 32 + 16*k]
+                if len(entry) < 16:
+                    break
+                file_dims[entry[:8].rstrip(b'\0').decode('utf-8')] = int(np.frombuffer(entry[8:], dtype='<i8')[0])
+            dims = {field: self.get_dim_flat(field) for field in self.__iterate_fields}
+            raise Exception(f'{caller}: fields and dimensions of {filename} do not match the solver, got {file_dims}, expected {dims}.')
+
+        return len(header)
+
+
+    def append_iterate_to_binary(self, filename: str) -> None:
+        """
+        Appends the current flattened iterate to a binary file, e.g. to store a time series of iterates in closed loop.
+        The file starts with a header containing the fields and their dimensions, which is written if the file does not exist or is empty
+        and checked against the dimensions of the solver otherwise.
+        Each iterate is stored as one record of float64 values, containing the concatenation of x, u, z, sl, su, pi, lam as in `store_iterate_to_flat_obj()`.
+        Note: This does not contain the iterate of the integrators, and the parameters.
+
+            :param filename: name of the binary file, created if it does not exist
+        """
+        if os.path.isfile(filename) and os.path.getsize(filename) > 0:
+            self.__check_iterate_binary_header(filename, 'append_iterate_to_binary')
+            header = b''
+        else:
+            header = self.__iterate_binary_header()
+
+        record = np.concatenate([self.get_flat(field) for field in self.__iterate_fields]).astype('<f8')
+        with open(filename, 'ab') as f:
+            f.write(header)
+            record.tofile(f)
+
+
+    def read_iterates_from_binary(self, filename: str, mmap: bool = True) -> AcadosOcpFlattenedBatchIterate:
+        """
+        Reads iterates written with `append_iterate_to_binary()` by a solver with the same dimensions.
+        The fields and dimensions stored in the header of the file are checked against the solver.
+
+            :param filename: name of the binary file
+            :param mmap: if True, the file is memory-mapped and the returned arrays are read-only views into it, otherwise it is read into memory
+            :returns: AcadosOcpFlattenedBatchIterate with one row per stored iterate, i.e. N_batch is the number of stored iterates
+        """
+        header_size = self.__check_iterate_binary_header(filename, 'read_iterates_from_binary')
+
+        dims = [self.get_dim_flat(field) for field in self.__iterate_fields]
+        record_size = sum(dims)
+
+        n_bytes = os.path.getsize(filename) - header_size
+        if n_bytes % (8 * record_size) != 0:
+            raise Exception(f'read_iterates_from_binary: size of {filename} is not a multiple of the iterate size {record_size}, the file is truncated.')
+        n_records = n_bytes // (8 * record_size)
+
+        if mmap and n_records > 0:
+            data = np.memmap(filename, dtype='<f8', mode='r', offset=header_size, shape=(n_records, record_size))
+        else:
+            data = np.fromfile(filename, dtype='<f8', offset=header_size).reshape((n_records, record_size))
+
+        fields = np.split(data, np.cumsum(dims)[:-1], axis=1)
+        return AcadosOcpFlattenedBatchIterate(**dict(zip(self.__iterate_fields, fields)), N_batch=n_records)
+
+
     # TODO this should be a property
     def get_status(self) -> int:
         """
@@ -1647,21 +2181,20 @@ class AcadosOcpSolver:
             value_ = np.array([value_])
         value_ = value_.astype(float)
 
-        field = field_.replace("sens_", "").encode('utf-8')
+        field = self.__field_handle(field_.replace("sens_", ""))
 
         stage = c_int(stage_)
 
         # treat parameters separately
         if field_ == 'p':
             value_data = cast(value_.ctypes.data, POINTER(c_double))
-            assert getattr(self.shared_lib, f"{self.name}_acados_update_params")(self.capsule, stage, value_data, value_.shape[0])==0
+            assert self.__update_params_fun(self.capsule, stage, value_data, value_.shape[0])==0
         else:
             if field_ not in constraints_fields + cost_fields + out_fields + mem_fields + sens_fields:
                 raise Exception(f"AcadosOcpSolver.set(): '{field}' is not a valid argument.\n"
                     f" Possible values are {constraints_fields + cost_fields + out_fields + mem_fields + sens_fields + ['p']}.")
 
-            dims = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, \
-                self.nlp_dims, self.nlp_out, stage_, field)
+            dims = self.__get_dims(stage_, field_.replace("sens_", ""))
 
             if value_.shape[0] != dims:
                 msg = f'AcadosOcpSolver.set(): mismatching dimension for field "{field_}" '
@@ -1683,13 +2216,11 @@ class AcadosOcpSolver:
             elif field_ in mem_fields:
                 self.__acados_lib.ocp_nlp_set(self.nlp_solver, stage, field, value_data_p)
             elif field_ in sens_fields:
-                self.__acados_lib.ocp_nlp_out_set.argtypes = \
-                    [c_void_p, c_void_p, c_void_p, c_int, c_char_p, c_void_p]
                 self.__acados_lib.ocp_nlp_out_set(self.nlp_config, \
                     self.nlp_dims, self.sens_out, stage, field, value_data_p)
             # also set z_guess, when setting z.
             if field_ == 'z':
-                field = 'z_guess'.encode('utf-8')
+                field = self.__field_handle('z_guess')
                 self.__acados_lib.ocp_nlp_set(self.nlp_solver, stage, field, value_data_p)
         return
 
@@ -1756,14 +2287,10 @@ class AcadosOcpSolver:
             raise Exception(f'stage should be in [0, N], got {stage_}')
 
         value_ = value_.astype(float)
-        field = field_.encode('utf-8')
+        field = self.__field_handle(field_)
         stage = c_int(stage_)
 
-        dims = np.zeros((2,), dtype=np.intc, order="C")
-        dims_data = cast(dims.ctypes.data, POINTER(c_int))
-
-        self.__acados_lib.ocp_nlp_cost_dims_get_from_attr(self.nlp_config, \
-            self.nlp_dims, self.nlp_out, stage_, field, dims_data)
+        dims = self.__get_cost_dims(stage_, field_)
 
         value_shape = value_.shape
         if len(value_shape) == 1:
@@ -1860,14 +2387,10 @@ class AcadosOcpSolver:
         elif stage_ < 0 or stage_ > self.N:
             raise Exception(f'stage should be in [0, N], got {stage_}')
 
-        field = field_.encode('utf-8')
+        field = self.__field_handle(field_)
         stage = c_int(stage_)
 
-        dims = np.zeros((2,), dtype=np.intc, order="C")
-        dims_data = cast(dims.ctypes.data, POINTER(c_int))
-
-        self.__acados_lib.ocp_nlp_constraint_dims_get_from_attr(self.nlp_config, \
-            self.nlp_dims, self.nlp_out, stage_, field, dims_data)
+        dims = self.__get_constraint_dims(stage_, field_)
 
         value_shape = value_.shape
         if len(value_shape) == 1:
@@ -1981,75 +2504,74 @@ class AcadosOcpSolver:
         return out
 
 
-    def __ocp_nlp_get_from_iterate(self, iteration_, stage_, field_):
-        stage = c_int(stage_)
-        field = field_.encode('utf-8')
-        iteration = c_int(iteration_)
-        dim = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out,
-                    stage, field)
+    def __check_stored_iterates(self, caller: str) -> int:
+        """
+        Private function checking that iterates are stored by the solver, returns nlp_iter.
+        """
+        if not self.acados_ocp.solver_options.store_iterates:
+            raise Exception(f"{caller}: the solver option store_iterates needs to be true in order to get iterates.")
+
+        if self.acados_ocp.solver_options.nlp_solver_type == "SQP_RTI":
+            raise Exception(f"{caller}: SQP_RTI not supported.")
+
+        return self.get_stats('nlp_iter')
+
+
+    def __get_all_from_iterates(self, first_iter: int, n_iter: int) -> AcadosOcpFlattenedBatchIterate:
+        """
+        Private function returning the stored iterates first_iter, ..., first_iter+n_iter-1 in the flattened format,
+        each field is obtained with a single call to the C interface.
+        """
+        fields = {}
+        for field_ in self.__iterate_fields:
+            out = np.zeros((n_iter, self.__get_total_dims(field_)), dtype=np.float64, order="C")
+            self.__acados_lib.ocp_nlp_get_all_from_iterates(self.nlp_solver, first_iter, n_iter, self.__field_handle(field_),
+                                                            cast(out.ctypes.data, POINTER(c_double)))
+            fields[field_] = out
+        return AcadosOcpFlattenedBatchIterate(**fields, N_batch=n_iter)
+
+
+    def __split_flat_iterate(self, flat_iterates: AcadosOcpFlattenedBatchIterate, index: int) -> AcadosOcpIterate:
+        """
+        Private function splitting a flattened iterate into its stage-wise trajectories.
+        """
+        trajs = {}
+        for field_ in self.__iterate_fields:
+            offsets = np.cumsum(self.__get_stage_dims(field_))[:-1]
+            trajs[f"{field_}_traj"] = tuple(np.split(getattr(flat_iterates, field_)[index], offsets))
+        return AcadosOcpIterate(**trajs)
 
-        out = np.zeros((dim,), dtype=np.float64, order="C")
-        out_data = cast(out.ctypes.data, POINTER(c_double))
-        out_data_p = cast((out_data), c_void_p)
-        self.__acados_lib.ocp_nlp_get_from_iterate(self.nlp_solver, iteration, stage, field, out_data_p)
-        return out
 
     def get_iterate(self, iteration: int) -> AcadosOcpIterate:
 
-        nlp_iter = self.get_stats('nlp_iter')
+        nlp_iter = self.__check_stored_iterates("get_iterate")
         if iteration < -1 or iteration > nlp_iter:
             raise Exception("get_iterate: iteration needs to be nonnegative and <= nlp_iter or -1.")
 
-        if not self.acados_ocp.solver_options.store_iterates:
-            raise Exception("get_iterate: the solver option store_iterates needs to be true in order to get iterates.")
-
-        if self.acados_ocp.solver_options.nlp_solver_type == "SQP_RTI":
-            raise Exception("get_iterate: SQP_RTI not supported.")
-
         # set to nlp_iter if -1
         iteration = nlp_iter if iteration == -1 else iteration
 
-        x_traj = []
-        u_traj = []
-        z_traj = []
-        sl_traj = []
-        su_traj = []
-        pi_traj = []
-        lam_traj = []
-
-        for n in range(self.acados_ocp.solver_options.N_horizon):
-            x_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "x"))
-            u_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "u"))
-            z_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "z"))
-            sl_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "sl"))
-            su_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "su"))
-            pi_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "pi"))
-            lam_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "lam"))
-
-        n = self.acados_ocp.solver_options.N_horizon
-        x_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "x"))
-        sl_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "sl"))
-        su_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "su"))
-        lam_traj.append(self.__ocp_nlp_get_from_iterate(iteration, n, "lam"))
-
-        iterate = AcadosOcpIterate(x_traj=tuple(x_traj),
-                                   u_traj=tuple(u_traj),
-                                   z_traj=tuple(z_traj),
-                                   sl_traj=tuple(sl_traj),
-                                   su_traj=tuple(su_traj),
-                                   pi_traj=tuple(pi_traj),
-                                   lam_traj=tuple(lam_traj))
-
-        return iterate
+        return self.__split_flat_iterate(self.__get_all_from_iterates(iteration, 1), 0)
 
 
     def get_iterates(self) -> AcadosOcpIterates:
-        return AcadosOcpIterates(iterate_list=[self.get_iterate(n) for n in range(self.get_stats('nlp_iter')+1)])
+        """
+        Returns all iterates stored during the last solve.
+        Each field of all iterates is obtained with a single call to the C interface,
+        such that `AcadosOcpIterates.as_array()` does not need to stack the stage-wise trajectories.
+        """
+        n_iter = self.__check_stored_iterates("get_iterates") + 1
+
+        flat_iterates = self.__get_all_from_iterates(0, n_iter)
+        stage_dims = {field_: self.__get_stage_dims(field_) for field_ in self.__iterate_fields}
+
+        return AcadosOcpIterates(iterate_list=[self.__split_flat_iterate(flat_iterates, n) for n in range(n_iter)],
+                                 flat_iterates=flat_iterates,
+                                 stage_dims=stage_dims)
 
 
     def dims_get(self, field_, stage_):
-        return self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out,
-                    c_int(stage_), field_.encode('utf-8'))
+        return self.__get_dims(stage_, field_)
 
 
     def options_set(self, field_, value_):
@@ -2199,7 +2721,7 @@ class AcadosOcpSolver:
             raise Exception(f'param_values_ and idx_values_ must be of the same size.' +
                  f' Got sizes idx {param_values_.shape[0]}, param_values {len(idx_values_)}.')
 
-        p_dimension = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, stage_, "p".encode('utf-8'))
+        p_dimension = self.__get_dims(stage_, "p")
         if any(idx_values_ >= p_dimension):
             raise Exception(f'idx_values_ contains value >= np = {p_dimension} for stage {stage_}.')
 
@@ -2219,8 +2741,7 @@ class AcadosOcpSolver:
         """
 
         # checks
-        np_global = self.__acados_lib.ocp_nlp_dims_get_from_attr(self.nlp_config, \
-                self.nlp_dims, self.nlp_out, 0, "p_global".encode('utf-8'))
+        np_global = self.__get_dims(0, "p_global")
         if not isinstance(data_, np.ndarray):
             raise Exception('data must be np.array.')
         if np.float64 != data_.dtype:
@@ -2240,6 +2761,12 @@ class AcadosOcpSolver:
 
 
     def __del__(self):
+        if self.__async_executor is not None:
+            # wait for a running asynchronous solve before freeing the memory,
+            # unless the solver is deleted by the worker itself after the solve, which can not be joined
+            self.__async_executor.shutdown(wait=threading.current_thread() is not self.__async_thread)
+            self.__async_executor = None
+
         if self.solver_created:
             getattr(self.shared_lib, f"{self.name}_acados_free")(self.capsule)
             getattr(self.shared_lib, f"{self.name}_acados_free_capsule")(self.capsule)
@@ -41,11 +41,14 @@ cimport acados_solver
 
 cimport numpy as cnp
 
-from typing import Tuple, Union, List
+from typing import Tuple, Union, List, Optional, Sequence
 import os
 import time
 from datetime import datetime
 import numpy as np
+import scipy.linalg
+
+from acados_template.acados_ocp_iterate import AcadosOcpIterate, AcadosOcpIterates, AcadosOcpFlattenedIterate
 
 
 cdef class AcadosOcpSolverCython:
@@ -72,8 +75,9 @@ cdef class AcadosOcpSolverCython:
     cdef double time_value_grad
 
     cdef str nlp_solver_type
+    cdef bint store_iterates
 
-    def __cinit__(self, model_name, nlp_solver_type, N):
+    def __cinit__(self, model_name, nlp_solver_type, N, store_iterates=False):
 
         self.solver_created = False
 
@@ -81,6 +85,7 @@ cdef class AcadosOcpSolverCython:
         self.N = N
         self.model_name = model_name
         self.nlp_solver_type = nlp_solver_type
+        self.store_iterates = store_iterates
 
         # create capsule
         self.capsule = acados_solver.acados_create_capsule()
@@ -281,7 +286,7 @@ cdef class AcadosOcpSolverCython:
             ns_0 = acados_solver_common.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "sl".encode('utf-8'))
 
             lam = self.get(0, 'lam')
-            nlam_non_slack = lam.shape[0]//2 - self.acados_ocp.dims.ns_0
+            nlam_non_slack = lam.shape[0]//2 - ns_0
             grad = lam[nbu:nbu+nx] - lam[nlam_non_slack+nbu : nlam_non_slack+nbu+nx]
 
         elif with_respect_to == "p_global":
@@ -378,7 +383,7 @@ cdef class AcadosOcpSolverCython:
 
         # initialize jacobians with zeros
         for s in stages_:
-            nx = acados_solver_common.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, "x".encode('utf-8'))
+            nx = acados_solver_common.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, s, "x".encode('utf-8'))
 
             sens_x.append(np.zeros((nx, ngrad)))
 
@@ -409,6 +414,75 @@ cdef class AcadosOcpSolverCython:
         return sens_x, sens_u
 
 
+    def eval_adjoint_solution_sensitivity(self,
+                                          seed_x: Optional[Sequence[Tuple[int, np.ndarray]]],
+                                          seed_u: Optional[Sequence[Tuple[int, np.ndarray]]],
+                                          with_respect_to: str = "p_global",
+                                          sanity_checks: bool = True,
+                                          ) -> np.ndarray:
+        """
+        Evaluate the adjoint sensitivity of the solution with respect to the parameters.
+            :param seed_x : Sequence of tuples of the form (stage: int, seed_vec: np.ndarray).
+                    The stage is the stage at which the seed_vec is applied, and seed_vec is the seed for the states at that stage with shape (nx, n_seeds)
+            :param seed_u : Sequence of tuples of the form (stage: int, seed_vec: np.ndarray).
+                    The stage is the stage at which the seed_vec is applied, and seed_vec is the seed for the controls at that stage with shape (nu, n_seeds).
+            :param with_respect_to : string in ["p_global"]
+            :param sanity_checks : bool - whether to perform sanity checks, turn off for minimal overhead, default: True
+        """
+        if seed_x is None:
+            seed_x = []
+        if seed_u is None:
+            seed_u = []
+
+        if len(seed_x) == 0 and len(seed_u) == 0:
+            raise Exception("seed_x and seed_u cannot both be empty.")
+        n_seeds = seed_x[0][1].shape[1] if len(seed_x) > 0 else seed_u[0][1].shape[1]
+
+        if sanity_checks:
+            for seed, name, field in [(seed_x, "seed_x", "x"), (seed_u, "seed_u", "u")]:
+                for stage, seed_stage in seed:
+                    if not isinstance(stage, int) or stage < 0 or stage > self.N:
+                        raise Exception(f"AcadosOcpSolverCython.eval_adjoint_solution_sensitivity(): stage {stage} for {name} is not valid.")
+                    if not isinstance(seed_stage, np.ndarray):
+                        raise Exception(f"{name} for stage {stage} should be np.ndarray, got {type(seed_stage)}")
+                    dim = acados_solver_common.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, stage, field.encode('utf-8'))
+                    if seed_stage.shape != (dim, n_seeds):
+                        raise Exception(f"{name} for stage {stage} should have shape (dim, n_seeds) = ({dim}, {n_seeds}), got {seed_stage.shape}.")
+
+        if with_respect_to != "p_global":
+            raise NotImplementedError(f"with_respect_to {with_respect_to} not implemented.")
+
+        field = "p_global".encode('utf-8')
+        cdef int nparam = acados_solver_common.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, 0, field)
+        cdef double[:, ::1] grad_p = np.zeros((n_seeds, nparam), dtype=np.float64)
+
+        # compute jacobian wrt params
+        t0 = time.time()
+        acados_solver_common.ocp_nlp_eval_params_jac(self.nlp_solver, self.nlp_in, self.nlp_out)
+        self.time_solution_sens_lin = time.time() - t0
+
+        self.time_solution_sens_solve = 0.0
+        if nparam == 0:
+            return np.asarray(grad_p)
+
+        for i_seed in range(n_seeds):
+            # set seed
+            self.reset_sens_out()
+            for (stage, sx) in seed_x:
+                self.set(stage, 'sens_x', sx[:, i_seed])
+            for (stage, su) in seed_u:
+                self.set(stage, 'sens_u', su[:, i_seed])
+
+            # solve adjoint sensitivities
+            acados_solver_common.ocp_nlp_eval_solution_sens_adj_p(self.nlp_solver, self.nlp_in, self.sens_out, field, 0, &grad_p[i_seed, 0])
+            self.time_solution_sens_solve += self.get_stats("time_solution_sensitivities")
+
+        return np.asarray(grad_p)
+
+
+    def reset_sens_out(self):
+        acados_solver_common.ocp_nlp_out_set_values_to_zero(self.nlp_config, self.nlp_dims, self.sens_out)
+
 
     def eval_param_sens(self, index, stage=0, field="ex"):
         """
@@ -435,12 +509,13 @@ cdef class AcadosOcpSolverCython:
         return
 
 
-    def get(self, int stage, str field_):
+    def get(self, int stage, str field_, out=None):
         """
         Get the last solution of the solver:
 
             :param stage: integer corresponding to shooting node
-            :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su',]
+            :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p', 'sens_u', 'sens_pi', 'sens_x', 'sens_lam', 'sens_sl', 'sens_su']
+            :param out: optional preallocated C-contiguous float64 array the result is written to, avoids allocating a new array
 
             .. note:: regarding lam: \n
                     the inequalities are internally organized in the following order: \n
@@ -456,7 +531,7 @@ cdef class AcadosOcpSolverCython:
 
         out_fields = ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su']
         in_fields = ['p']
-        sens_fields = ['sens_u', 'sens_x']
+        sens_fields = ['sens_u', 'sens_x', 'sens_pi', 'sens_lam', 'sens_sl', 'sens_su']
         all_fields = out_fields + in_fields + sens_fields
 
         if field_ not in all_fields:
@@ -478,20 +553,162 @@ cdef class AcadosOcpSolverCython:
         cdef int dims = acados_solver_common.ocp_nlp_dims_get_from_attr(self.nlp_config,
             self.nlp_dims, self.nlp_out, stage, field)
 
-        cdef cnp.ndarray[cnp.float64_t, ndim=1] out = np.zeros((dims,))
+        out = self.__check_or_create_output_buffer(out, dims, f'get(stage={stage}, field={field_})')
+        if dims == 0:
+            return out
+
+        cdef double[::1] out_view = out.reshape(-1)
         if field_ in out_fields:
             acados_solver_common.ocp_nlp_out_get(self.nlp_config, \
-                self.nlp_dims, self.nlp_out, stage, field, <void *> out.data)
+                self.nlp_dims, self.nlp_out, stage, field, <void *> &out_view[0])
         elif field_ in sens_fields:
             acados_solver_common.ocp_nlp_out_get(self.nlp_config, \
-                self.nlp_dims, self.sens_out, stage, field, <void *> out.data)
+                self.nlp_dims, self.sens_out, stage, field, <void *> &out_view[0])
         elif field_ in in_fields:
             acados_solver_common.ocp_nlp_in_get(self.nlp_config, \
-                self.nlp_dims, self.nlp_in, stage, field, <void *> out.data)
+                self.nlp_dims, self.nlp_in, stage, field, <void *> &out_view[0])
+
+        return out
+
+
+    def __check_or_create_output_buffer(self, out, int dims, str caller):
+        """
+        Private function returning a new output array of size dims if out is None, otherwise checks that out can be written to directly.
+        """
+        if out is None:
+            return np.zeros((dims,), dtype=np.float64)
+        if not isinstance(out, np.ndarray) or out.dtype != np.float64 or not out.flags['C_CONTIGUOUS'] or not out.flags['WRITEABLE']:
+            raise Exception(f'AcadosOcpSolverCython.{caller}: out must be a writeable C-contiguous numpy array of dtype float64.')
+        if out.size != dims:
+            raise Exception(f'AcadosOcpSolverCython.{caller}: out has wrong size, expected {dims}, got {out.size}.')
+        return out
 
+
+    def get_dim_flat(self, str field_):
+        """
+        Get dimension of flattened iterate.
+        """
+        if field_ not in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']:
+            raise Exception(f'AcadosOcpSolverCython.get_dim_flat(field={field_}): \'{field_}\' is an invalid argument.')
+
+        return acados_solver_common.ocp_nlp_dims_get_total_from_attr(self.nlp_config, self.nlp_dims, field_.encode('utf-8'))
+
+
+    def get_flat(self, str field_, out=None):
+        """
+        Get concatenation of all stages of last solution of the solver.
+
+            :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']
+            :param out: optional preallocated C-contiguous float64 array the result is written to, avoids allocating a new array
+        """
+        cdef int dims = self.get_dim_flat(field_)
+        field = field_.encode('utf-8')
+
+        out = self.__check_or_create_output_buffer(out, dims, f'get_flat(field={field_})')
+        if dims == 0:
+            return out
+
+        cdef double[::1] out_view = out.reshape(-1)
+        acados_solver_common.ocp_nlp_get_all(self.nlp_solver, self.nlp_in, self.nlp_out, field, <void *> &out_view[0])
         return out
 
 
+    def get_trajectory(self, str field_, out=None):
+        """
+        Get the trajectory of a field of the last solution of the solver as a 2D array of shape (n_stages, n_field),
+        where n_stages is N for 'u', 'z', 'pi' and N+1 otherwise.
+        The dimension of the field has to be the same at all stages, otherwise use `get_flat()`.
+
+            :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']
+            :param out: optional preallocated C-contiguous float64 array of shape (n_stages, n_field), which is filled and returned.
+        """
+        stage_dims = self.__get_stage_dims(field_)
+        if any(d != stage_dims[0] for d in stage_dims):
+            raise Exception(f'AcadosOcpSolverCython.get_trajectory(field={field_}): dimension of field varies along the horizon, got {stage_dims}, use get_flat() instead.')
+
+        shape = (len(stage_dims), stage_dims[0])
+        if out is None:
+            return self.get_flat(field_).reshape(shape)
+
+        if not isinstance(out, np.ndarray) or out.shape != shape:
+            raise Exception(f'AcadosOcpSolverCython.get_trajectory(field={field_}): out has wrong shape, expected {shape}.')
+        self.get_flat(field_, out=out)
+        return out
+
+
+    def __get_stage_dims(self, str field_):
+        """
+        Private function returning the dimension of a field at all stages it is defined at, i.e. the stages contained in `get_flat(field)`.
+        """
+        if field_ not in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']:
+            raise Exception(f'AcadosOcpSolverCython: \'{field_}\' is an invalid argument.')
+        n_stages = self.N if field_ in ['u', 'z', 'pi'] else self.N + 1
+        field = field_.encode('utf-8')
+        return [acados_solver_common.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, stage, field) for stage in range(n_stages)]
+
+
+    def set_flat(self, str field_, value_):
+        """
+        Set concatenation solver initialization.
+
+            :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p']
+        """
+        cdef int dims = self.get_dim_flat(field_)
+        field = field_.encode('utf-8')
+
+        cdef double[::1] value = np.ascontiguousarray(value_, dtype=np.float64).reshape(-1)
+        if value.shape[0] != dims:
+            raise Exception(f'AcadosOcpSolverCython.set_flat(field={field_}, value): value has wrong length, expected {dims}, got {value.shape[0]}.')
+        if dims == 0:
+            return
+
+        acados_solver_common.ocp_nlp_set_all(self.nlp_solver, self.nlp_in, self.nlp_out, field, <void *> &value[0])
+
+
+    def set_stages(self, str field_, value_, stages=None):
+        """
+        Set a field at multiple stages with a single call to the C interface.
+
+            :param field: string in ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su', 'p', 'yref', 'lbx', 'ubx', 'lbu', 'ubu', 'lg', 'ug', 'lh', 'uh']
+            :param value: 2D array of shape (n_stages, n_field) or 1D array containing the concatenation of the values at all stages
+            :param stages: stage indices, default: all stages at which the field is defined, i.e. 0, ..., N-1 for 'u', 'z', 'pi', 'lbu', 'ubu' and 0, ..., N otherwise
+        """
+        out_fields = ['x', 'u', 'z', 'pi', 'lam', 'sl', 'su']
+        in_fields = ['p', 'yref', 'lbx', 'ubx', 'lbu', 'ubu', 'lg', 'ug', 'lh', 'uh']
+        if field_ not in out_fields + in_fields:
+            raise Exception(f'AcadosOcpSolverCython.set_stages(field={field_}): \'{field_}\' is an invalid argument.\n'
+                            f' Possible values are {out_fields + in_fields}.')
+
+        if stages is None:
+            n_stages = self.N if field_ in ['u', 'z', 'pi', 'lbu', 'ubu'] else self.N + 1
+            stages = range(n_stages)
+
+        cdef int[::1] stages_ = np.ascontiguousarray(stages, dtype=np.intc).reshape(-1)
+        cdef int n = stages_.shape[0]
+        cdef int i
+        for i in range(n):
+            if stages_[i] < 0 or stages_[i] > self.N or (field_ == 'pi' and stages_[i] == self.N):
+                raise Exception(f'AcadosOcpSolverCython.set_stages(field={field_}): invalid stages {stages}.')
+
+        field = field_.encode('utf-8')
+        stage_dims = []
+        for i in range(n):
+            stage_dims.append(acados_solver_common.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, stages_[i], field))
+
+        value_ = np.ascontiguousarray(value_, dtype=np.float64)
+        if value_.ndim == 2:
+            if value_.shape[0] != n or any(d != value_.shape[1] for d in stage_dims):
+                raise Exception(f'AcadosOcpSolverCython.set_stages(field={field_}): value has wrong shape, expected ({n}, n_field), got {value_.shape}, dimensions at stages are {stage_dims}.')
+        elif value_.ndim != 1 or value_.size != sum(stage_dims):
+            raise Exception(f'AcadosOcpSolverCython.set_stages(field={field_}): value has wrong size, expected {sum(stage_dims)}, got {value_.size}.')
+
+        cdef double[::1] value = value_.reshape(-1)
+        if n == 0 or value.shape[0] == 0:
+            return
+
+        acados_solver_common.ocp_nlp_set_stages(self.nlp_solver, self.nlp_in, self.nlp_out, field, &stages_[0], n, <void *> &value[0])
+
+
     def print_statistics(self):
         """
         prints statistics of previous solver run as a table:
@@ -572,6 +789,193 @@ cdef class AcadosOcpSolverCython:
             self.set(int(stage), field, np.array(solution[key]))
 
 
+    def store_iterate_to_obj(self):
+        """
+        Returns the current iterate of the OCP solver as an AcadosOcpIterate.
+        """
+        d = {}
+        for field in ["x", "u", "z", "sl", "su", "pi", "lam"]:
+            stage_dims = self.__get_stage_dims(field)
+            flat = self.get_flat(field)
+            # split into stage-wise views of the flat array
+            d[f"{field}_traj"] = np.split(flat[:sum(stage_dims)], np.cumsum(stage_dims)[:-1])
+
+        return AcadosOcpIterate(**d)
+
+
+    def load_iterate_from_obj(self, iterate):
+        """
+        Loads the provided iterate into the OCP solver.
+        Note: The iterate object does not contain the the parameters.
+        """
+        for key, traj in iterate.__dict__.items():
+            field = key.replace('_traj', '')
+
+            for n, val in enumerate(traj):
+                self.set(n, field, val)
+
+
+    def store_iterate_to_flat_obj(self):
+        """
+        Returns the current iterate of the OCP solver as an AcadosOcpFlattenedIterate.
+        """
+        return AcadosOcpFlattenedIterate(x = self.get_flat("x"),
+                                        u = self.get_flat("u"),
+                                        z = self.get_flat("z"),
+                                        sl = self.get_flat("sl"),
+                                        su = self.get_flat("su"),
+                                        pi = self.get_flat("pi"),
+                                        lam = self.get_flat("lam"))
+
+
+    def load_iterate_from_flat_obj(self, iterate):
+        """
+        Loads the provided iterate into the OCP solver.
+        Note: The iterate object does not contain the the parameters.
+        """
+        self.set_flat("x", iterate.x)
+        self.set_flat("u", iterate.u)
+        self.set_flat("z", iterate.z)
+        self.set_flat("sl", iterate.sl)
+        self.set_flat("su", iterate.su)
+        self.set_flat("pi", iterate.pi)
+        self.set_flat("lam", iterate.lam)
+
+
+    def __check_stored_iterates(self, str caller):
+        """
+        Private function checking that iterates are stored by the solver, returns nlp_iter.
+        """
+        if not self.store_iterates:
+            raise Exception(f"{caller}: the solver option store_iterates needs to be true in order to get iterates.")
+
+        if self.nlp_solver_type == "SQP_RTI":
+            raise Exception(f"{caller}: SQP_RTI not supported.")
+
+        return self.get_stats('nlp_iter')
+
+
+    def __get_from_iterate(self, int iteration, int stage, str field_):
+        field = field_.encode('utf-8')
+        cdef int dims = acados_solver_common.ocp_nlp_dims_get_from_attr(self.nlp_config, self.nlp_dims, self.nlp_out, stage, field)
+        cdef double[::1] out = np.zeros((dims,), dtype=np.float64)
+        if dims > 0:
+            acados_solver_common.ocp_nlp_get_from_iterate(self.nlp_solver, iteration, stage, field, <void *> &out[0])
+        return np.asarray(out)
+
+
+    def get_iterate(self, int iteration):
+        """
+        Returns the iterate of the given NLP iteration of the last solver call as an AcadosOcpIterate.
+        Requires the solver option `store_iterates` to be set when generating the solver.
+
+            :param iteration: iteration index in [0, nlp_iter], or -1 for the last iterate
+        """
+        nlp_iter = self.__check_stored_iterates("get_iterate")
+        if iteration < -1 or iteration > nlp_iter:
+            raise Exception("get_iterate: iteration needs to be nonnegative and <= nlp_iter or -1.")
+
+        # set to nlp_iter if -1
+        iteration = nlp_iter if iteration == -1 else iteration
+
+        d = {}
+        for field in ["x", "u", "z", "sl", "su", "pi", "lam"]:
+            n_stages = self.N if field in ['u', 'z', 'pi'] else self.N + 1
+            d[f"{field}_traj"] = tuple(self.__get_from_iterate(iteration, n, field) for n in range(n_stages))
+
+        return AcadosOcpIterate(**d)
+
+
+    def get_iterates(self):
+        """
+        Returns all iterates stored during the last solve.
+        """
+        nlp_iter = self.__check_stored_iterates("get_iterates")
+        return AcadosOcpIterates(iterate_list=[self.get_iterate(n) for n in range(nlp_iter+1)])
+
+
+    def qp_diagnostics(self, hessian_type: str = 'FULL_HESSIAN'):
+        """
+        Compute some diagnostic values for the last QP.
+        result = ocp_solver.qp_diagnostics(hessian_type). Possible values are
+        'FULL_HESSIAN' or 'PROJECTED_HESSIAN'
+
+        returns a dictionary with the following fields:
+        - min_eigv_stage: dict with minimum eigenvalue for each Hessian block.
+        - max_eigv_stage: dict with maximum eigenvalue for each Hessian block.
+        - condition_number_stage: dict with condition number for each Hessian block.
+        - condition_number_global: condition number for the full Hessian.
+        - min_eigv_global: minimum eigenvalue for the full Hessian.
+        - min_abs_eigv_global: minimum absolute eigenvalue for the full Hessian.
+        - max_eigv_global: maximum eigenvalue for the full Hessian.
+
+        for the 'PROJECTED_HESSIAN' it also includes
+        - min_eigv_P_global: minimum eigenvalue of P matrices
+        - min_abs_eigv_P_global: minimum absolute eigenvalue of P matrices
+
+        .. note:: 'PROJECTED_HESSIAN' requires the QP solver PARTIAL_CONDENSING_HPIPM with qp_solver_cond_N == N.
+        """
+        if hessian_type not in ['FULL_HESSIAN', 'PROJECTED_HESSIAN']:
+            raise TypeError("Input should be string with value FULL_HESSIAN, PROJECTED_HESSIAN")
+
+        qp_diagnostic = {}
+
+        min_eigv_global = np.inf
+        max_eigv_global = -np.inf
+        min_abs_eigv = np.inf
+        max_abs_eigv = -np.inf
+
+        min_eig_P_global = np.inf
+        min_abs_eig_P_global = np.inf
+
+        max_eigv_stage = []
+        min_eigv_stage = []
+        condition_number_stage = []
+
+        for i in range(self.N+1):
+            if hessian_type == "FULL_HESSIAN":
+                hess_block = self.get_hessian_block(i)
+            else:
+                P_mat = self.get_from_qp_in(i, 'P')
+                B_mat = self.get_from_qp_in(i-1, 'B')
+                # Lr: lower triangular decomposition of R within Riccati != R in qp_in!
+                Lr = self.get_from_qp_in(i-1, 'Lr')
+                R_ric = Lr @ Lr.T
+                hess_block = R_ric + B_mat.T @ P_mat @ B_mat
+
+                # P
+                eigv = np.linalg.eigvals(P_mat)
+                min_eig_P_global = min(min_eig_P_global, np.min(eigv))
+                min_abs_eig_P_global = min(min_abs_eig_P_global, np.min(np.abs(eigv)))
+
+            eigv = np.linalg.eigvals(hess_block)
+            min_eigv = np.min(eigv)
+            max_eigv = np.max(eigv)
+
+            min_eigv_global = min(min_eigv, min_eigv_global)
+            max_eigv_global = max(max_eigv, max_eigv_global)
+            min_abs_eigv = min(min_abs_eigv, np.min(np.abs(eigv)))
+            max_abs_eigv = max(max_abs_eigv, np.max(np.abs(eigv)))
+
+            max_eigv_stage.append(max_eigv)
+            min_eigv_stage.append(min_eigv)
+            condition_number_stage.append(np.max(np.abs(eigv))/np.min(np.abs(eigv)))
+
+        qp_diagnostic['max_eigv_global'] = max_eigv_global
+        qp_diagnostic['min_eigv_global'] = min_eigv_global
+        qp_diagnostic['min_abs_eigv_global'] = min_abs_eigv
+        qp_diagnostic['condition_number_global'] = max_abs_eigv/min_abs_eigv
+        qp_diagnostic['max_eigv_stage'] = max_eigv_stage
+        qp_diagnostic['min_eigv_stage'] = min_eigv_stage
+        qp_diagnostic['condition_number_stage'] = condition_number_stage
+
+        if hessian_type == "PROJECTED_HESSIAN":
+            qp_diagnostic['min_eigv_P_global'] = min_eig_P_global
+            qp_diagnostic['min_abs_eigv_P_global'] = min_abs_eig_P_global
+
+        return qp_diagnostic
+
+
     def get_stats(self, field_):
         """
         Get the information of the last solver call.
@@ -589,6 +993,7 @@ cdef class AcadosOcpSolverCython:
             - time_solution_sensitivities: CPU time for previous call to eval_param_sens
             - time_reg: CPU time regularization
             - sqp_iter: number of SQP iterations
+            - nlp_iter: number of NLP solver iterations
             - qp_iter: vector of QP iterations for last SQP call
             - statistics: table with info about last iteration
             - stat_m: number of rows in statistics matrix
@@ -611,6 +1016,7 @@ cdef class AcadosOcpSolverCython:
         ]
         fields = double_fields + [
                   'sqp_iter',
+                  'nlp_iter',
                   'qp_iter',
                   'statistics',
                   'stat_m',
@@ -620,7 +1026,7 @@ cdef class AcadosOcpSolverCython:
                 ]
         field = field_.encode('utf-8')
 
-        if field_ in ['sqp_iter', 'stat_m', 'stat_n']:
+        if field_ in ['sqp_iter', 'nlp_iter', 'stat_m', 'stat_n']:
             return self.__get_stat_int(field)
 
         elif field_ in double_fields:
@@ -723,7 +1129,7 @@ cdef class AcadosOcpSolverCython:
         Set numerical data inside the solver.
 
             :param stage: integer corresponding to shooting node
-            :param field: string in ['x', 'u', 'pi', 'lam', 'p']
+            :param field: string in ['x', 'u', 'pi', 'lam', 'p', 'xdot_guess', 'z_guess', 'sens_x', 'sens_u']
 
             .. note:: regarding lam: \n
                     the inequalities are internally organized in the following order: \n
@@ -742,8 +1148,9 @@ cdef class AcadosOcpSolverCython:
         constraints_fields = ['lbx', 'ubx', 'lbu', 'ubu']
         out_fields = ['x', 'u', 'pi', 'lam', 'z', 'sl', 'su']
         mem_fields = ['xdot_guess', 'z_guess']
+        sens_fields = ['sens_x', 'sens_u']
 
-        field = field_.encode('utf-8')
+        field = field_.replace('sens_', '').encode('utf-8')
 
         cdef cnp.ndarray[cnp.float64_t, ndim=1] value = np.ascontiguousarray(value_, dtype=np.float64)
 
@@ -751,10 +1158,10 @@ cdef class AcadosOcpSolverCython:
         if field_ == 'p':
             assert acados_solver.acados_update_params(self.capsule, stage, <double *> value.data, value.shape[0]) == 0
         else:
-            if field_ not in constraints_fields + cost_fields + out_fields:
+            if field_ not in constraints_fields + cost_fields + out_fields + mem_fields + sens_fields:
                 raise Exception("AcadosOcpSolverCython.set(): {} is not a valid argument.\
                     \nPossible values are {}.".format(field, \
-                    constraints_fields + cost_fields + out_fields + ['p']))
+                    constraints_fields + cost_fields + out_fields + mem_fields + sens_fields + ['p']))
 
             dims = acados_solver_common.ocp_nlp_dims_get_from_attr(self.nlp_config,
                 self.nlp_dims, self.nlp_out, stage, field)
@@ -775,12 +1182,41 @@ cdef class AcadosOcpSolverCython:
                     self.nlp_dims, self.nlp_out, stage, field, <void *> value.data)
             elif field_ in mem_fields:
                 acados_solver_common.ocp_nlp_set(self.nlp_solver, stage, field, <void *> value.data)
+            elif field_ in sens_fields:
+                acados_solver_common.ocp_nlp_out_set(self.nlp_config,
+                    self.nlp_dims, self.sens_out, stage, field, <void *> value.data)
 
             if field_ == 'z':
                 field = 'z_guess'.encode('utf-8')
                 acados_solver_common.ocp_nlp_set(self.nlp_solver, stage, field, <void *> value.data)
         return
 
+    def cost_get(self, int stage, str field_):
+        """
+        Get numerical data in the cost module of the solver.
+
+            :param stage: integer corresponding to shooting node
+            :param field: string in ['yref', 'W', 'ext_cost_num_hess', 'zl', 'zu', 'Zl', 'Zu', 'scaling']
+        """
+        field = field_.encode('utf-8')
+
+        cdef int dims[2]
+        acados_solver_common.ocp_nlp_cost_dims_get_from_attr(self.nlp_config, \
+            self.nlp_dims, self.nlp_out, stage, field, &dims[0])
+
+        # vector-valued fields
+        if field_ in ['yref', 'zl', 'zu', 'Zl', 'Zu', 'scaling']:
+            shape = (dims[0],)
+        else:
+            shape = (dims[0], dims[1])
+
+        cdef cnp.ndarray[cnp.float64_t, ndim=1] out = np.zeros((int(np.prod(shape)),), dtype=np.float64)
+        acados_solver_common.ocp_nlp_cost_model_get(self.nlp_config, \
+            self.nlp_dims, self.nlp_in, stage, field, <void *> out.data)
+
+        return out.reshape(shape, order='F')
+
+
     def cost_set(self, int stage, str field_, value_):
         """
         Set numerical data in the cost module of the solver.
@@ -816,6 +1252,32 @@ cdef class AcadosOcpSolverCython:
             self.nlp_dims, self.nlp_in, stage, field, <void *> &value[0][0])
 
 
+    def constraints_get(self, int stage, str field_):
+        """
+        Get numerical data in the constraint module of the solver.
+
+            :param stage: integer corresponding to shooting node
+            :param field: string in ['lbx', 'ubx', 'lbu', 'ubu', 'lg', 'ug', 'lh', 'uh', 'uphi', 'C', 'D']
+        """
+        field = field_.encode('utf-8')
+
+        cdef int dims[2]
+        acados_solver_common.ocp_nlp_constraint_dims_get_from_attr(self.nlp_config, \
+            self.nlp_dims, self.nlp_out, stage, field, &dims[0])
+
+        # check whether field is vector-valued
+        if field_ not in ['C', 'D']:
+            shape = (dims[0],)
+        else:
+            shape = (dims[0], dims[1])
+
+        cdef cnp.ndarray[cnp.float64_t, ndim=1] out = np.zeros((int(np.prod(shape)),), dtype=np.float64)
+        acados_solver_common.ocp_nlp_constraints_model_get(self.nlp_config, \
+            self.nlp_dims, self.nlp_in, stage, field, <void *> out.data)
+
+        return out.reshape(shape, order='F')
+
+
     def constraints_set(self, int stage, str field_, value_):
         """
         Set numerical data in the constraint module of the solver.
@@ -854,6 +1316,21 @@ cdef class AcadosOcpSolverCython:
         return
 
 
+    def get_hessian_block(self, int stage):
+        """
+        Get Hessian block from last QP at stage i
+        In HPIPM form [[R, S^T], [S, Q]]
+        """
+        Q_mat = self.get_from_qp_in(stage, 'Q')
+        R_mat = self.get_from_qp_in(stage, 'R')
+        S_mat = self.get_from_qp_in(stage, 'S')
+        hess_block = scipy.linalg.block_diag(R_mat, Q_mat)
+        nu = R_mat.shape[0]
+        hess_block[nu:, :nu] = S_mat.T
+        hess_block[:nu, nu:] = S_mat
+        return hess_block
+
+
     def get_from_qp_in(self, int stage, str field_):
         """
         Get numerical data from the dynamics module of the solver:
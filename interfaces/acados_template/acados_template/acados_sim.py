@@ -36,7 +36,7 @@ from .acados_model import AcadosModel
 from .acados_dims import AcadosSimDims
 from .builders import CMakeBuilder
 from .utils import (get_acados_path, get_shared_lib_ext, format_class_dict, check_casadi_version,
-                    make_object_json_dumpable, render_template)
+                    make_object_json_dumpable, render_template_list)
 from .casadi_function_generation import (
                     GenerateContext,
                     generate_c_code_explicit_ode,
@@ -370,24 +370,21 @@ class AcadosSim:
         else:
             template_list.append(('Makefile.in', 'Makefile'))
 
-        # Render templates
-        for (in_file, out_file) in template_list:
-            render_template(in_file, out_file, self.code_export_directory, json_path)
-
         # folder model
         model_dir = os.path.join(self.code_export_directory, self.model.name + '_model')
+        template_list.append(('model.in.h', f'{self.model.name}_model.h', model_dir))
 
-        in_file = 'model.in.h'
-        out_file = f'{self.model.name}_model.h'
-        render_template(in_file, out_file, model_dir, json_path)
+        # Render templates
+        render_template_list(template_list, self.code_export_directory, json_path)
 
 
-    def generate_external_functions(self, ):
+    def generate_external_functions(self, verbose: bool = False):
 
         integrator_type = self.solver_options.integrator_type
 
         opts = dict(generate_hess = self.solver_options.sens_hess,
-                    code_export_directory = self.code_export_directory)
+                    code_export_directory = self.code_export_directory,
+                    verbose = verbose)
 
         # create code_export_dir, model_dir
         code_export_dir = self.code_export_directory
@@ -31,8 +31,12 @@
 
 from .acados_sim_solver import AcadosSimSolver
 from .acados_sim import AcadosSim
-from typing import List
-from ctypes import (POINTER, c_int, c_void_p)
+from typing import List, Optional, Tuple
+from ctypes import (POINTER, addressof, c_double, c_char_p, c_int, c_void_p, cast, sizeof)
+from .utils import create_batch_thread_pool
+
+import numpy as np
+import time
 
 
 class AcadosSimBatchSolver():
@@ -45,11 +49,16 @@ class AcadosSimBatchSolver():
         :param build: Flag indicating whether solver should be (re)compiled. If False an attempt is made to load an already compiled shared library for the solver. Default: True
         :param generate: Flag indicating whether problem functions should be code generated. Default: True
         :verbose: bool, default: True
+        :param num_threads: number of threads used in `solve` and `simulate_batch`, see :py:attr:`num_threads`. Default: `sim.solver_options.num_threads_in_batch_solve`
+        :param pin_threads: whether to pin the threads to CPUs, see :py:attr:`pin_threads`. Default: False
     """
 
     __sim_solvers : List[AcadosSimSolver]
 
-    def __init__(self, sim: AcadosSim, N_batch: int, json_file: str = 'acados_sim.json', build: bool = True, generate: bool = True, verbose: bool=True):
+    def __init__(self, sim: AcadosSim, N_batch: int, json_file: str = 'acados_sim.json', build: bool = True, generate: bool = True, verbose: bool=True,
+                 num_threads: Optional[int] = None, pin_threads: bool = False):
+
+        self.__thread_pool = None
 
         if not isinstance(N_batch, int) or N_batch <= 0:
             raise Exception("AcadosSimBatchSolver: argument N_batch should be a positive integer.")
@@ -69,18 +78,259 @@ class AcadosSimBatchSolver():
         for i in range(self.N_batch):
             self.__sim_solvers_pointer[i] = self.sim_solvers[i].capsule
 
-        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_solve").argtypes = [POINTER(c_void_p), c_int]
+        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_solve").argtypes = [POINTER(c_void_p), c_int, c_int, POINTER(c_double)]
         getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_solve").restype = c_void_p
 
-        if not self.sim_solvers[0].acados_lib_uses_omp:
+        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_set_flat").argtypes = [POINTER(c_void_p), c_char_p, POINTER(c_double), c_int, c_int, c_int]
+        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_set_flat").restype = c_void_p
+        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_get_flat").argtypes = [POINTER(c_void_p), c_char_p, POINTER(c_double), c_int, c_int, c_int]
+        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_get_flat").restype = c_void_p
+        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_get_matrix").argtypes = [POINTER(c_void_p), c_char_p, POINTER(c_double), c_int, c_int, c_int]
+        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_get_matrix").restype = c_void_p
+        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_simulate").argtypes = \
+            [POINTER(c_void_p), POINTER(c_double), POINTER(c_double), POINTER(c_double), POINTER(c_double), POINTER(c_int), c_int, c_int, POINTER(c_double)]
+        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_simulate").restype = c_void_p
+
+        dims = self.sim_solvers[0].acados_sim.dims
+        self.__field_dims = {'x': dims.nx, 'xdot': dims.nx, 'u': dims.nu, 'z': dims.nz, 'p': dims.np, 'seed_adj': dims.nx}
+
+        self.__num_threads_in_batch_solve = sim.solver_options.num_threads_in_batch_solve
+        self.__num_threads = None
+        self.__pin_threads = False
+        self.pin_threads = pin_threads
+        self.num_threads = self.__num_threads_in_batch_solve if num_threads is None else num_threads
+
+        if not self.sim_solvers[0].acados_lib_uses_omp and self.__num_threads_in_batch_solve > 1:
             print("Warning: Please compile the acados shared library with openmp and the number of threads set to 1, i.e. with the flags -DACADOS_WITH_OPENMP=ON -DACADOS_NUM_THREADS=1.")
 
 
-    def solve(self):
+    def __solvers_pointer(self, start: int):
+        """
+        Private function returning a pointer to the capsules starting from integrator `start`.
+        """
+        return cast(c_void_p(addressof(self.__sim_solvers_pointer) + start * sizeof(c_void_p)), POINTER(c_void_p))
+
+
+    def __chunks(self) -> List[Tuple[int, int]]:
+        """
+        Private function splitting the batch into `num_threads` contiguous chunks, returned as tuples (start, length).
+        """
+        bounds = np.linspace(0, self.N_batch, self.__num_threads + 1).astype(int)
+        return [(int(start), int(end - start)) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+    def __run_chunked(self, call) -> None:
+        """
+        Private function calling `call(start, length)` for all chunks of the batch, on the thread pool if it exists,
+        and storing the wall time of each chunk in `time_per_thread`.
+        """
+        def timed_call(k, start, length):
+            t0 = time.time()
+            call(start, length)
+            self.__time_per_thread[k] = time.time() - t0
+
+        if self.__thread_pool is None:
+            timed_call(0, 0, self.N_batch)
+        else:
+            futures = [self.__thread_pool.submit(timed_call, k, start, length) for k, (start, length) in enumerate(self.__chunks())]
+            for future in futures:
+                future.result()
+
+
+    def __call_batch_flat(self, fun_name: str, field_: str, data: np.ndarray, offset: int) -> None:
+        """
+        Private function calling `<model_name>_acados_sim_batch_<fun_name>` for the C-contiguous array `data` of shape (N_batch, ...),
+        where `offset` is the number of entries per integrator, with OpenMP or chunked on the thread pool.
+        """
+        batch_fun = getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_{fun_name}")
+        field = field_.encode('utf-8')
+
+        def data_pointer(start):
+            return cast(c_void_p(data.ctypes.data + start * offset * sizeof(c_double)), POINTER(c_double))
+
+        if self.__num_threads_in_batch_solve > 1:
+            batch_fun(self.__sim_solvers_pointer, field, data_pointer(0), data.size, self.N_batch, self.__num_threads)
+        else:
+            self.__run_chunked(lambda start, length: batch_fun(self.__solvers_pointer(start), field, data_pointer(start), length * offset, length, 1))
+
+
+    def __update_thread_pool(self) -> None:
+        """
+        Private function (re)creating the thread pool used if the integrator was generated without OpenMP.
+        """
+        if self.__thread_pool is not None:
+            self.__thread_pool.shutdown()
+            self.__thread_pool = None
+
+        if self.__num_threads_in_batch_solve > 1:
+            if self.__pin_threads:
+                raise Exception('AcadosSimBatchSolver: pin_threads is not supported for integrators generated with num_threads_in_batch_solve > 1,'
+                                ' please use the environment variables OMP_PROC_BIND and OMP_PLACES to pin the OpenMP threads.')
+        elif self.__num_threads > 1:
+            self.__thread_pool = create_batch_thread_pool(self.__num_threads, self.__pin_threads)
+
+
+    @property
+    def num_threads(self) -> int:
+        """
+        Number of threads used in `solve` and `simulate_batch`, can be changed at runtime.
+        If the integrator was generated with `num_threads_in_batch_solve > 1`, it is passed to the OpenMP parallelization of the generated code.
+        Otherwise, the batch is split into `num_threads` chunks, which are integrated in parallel on a thread pool.
+        The calls into the shared library release the GIL, such that this does not require an acados build with OpenMP.
+        Default: `num_threads_in_batch_solve`.
+        """
+        return self.__num_threads
+
+
+    @num_threads.setter
+    def num_threads(self, num_threads: int):
+        if not isinstance(num_threads, int) or num_threads <= 0:
+            raise Exception('Invalid num_threads value. num_threads must be a positive integer.')
+
+        num_threads = min(num_threads, self.N_batch)
+        if num_threads != self.__num_threads:
+            self.__num_threads = num_threads
+            self.__time_per_thread = np.zeros((num_threads,), dtype=np.float64)
+            self.__time_per_thread_p = cast(self.__time_per_thread.ctypes.data, POINTER(c_double))
+            self.__update_thread_pool()
+
+
+    @property
+    def pin_threads(self) -> bool:
+        """
+        Whether the threads of the thread pool are pinned to the CPUs available to the process, one CPU per thread (Linux only).
+        Only supported for integrators generated with `num_threads_in_batch_solve = 1`;
+        for OpenMP, use the environment variables OMP_PROC_BIND and OMP_PLACES instead.
+        Default: False.
+        """
+        return self.__pin_threads
+
+
+    @pin_threads.setter
+    def pin_threads(self, pin_threads: bool):
+        if not isinstance(pin_threads, bool):
+            raise Exception('Invalid pin_threads value, expected bool.')
+
+        if pin_threads != self.__pin_threads:
+            self.__pin_threads = pin_threads
+            if self.__num_threads is not None:
+                self.__update_thread_pool()
+
+
+    @property
+    def time_per_thread(self) -> np.ndarray:
+        """
+        Wall time in seconds spent by each of the `num_threads` threads in the last call to `solve` or `simulate_batch`.
+        """
+        return self.__time_per_thread.copy()
+
+
+    def solve(self, num_threads: Optional[int] = None):
         """
         Solve the simulation problem with current input for all `N_batch` integrators.
+
+            :param num_threads: if given, sets :py:attr:`num_threads` before solving.
+        """
+        if num_threads is not None:
+            self.num_threads = num_threads
+
+        batch_solve = getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_solve")
+        if self.__num_threads_in_batch_solve > 1:
+            batch_solve(self.__sim_solvers_pointer, self.__N_batch, self.__num_threads, self.__time_per_thread_p)
+        else:
+            self.__run_chunked(lambda start, length: batch_solve(self.__solvers_pointer(start), length, 1, None))
+
+
+    def set_batch(self, field_: str, value_: np.ndarray) -> None:
         """
-        getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_solve")(self.__sim_solvers_pointer, self.__N_batch)
+        Set a field for all `N_batch` integrators with a single call to the shared library.
+        The integrators are processed in parallel using :py:attr:`num_threads` threads.
+
+            :param field_: string in ['x', 'u', 'p', 'xdot', 'z', 'seed_adj']
+            :param value_: np.array of shape (N_batch, n_field)
+        """
+        if field_ not in self.__field_dims:
+            raise Exception(f'AcadosSimBatchSolver.set_batch(): Unknown field {field_},' \
+                f' available fields are {", ".join(self.__field_dims.keys())}')
+
+        dim = self.__field_dims[field_]
+        value_ = np.ascontiguousarray(value_, dtype=np.float64)
+        if value_.shape != (self.N_batch, dim):
+            raise Exception(f'AcadosSimBatchSolver.set_batch(field={field_}, value): value has wrong shape, expected ({self.N_batch}, {dim}), got {value_.shape}.')
+
+        self.__call_batch_flat("set_flat", field_, value_, dim)
+
+
+    def get_batch(self, field_: str, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get a field of the last solution of all `N_batch` integrators with a single call to the shared library.
+        The integrators are processed in parallel using :py:attr:`num_threads` threads.
+        Matrices are returned in C order, i.e. `get_batch('S_forw')[n]` equals `sim_solvers[n].get('S_forw')`.
+
+            :param field_: string in ['x', 'z', 'S_adj', 'S_forw', 'Sx', 'Su']
+            :param out: optional preallocated C-contiguous float64 array of the returned shape
+            :returns: np.array of shape (N_batch, n_field) for vectors, (N_batch, nx, nx+nu), (N_batch, nx, nx), (N_batch, nx, nu) for 'S_forw', 'Sx', 'Su'
+        """
+        nx = self.__field_dims['x']
+        nu = self.__field_dims['u']
+        shapes = {'x': (nx,), 'z': (self.__field_dims['z'],), 'S_adj': (nx+nu,),
+                  'S_forw': (nx, nx+nu), 'Sx': (nx, nx), 'Su': (nx, nu)}
+        if field_ not in shapes:
+            raise Exception(f'AcadosSimBatchSolver.get_batch(): Unknown field {field_}, available fields are {", ".join(shapes.keys())}')
+
+        shape = (self.N_batch,) + shapes[field_]
+        if out is None:
+            out = np.zeros(shape, dtype=np.float64)
+        elif out.shape != shape or out.dtype != np.float64 or not out.flags['C_CONTIGUOUS']:
+            raise Exception(f'AcadosSimBatchSolver.get_batch(field={field_}): out must be a C-contiguous float64 array of shape {shape}.')
+
+        fun_name = 'get_matrix' if len(shape) == 3 else 'get_flat'
+        self.__call_batch_flat(fun_name, field_, out, int(np.prod(shapes[field_])))
+
+        return out
+
+
+    def simulate_batch(self, X: np.ndarray, U: np.ndarray, P: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Set states, controls and optionally parameters, solve and get the resulting states for all `N_batch` integrators
+        with a single call to the shared library.
+
+            :param X: np.array of shape (N_batch, nx)
+            :param U: np.array of shape (N_batch, nu)
+            :param P: np.array of shape (N_batch, np), if None the current parameter values are kept
+            :returns: np.array of shape (N_batch, nx) containing the simulated states
+        """
+        inputs = [X, U] if P is None else [X, U, P]
+        inputs = [np.ascontiguousarray(value, dtype=np.float64) for value in inputs]
+        for field_, value in zip(['x', 'u', 'p'], inputs):
+            if value.shape != (self.N_batch, self.__field_dims[field_]):
+                raise Exception(f'AcadosSimBatchSolver.simulate_batch(): {field_.upper()} has wrong shape, expected ({self.N_batch}, {self.__field_dims[field_]}), got {value.shape}.')
+        if P is None:
+            inputs.append(None)
+
+        X_out = np.zeros((self.N_batch, self.__field_dims['x']), dtype=np.float64)
+        status = np.zeros((self.N_batch,), dtype=np.intc)
+
+        batch_simulate = getattr(self.__shared_lib, f"{self.__model_name}_acados_sim_batch_simulate")
+        def simulate_chunk(start, length, num_threads=1, time_per_thread_p=None):
+            data = [None if value is None else cast(value[start:].ctypes.data, POINTER(c_double)) for value in inputs + [X_out]]
+            batch_simulate(self.__solvers_pointer(start), *data, cast(status[start:].ctypes.data, POINTER(c_int)), length, num_threads, time_per_thread_p)
+
+        if self.__num_threads_in_batch_solve > 1:
+            simulate_chunk(0, self.N_batch, self.__num_threads, self.__time_per_thread_p)
+        else:
+            self.__run_chunked(simulate_chunk)
+
+        if np.any(status != 0):
+            raise Exception(f'AcadosSimBatchSolver.simulate_batch(): integrators {np.flatnonzero(status).tolist()} returned nonzero status.')
+
+        return X_out
+
+
+    def __del__(self):
+        if self.__thread_pool is not None:
+            self.__thread_pool.shutdown()
+            self.__thread_pool = None
 
 
     @property
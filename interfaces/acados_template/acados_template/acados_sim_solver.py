@@ -86,9 +86,11 @@ class AcadosSimSolver:
 
     # TODO move this to AcadosSim
     @classmethod
-    def generate(self, acados_sim: AcadosSim, json_file='acados_sim.json', cmake_builder: CMakeBuilder = None):
+    def generate(self, acados_sim: AcadosSim, json_file='acados_sim.json', cmake_builder: CMakeBuilder = None, verbose: bool = False):
         """
         Generates the code for an acados sim solver, given the description in acados_sim
+
+            :param verbose: if True, the time spent in the code generation of each CasADi function is printed; default: False
         """
 
         acados_sim.code_export_directory = os.path.abspath(acados_sim.code_export_directory)
@@ -104,7 +106,7 @@ class AcadosSimSolver:
                 detect_gnsf_structure(acados_sim)
 
         # generate code for external functions
-        acados_sim.generate_external_functions()
+        acados_sim.generate_external_functions(verbose=verbose)
         acados_sim.dump_to_json(json_file)
         acados_sim.render_templates(json_file, cmake_builder)
 
@@ -150,7 +152,7 @@ class AcadosSimSolver:
 
         # reuse existing json and casadi functions, when creating integrator from ocp
         if generate and not isinstance(acados_sim, AcadosOcp):
-            self.generate(acados_sim, json_file=json_file, cmake_builder=cmake_builder)
+            self.generate(acados_sim, json_file=json_file, cmake_builder=cmake_builder, verbose=verbose)
 
         if isinstance(acados_sim, AcadosOcp):
             print("Warning: An AcadosSimSolver is created from an AcadosOcp description.",
@@ -233,6 +235,10 @@ class AcadosSimSolver:
         getattr(self.shared_lib, f"{self.model_name}_acados_sim_solve").argtypes = [c_void_p]
         getattr(self.shared_lib, f"{self.model_name}_acados_sim_solve").restype = c_int
 
+        getattr(self.shared_lib, f"{self.model_name}_acados_sim_simulate_trajectory").argtypes = \
+            [c_void_p, POINTER(c_double), POINTER(c_double), c_int, POINTER(c_double), POINTER(c_double), POINTER(c_double)]
+        getattr(self.shared_lib, f"{self.model_name}_acados_sim_simulate_trajectory").restype = c_int
+
         self.gettable_vectors = ['x', 'u', 'z', 'S_adj']
         self.gettable_matrices = ['S_forw', 'Sx', 'Su', 'S_hess', 'S_algebraic']
         self.gettable_scalars = ['CPUtime', 'time_tot', 'ADtime', 'time_ad', 'LAtime', 'time_la']
@@ -265,6 +271,67 @@ class AcadosSimSolver:
         return x_next
 
 
+    def simulate_trajectory(self, x0, U, P=None, out=None, S_forw_out=None):
+        """
+        Simulate the system forward over a sequence of controls, starting from `x0`.
+        All integration steps are carried out in a single call to the shared library.
+
+            :param x0: initial state of shape (nx,)
+            :param U: controls of shape (N, nu); for nu = 1 also of shape (N,), for nu = 0 an array of shape (N, 0) is required
+            :param P: parameters, either None (keep current values), of shape (np,) (constant) or of shape (N, np)
+            :param out: optional preallocated C-contiguous array of shape (N+1, nx) to store the states in
+            :param S_forw_out: optional preallocated C-contiguous array of shape (N, nx, nx+nu);
+                if given, the forward sensitivities of each step are written into it, such that `S_forw_out[i]` equals `get('S_forw')` after step i.
+            :returns: array of shape (N+1, nx) containing the simulated states
+        """
+        nx = self.acados_sim.dims.nx
+        nu = self.acados_sim.dims.nu
+        np_ = self.acados_sim.dims.np
+
+        x0 = np.ascontiguousarray(x0, dtype=np.float64).ravel()
+        if x0.shape != (nx,):
+            raise Exception(f'AcadosSimSolver.simulate_trajectory(): x0 must have shape ({nx},), got {x0.shape}.')
+
+        U = np.ascontiguousarray(U, dtype=np.float64)
+        if U.ndim == 1 and nu == 1:
+            U = U.reshape((-1, nu))
+        if U.ndim != 2 or U.shape[1] != nu:
+            raise Exception(f'AcadosSimSolver.simulate_trajectory(): U must have shape (N, {nu}), got {U.shape}.')
+        n_steps = U.shape[0]
+
+        P_data = None
+        if P is not None:
+            P = np.ascontiguousarray(P, dtype=np.float64)
+            if P.ndim == 1:
+                self.set('p', P)
+            elif P.shape == (n_steps, np_):
+                P_data = cast(P.ctypes.data, POINTER(c_double))
+            else:
+                raise Exception(f'AcadosSimSolver.simulate_trajectory(): P must have shape ({np_},) or ({n_steps}, {np_}), got {P.shape}.')
+
+        if out is None:
+            out = np.zeros((n_steps+1, nx), dtype=np.float64)
+        elif out.shape != (n_steps+1, nx) or out.dtype != np.float64 or not out.flags['C_CONTIGUOUS']:
+            raise Exception(f'AcadosSimSolver.simulate_trajectory(): out must be a C-contiguous float64 array of shape ({n_steps+1}, {nx}).')
+
+        S_forw_data = None
+        if S_forw_out is not None:
+            if not self.acados_sim.solver_options.sens_forw:
+                raise Exception('AcadosSimSolver.simulate_trajectory(): S_forw_out requires solver_options.sens_forw = True.')
+            if S_forw_out.shape != (n_steps, nx, nx+nu) or S_forw_out.dtype != np.float64 or not S_forw_out.flags['C_CONTIGUOUS']:
+                raise Exception(f'AcadosSimSolver.simulate_trajectory(): S_forw_out must be a C-contiguous float64 array of shape ({n_steps}, {nx}, {nx+nu}).')
+            S_forw_data = cast(S_forw_out.ctypes.data, POINTER(c_double))
+
+        status = getattr(self.shared_lib, f"{self.model_name}_acados_sim_simulate_trajectory")(self.capsule,
+                    cast(x0.ctypes.data, POINTER(c_double)), cast(U.ctypes.data, POINTER(c_double)), n_steps,
+                    P_data, cast(out.ctypes.data, POINTER(c_double)), S_forw_data)
+
+        if status != 0:
+            raise Exception(f'acados_sim_solver for model {self.model_name} returned status {status} in simulate_trajectory().')
+
+        return out
+
+
     def solve(self):
         """
         Solve the simulation problem with current input.
@@ -70,15 +70,26 @@ cdef extern from "acados_c/ocp_nlp_interface.h":
         int start_stage, const char *field, void *value)
     int ocp_nlp_constraints_model_set(ocp_nlp_config *config, ocp_nlp_dims *dims,
         ocp_nlp_in *in_, int stage, const char *field, void *value)
+    int ocp_nlp_cost_model_get(ocp_nlp_config *config, ocp_nlp_dims *dims, ocp_nlp_in *in_,
+        int stage, const char *field, void *value)
+    void ocp_nlp_constraints_model_get(ocp_nlp_config *config, ocp_nlp_dims *dims,
+        ocp_nlp_in *in_, int stage, const char *field, void *value)
 
     # out
     void ocp_nlp_out_set(ocp_nlp_config *config, ocp_nlp_dims *dims, ocp_nlp_out *out,
         int stage, const char *field, void *value)
     void ocp_nlp_out_get(ocp_nlp_config *config, ocp_nlp_dims *dims, ocp_nlp_out *out,
         int stage, const char *field, void *value)
+    void ocp_nlp_out_set_values_to_zero(ocp_nlp_config *config, ocp_nlp_dims *dims, ocp_nlp_out *out)
     void ocp_nlp_get_at_stage(ocp_nlp_solver *solver, int stage, const char *field, void *value)
+    void ocp_nlp_get_from_iterate(ocp_nlp_solver *solver, int iter, int stage, const char *field, void *value)
+    void ocp_nlp_get_all(ocp_nlp_solver *solver, ocp_nlp_in *in_, ocp_nlp_out *out, const char *field, void *value)
+    void ocp_nlp_set_all(ocp_nlp_solver *solver, ocp_nlp_in *in_, ocp_nlp_out *out, const char *field, void *value)
+    void ocp_nlp_set_stages(ocp_nlp_solver *solver, ocp_nlp_in *in_, ocp_nlp_out *out, const char *field,
+        const int *stages, int n_stages, void *value)
     int ocp_nlp_dims_get_from_attr(ocp_nlp_config *config, ocp_nlp_dims *dims, ocp_nlp_out *out,
         int stage, const char *field)
+    int ocp_nlp_dims_get_total_from_attr(ocp_nlp_config *config, ocp_nlp_dims *dims, const char *field)
     void ocp_nlp_constraint_dims_get_from_attr(ocp_nlp_config *config, ocp_nlp_dims *dims, ocp_nlp_out *out,
         int stage, const char *field, int *dims_out)
     void ocp_nlp_cost_dims_get_from_attr(ocp_nlp_config *config, ocp_nlp_dims *dims, ocp_nlp_out *out,
@@ -101,6 +112,8 @@ cdef extern from "acados_c/ocp_nlp_interface.h":
     void ocp_nlp_eval_cost(ocp_nlp_solver *solver, ocp_nlp_in *nlp_in_, ocp_nlp_out *nlp_out)
     void ocp_nlp_eval_params_jac(ocp_nlp_solver *solver, ocp_nlp_in *nlp_in_, ocp_nlp_out *nlp_out)
     void ocp_nlp_eval_lagrange_grad_p(ocp_nlp_solver *solver, ocp_nlp_in *nlp_in_, const char *field, void* value)
+    void ocp_nlp_eval_solution_sens_adj_p(ocp_nlp_solver *solver, ocp_nlp_in *nlp_in, ocp_nlp_out *sens_nlp_out,
+        const char *field, int stage, double *out)
     # get/set
     void ocp_nlp_get(ocp_nlp_solver *solver, const char *field, void *return_value_)
     void ocp_nlp_set(ocp_nlp_solver *solver, int stage, const char *field, void *value)
@@ -38,6 +38,7 @@
 // standard
 #include <stdio.h>
 #include <stdlib.h>
+#include <string.h>
 
 {%- if solver_options.num_threads_in_batch_solve > 1 %}
 // openmp
@@ -417,17 +418,203 @@ int {{ model.name }}_acados_sim_solve({{ model.name }}_sim_solver_capsule *capsu
 }
 
 
-void {{ model.name }}_acados_sim_batch_solve({{ model.name }}_sim_solver_capsule ** capsules, int N_batch)
+void {{ model.name }}_acados_sim_batch_solve({{ model.name }}_sim_solver_capsule ** capsules, int N_batch,
+        int num_threads, double *time_per_thread)
 {
+    // num_threads and time_per_thread (NULL or of size num_threads) are only used if compiled with openmp
 {% if solver_options.num_threads_in_batch_solve > 1 %}
     int num_threads_bkp = omp_get_num_threads();
-    omp_set_num_threads({{ solver_options.num_threads_in_batch_solve }});
+    omp_set_num_threads(num_threads);
+    if (time_per_thread != NULL)
+    {
+        for (int k = 0; k < num_threads; k++)
+            time_per_thread[k] = 0.0;
+    }
 
     #pragma omp parallel for
 {%- endif %}
     for (int i = 0; i < N_batch; i++)
     {
+{%- if solver_options.num_threads_in_batch_solve > 1 %}
+        double t0 = omp_get_wtime();
+        sim_solve(capsules[i]->acados_sim_solver, capsules[i]->acados_sim_in, capsules[i]->acados_sim_out);
+        if (time_per_thread != NULL)
+            time_per_thread[omp_get_thread_num()] += omp_get_wtime() - t0;
+{%- else %}
         sim_solve(capsules[i]->acados_sim_solver, capsules[i]->acados_sim_in, capsules[i]->acados_sim_out);
+{%- endif %}
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    omp_set_num_threads( num_threads_bkp );
+{%- endif %}
+    return;
+}
+
+
+void {{ model.name }}_acados_sim_batch_set_flat({{ model.name }}_sim_solver_capsule ** capsules, const char *field, double *data, int N_data, int N_batch, int num_threads)
+{
+    int offset;
+    int dims_out[2];
+    // 0: sim_in, 1: sim_solver (initial guesses), 2: parameters
+    int target = 0;
+    if (!strcmp(field, "p"))
+    {
+        offset = {{ model.name | upper }}_NP;
+        target = 2;
+    }
+    else
+    {
+        sim_dims_get_from_attr(capsules[0]->acados_sim_config, capsules[0]->acados_sim_dims, field, dims_out);
+        offset = dims_out[0];
+        if (!strcmp(field, "xdot") || !strcmp(field, "z"))
+            target = 1;
+    }
+
+    if (N_batch*offset != N_data)
+    {
+        printf("sim_batch_set_flat: wrong input dimension, expected %d, got %d\n", N_batch*offset, N_data);
+        exit(1);
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    int num_threads_bkp = omp_get_num_threads();
+    omp_set_num_threads(num_threads);
+
+    #pragma omp parallel for
+{%- endif %}
+    for (int i = 0; i < N_batch; i++)
+    {
+        if (target == 2)
+            {{ model.name }}_acados_sim_update_params(capsules[i], data + i * offset, offset);
+        else if (target == 1)
+            sim_solver_set(capsules[i]->acados_sim_solver, field, data + i * offset);
+        else
+            sim_in_set(capsules[i]->acados_sim_config, capsules[i]->acados_sim_dims, capsules[i]->acados_sim_in, field, data + i * offset);
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    omp_set_num_threads( num_threads_bkp );
+{%- endif %}
+    return;
+}
+
+
+void {{ model.name }}_acados_sim_batch_get_flat({{ model.name }}_sim_solver_capsule ** capsules, const char *field, double *data, int N_data, int N_batch, int num_threads)
+{
+    int dims_out[2];
+    sim_dims_get_from_attr(capsules[0]->acados_sim_config, capsules[0]->acados_sim_dims, field, dims_out);
+    int offset = dims_out[1] > 0 ? dims_out[0] * dims_out[1] : dims_out[0];
+
+    if (N_batch*offset != N_data)
+    {
+        printf("sim_batch_get_flat: wrong output dimension, expected %d, got %d\n", N_batch*offset, N_data);
+        exit(1);
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    int num_threads_bkp = omp_get_num_threads();
+    omp_set_num_threads(num_threads);
+
+    #pragma omp parallel for
+{%- endif %}
+    for (int i = 0; i < N_batch; i++)
+    {
+        sim_out_get(capsules[i]->acados_sim_config, capsules[i]->acados_sim_dims, capsules[i]->acados_sim_out, field, data + i * offset);
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    omp_set_num_threads( num_threads_bkp );
+{%- endif %}
+    return;
+}
+
+
+void {{ model.name }}_acados_sim_batch_get_matrix({{ model.name }}_sim_solver_capsule ** capsules, const char *field, double *data, int N_data, int N_batch, int num_threads)
+{
+    // writes the matrices in row-major order, i.e. data has layout N_batch x nrow x ncol
+    if (strcmp(field, "S_forw") && strcmp(field, "Sx") && strcmp(field, "Su"))
+    {
+        printf("sim_batch_get_matrix: field %s not supported, supported fields are S_forw, Sx, Su\n", field);
+        exit(1);
+    }
+
+    int dims_out[2];
+    sim_dims_get_from_attr(capsules[0]->acados_sim_config, capsules[0]->acados_sim_dims, field, dims_out);
+    int nrow = dims_out[0];
+    int ncol = dims_out[1];
+
+    if (N_batch*nrow*ncol != N_data)
+    {
+        printf("sim_batch_get_matrix: wrong output dimension, expected %d, got %d\n", N_batch*nrow*ncol, N_data);
+        exit(1);
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    int num_threads_bkp = omp_get_num_threads();
+    omp_set_num_threads(num_threads);
+
+    #pragma omp parallel for
+{%- endif %}
+    for (int i = 0; i < N_batch; i++)
+    {
+        double tmp[{{ dims.nx * (dims.nx + dims.nu) }}];
+        double *block = data + i * nrow * ncol;
+        sim_out_get(capsules[i]->acados_sim_config, capsules[i]->acados_sim_dims, capsules[i]->acados_sim_out, field, tmp);
+        for (int jj = 0; jj < ncol; jj++)
+            for (int ii = 0; ii < nrow; ii++)
+                block[ii * ncol + jj] = tmp[ii + jj * nrow];
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    omp_set_num_threads( num_threads_bkp );
+{%- endif %}
+    return;
+}
+
+
+void {{ model.name }}_acados_sim_batch_simulate({{ model.name }}_sim_solver_capsule ** capsules, double *X, double *U,
+        double *P, double *X_out, int *status_out, int N_batch, int num_threads, double *time_per_thread)
+{
+    // X, X_out: N_batch * nx, U: N_batch * nu, P: NULL or N_batch * np
+    // num_threads and time_per_thread (NULL or of size num_threads) are only used if compiled with openmp
+    int nx = {{ model.name | upper }}_NX;
+    int nu = {{ model.name | upper }}_NU;
+    int np = {{ model.name | upper }}_NP;
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    int num_threads_bkp = omp_get_num_threads();
+    omp_set_num_threads(num_threads);
+    if (time_per_thread != NULL)
+    {
+        for (int k = 0; k < num_threads; k++)
+            time_per_thread[k] = 0.0;
+    }
+
+    #pragma omp parallel for
+{%- endif %}
+    for (int i = 0; i < N_batch; i++)
+    {
+{%- if solver_options.num_threads_in_batch_solve > 1 %}
+        double t0 = omp_get_wtime();
+{%- endif %}
+        sim_config *config = capsules[i]->acados_sim_config;
+        void *dims = capsules[i]->acados_sim_dims;
+        sim_in *in = capsules[i]->acados_sim_in;
+        sim_out *out = capsules[i]->acados_sim_out;
+
+        sim_in_set(config, dims, in, "x", X + i * nx);
+        if (nu > 0)
+            sim_in_set(config, dims, in, "u", U + i * nu);
+        if (P != NULL)
+            {{ model.name }}_acados_sim_update_params(capsules[i], P + i * np, np);
+
+        status_out[i] = sim_solve(capsules[i]->acados_sim_solver, in, out);
+        sim_out_get(config, dims, out, "x", X_out + i * nx);
+{%- if solver_options.num_threads_in_batch_solve > 1 %}
+        if (time_per_thread != NULL)
+            time_per_thread[omp_get_thread_num()] += omp_get_wtime() - t0;
+{%- endif %}
     }
 
 {% if solver_options.num_threads_in_batch_solve > 1 %}
@@ -437,6 +624,52 @@ void {{ model.name }}_acados_sim_batch_solve({{ model.name }}_sim_solver_capsule
 }
 
 
+int {{ model.name }}_acados_sim_simulate_trajectory({{ model.name }}_sim_solver_capsule *capsule, double *x0,
+        double *U, int n_steps, double *P, double *X_out, double *S_forw_out)
+{
+    // X_out: (n_steps+1) * nx, U: n_steps * nu, P: NULL or n_steps * np,
+    // S_forw_out: NULL or n_steps * nx * (nx+nu), the matrices are written in row-major order as in sim_batch_get_matrix
+    sim_config *config = capsule->acados_sim_config;
+    void *dims = capsule->acados_sim_dims;
+    sim_in *in = capsule->acados_sim_in;
+    sim_out *out = capsule->acados_sim_out;
+
+    int nx = {{ model.name | upper }}_NX;
+    int nu = {{ model.name | upper }}_NU;
+    int np = {{ model.name | upper }}_NP;
+    int status = 0;
+    double S_forw[{{ dims.nx * (dims.nx + dims.nu) }}];
+
+    for (int ii = 0; ii < nx; ii++)
+        X_out[ii] = x0[ii];
+
+    for (int i = 0; i < n_steps; i++)
+    {
+        sim_in_set(config, dims, in, "x", X_out + i*nx);
+        if (nu > 0)
+            sim_in_set(config, dims, in, "u", U + i*nu);
+        if (P != NULL)
+            {{ model.name }}_acados_sim_update_params(capsule, P + i*np, np);
+
+        status = sim_solve(capsule->acados_sim_solver, in, out);
+        if (status != 0)
+            return status;
+
+        sim_out_get(config, dims, out, "x", X_out + (i+1)*nx);
+        if (S_forw_out != NULL)
+        {
+            double *block = S_forw_out + i*nx*(nx+nu);
+            sim_out_get(config, dims, out, "S_forw", S_forw);
+            for (int jj = 0; jj < nx+nu; jj++)
+                for (int ii = 0; ii < nx; ii++)
+                    block[ii * (nx+nu) + jj] = S_forw[ii + jj * nx];
+        }
+    }
+
+    return status;
+}
+
+
 int {{ model.name }}_acados_sim_free({{ model.name }}_sim_solver_capsule *capsule)
 {
     // free memory
@@ -80,7 +80,15 @@ typedef struct {{ model.name }}_sim_solver_capsule
 
 ACADOS_SYMBOL_EXPORT int {{ model.name }}_acados_sim_create({{ model.name }}_sim_solver_capsule *capsule);
 ACADOS_SYMBOL_EXPORT int {{ model.name }}_acados_sim_solve({{ model.name }}_sim_solver_capsule *capsule);
-ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_sim_batch_solve({{ model.name }}_sim_solver_capsule **capsules, int N_batch);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_sim_batch_solve({{ model.name }}_sim_solver_capsule **capsules, int N_batch,
+        int num_threads, double *time_per_thread);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_sim_batch_set_flat({{ model.name }}_sim_solver_capsule **capsules, const char *field, double *data, int N_data, int N_batch, int num_threads);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_sim_batch_get_flat({{ model.name }}_sim_solver_capsule **capsules, const char *field, double *data, int N_data, int N_batch, int num_threads);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_sim_batch_get_matrix({{ model.name }}_sim_solver_capsule **capsules, const char *field, double *data, int N_data, int N_batch, int num_threads);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_sim_batch_simulate({{ model.name }}_sim_solver_capsule **capsules, double *X, double *U,
+        double *P, double *X_out, int *status_out, int N_batch, int num_threads, double *time_per_thread);
+ACADOS_SYMBOL_EXPORT int {{ model.name }}_acados_sim_simulate_trajectory({{ model.name }}_sim_solver_capsule *capsule, double *x0,
+        double *U, int n_steps, double *P, double *X_out, double *S_forw_out);
 ACADOS_SYMBOL_EXPORT int {{ model.name }}_acados_sim_free({{ model.name }}_sim_solver_capsule *capsule);
 ACADOS_SYMBOL_EXPORT int {{ model.name }}_acados_sim_update_params({{ model.name }}_sim_solver_capsule *capsule, double *value, int np);
 
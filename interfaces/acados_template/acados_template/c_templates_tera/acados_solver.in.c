@@ -2766,17 +2766,62 @@ int {{ model.name }}_acados_solve({{ model.name }}_solver_capsule* capsule)
 }
 
 
-void {{ model.name }}_acados_batch_solve({{ model.name }}_solver_capsule ** capsules, int * status_out, int N_batch)
+int {{ model.name }}_acados_batch_create({{ model.name }}_solver_capsule ** capsules, int N_batch)
 {
+    // on failure, all solvers created so far are freed and the capsules are set to NULL
+    for (int i = 0; i < N_batch; i++)
+    {
+        capsules[i] = {{ model.name }}_acados_create_capsule();
+        int status = {{ model.name }}_acados_create(capsules[i]);
+        if (status != 0)
+        {
+            printf("{{ model.name }}_acados_batch_create: creating solver %d failed with status %d\n", i, status);
+            {{ model.name }}_acados_free_capsule(capsules[i]);
+            capsules[i] = NULL;
+            {{ model.name }}_acados_batch_free(capsules, i);
+            return status;
+        }
+    }
+    return 0;
+}
+
+
+void {{ model.name }}_acados_batch_free({{ model.name }}_solver_capsule ** capsules, int N_batch)
+{
+    for (int i = 0; i < N_batch; i++)
+    {
+        {{ model.name }}_acados_free(capsules[i]);
+        {{ model.name }}_acados_free_capsule(capsules[i]);
+        capsules[i] = NULL;
+    }
+}
+
+
+void {{ model.name }}_acados_batch_solve({{ model.name }}_solver_capsule ** capsules, int * status_out, int N_batch,
+        int num_threads, double *time_per_thread)
+{
+    // num_threads and time_per_thread (NULL or of size num_threads) are only used if compiled with openmp
 {% if solver_options.num_threads_in_batch_solve > 1 %}
     int num_threads_bkp = omp_get_num_threads();
-    omp_set_num_threads({{ solver_options.num_threads_in_batch_solve }});
+    omp_set_num_threads(num_threads);
+    if (time_per_thread != NULL)
+    {
+        for (int k = 0; k < num_threads; k++)
+            time_per_thread[k] = 0.0;
+    }
 
     #pragma omp parallel for
 {%- endif %}
     for (int i = 0; i < N_batch; i++)
     {
+{%- if solver_options.num_threads_in_batch_solve > 1 %}
+        double t0 = omp_get_wtime();
         status_out[i] = ocp_nlp_solve(capsules[i]->nlp_solver, capsules[i]->nlp_in, capsules[i]->nlp_out);
+        if (time_per_thread != NULL)
+            time_per_thread[omp_get_thread_num()] += omp_get_wtime() - t0;
+{%- else %}
+        status_out[i] = ocp_nlp_solve(capsules[i]->nlp_solver, capsules[i]->nlp_in, capsules[i]->nlp_out);
+{%- endif %}
     }
 
 {% if solver_options.num_threads_in_batch_solve > 1 %}
@@ -2786,6 +2831,33 @@ void {{ model.name }}_acados_batch_solve({{ model.name }}_solver_capsule ** caps
 }
 
 
+void {{ model.name }}_acados_batch_get_stats_double({{ model.name }}_solver_capsule ** capsules, const char *field, double *out, int N_batch)
+{
+    for (int i = 0; i < N_batch; i++)
+    {
+        ocp_nlp_get(capsules[i]->nlp_solver, field, out + i);
+    }
+}
+
+
+void {{ model.name }}_acados_batch_set_rti_phase({{ model.name }}_solver_capsule ** capsules, int rti_phase, int N_batch)
+{
+    for (int i = 0; i < N_batch; i++)
+    {
+        ocp_nlp_solver_opts_set(capsules[i]->nlp_config, capsules[i]->nlp_opts, "rti_phase", &rti_phase);
+    }
+}
+
+
+void {{ model.name }}_acados_batch_reset_sens_out({{ model.name }}_solver_capsule ** capsules, int N_batch)
+{
+    for (int i = 0; i < N_batch; i++)
+    {
+        ocp_nlp_out_set_values_to_zero(capsules[i]->nlp_config, capsules[i]->nlp_dims, capsules[i]->sens_out);
+    }
+}
+
+
 void {{ model.name }}_acados_batch_eval_params_jac({{ model.name }}_solver_capsule ** capsules, int N_batch)
 {
 {% if solver_options.num_threads_in_batch_solve > 1 %}
@@ -2828,6 +2900,70 @@ void {{ model.name }}_acados_batch_eval_solution_sens_adj_p({{ model.name }}_sol
 }
 
 
+void {{ model.name }}_acados_batch_eval_solution_sens({{ model.name }}_solver_capsule ** capsules, char *field, int n_seeds,
+        double *sens_x, double *sens_u, int offset_x, int offset_u, int N_batch, int num_threads)
+{
+    // sens_x, sens_u can be NULL, num_threads is only used if compiled with openmp
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    int num_threads_bkp = omp_get_num_threads();
+    omp_set_num_threads(num_threads);
+
+    #pragma omp parallel for
+{%- endif %}
+    for (int i = 0; i < N_batch; i++)
+    {
+        ocp_nlp_eval_param_sens_all(capsules[i]->nlp_solver, field, n_seeds, capsules[i]->sens_out,
+                sens_x == NULL ? NULL : sens_x + i*offset_x, sens_u == NULL ? NULL : sens_u + i*offset_u,
+                NULL, NULL, NULL, NULL, NULL);
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    omp_set_num_threads( num_threads_bkp );
+{%- endif %}
+    return;
+}
+
+
+void {{ model.name }}_acados_batch_set_p_global_and_precompute_dependencies({{ model.name }}_solver_capsule ** capsules, double* data, int data_len, int stride, int N_batch,
+        int num_threads)
+{
+    // num_threads is only used if compiled with openmp
+{%- if dims.np_global > 0 %}
+    // stride = 0: all solvers share p_global = data, the dependencies are evaluated once and copied to the other solvers
+    if (stride == 0)
+    {
+        {{ model.name }}_acados_set_p_global_and_precompute_dependencies(capsules[0], data, data_len);
+        double *global_data_0 = {{ model.name }}_acados_get_nlp_in(capsules[0])->global_data;
+        for (int i = 1; i < N_batch; i++)
+        {
+            double *global_data = {{ model.name }}_acados_get_nlp_in(capsules[i])->global_data;
+            for (int j = 0; j < {{ dims.n_global_data }}; j++)
+                global_data[j] = global_data_0[j];
+        }
+        return;
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    int num_threads_bkp = omp_get_num_threads();
+    omp_set_num_threads(num_threads);
+
+    #pragma omp parallel for
+{%- endif %}
+    for (int i = 0; i < N_batch; i++)
+    {
+        {{ model.name }}_acados_set_p_global_and_precompute_dependencies(capsules[i], data + i*stride, data_len);
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    omp_set_num_threads( num_threads_bkp );
+{%- endif %}
+{%- else %}
+    printf("p_global is not defined, {{ model.name }}_acados_batch_set_p_global_and_precompute_dependencies does nothing.\n");
+{%- endif %}
+    return;
+}
+
+
 void {{ model.name }}_acados_batch_set_flat({{ model.name }}_solver_capsule ** capsules, const char *field, double *data, int N_data, int N_batch)
 {
     int offset = ocp_nlp_dims_get_total_from_attr(capsules[0]->nlp_solver->config, capsules[0]->nlp_solver->dims, field);
@@ -2885,6 +3021,65 @@ void {{ model.name }}_acados_batch_get_flat({{ model.name }}_solver_capsule ** c
 }
 
 
+void {{ model.name }}_acados_batch_update_params_sparse({{ model.name }}_solver_capsule ** capsules, const int *stages, int n_stages,
+        int *idx, double *p, int n_update, int stride_stage, int stride_batch, int N_batch, int num_threads)
+{
+    // the value of p[idx[k]] at stages[j] of solver i is p[i*stride_batch + j*stride_stage + k], zero strides broadcast the values
+    // num_threads is only used if compiled with openmp
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    int num_threads_bkp = omp_get_num_threads();
+    omp_set_num_threads(num_threads);
+
+    #pragma omp parallel for
+{%- endif %}
+    for (int i = 0; i < N_batch; i++)
+    {
+        for (int j = 0; j < n_stages; j++)
+        {
+            ocp_nlp_in_set_params_sparse(capsules[i]->nlp_config, capsules[i]->nlp_dims, capsules[i]->nlp_in, stages[j],
+                    idx, p + i*stride_batch + j*stride_stage, n_update);
+        }
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    omp_set_num_threads( num_threads_bkp );
+{%- endif %}
+    return;
+}
+
+
+void {{ model.name }}_acados_batch_set_stages({{ model.name }}_solver_capsule ** capsules, const char *field, const int *stages, int n_stages, double *data, int N_data, int N_batch, int num_threads)
+{
+    int offset = 0;
+    for (int j = 0; j < n_stages; j++)
+    {
+        offset += ocp_nlp_dims_get_from_attr(capsules[0]->nlp_solver->config, capsules[0]->nlp_solver->dims, capsules[0]->nlp_out, stages[j], field);
+    }
+
+    if (N_batch*offset != N_data)
+    {
+        printf("batch_set_stages: wrong input dimension, expected %d, got %d\n", N_batch*offset, N_data);
+        exit(1);
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    int num_threads_bkp = omp_get_num_threads();
+    omp_set_num_threads(num_threads);
+
+    #pragma omp parallel for
+{%- endif %}
+    for (int i = 0; i < N_batch; i++)
+    {
+        ocp_nlp_set_stages(capsules[i]->nlp_solver, capsules[i]->nlp_in, capsules[i]->nlp_out, field, stages, n_stages, data + i * offset);
+    }
+
+{% if solver_options.num_threads_in_batch_solve > 1 %}
+    omp_set_num_threads( num_threads_bkp );
+{%- endif %}
+    return;
+}
+
+
 int {{ model.name }}_acados_free({{ model.name }}_solver_capsule* capsule)
 {
     // before destroying, keep some info
@@ -294,13 +294,26 @@ ACADOS_SYMBOL_EXPORT int {{ name }}_acados_set_p_global_and_precompute_dependenc
 
 ACADOS_SYMBOL_EXPORT int {{ model.name }}_acados_solve({{ model.name }}_solver_capsule * capsule);
 
-ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_solve({{ model.name }}_solver_capsule ** capsules, int * status_out, int N_batch);
+ACADOS_SYMBOL_EXPORT int {{ model.name }}_acados_batch_create({{ model.name }}_solver_capsule ** capsules, int N_batch);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_free({{ model.name }}_solver_capsule ** capsules, int N_batch);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_solve({{ model.name }}_solver_capsule ** capsules, int * status_out, int N_batch,
+        int num_threads, double *time_per_thread);
 
 ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_set_flat({{ model.name }}_solver_capsule ** capsules, const char *field, double *data, int N_data, int N_batch);
 ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_get_flat({{ model.name }}_solver_capsule ** capsules, const char *field, double *data, int N_data, int N_batch);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_set_stages({{ model.name }}_solver_capsule ** capsules, const char *field, const int *stages, int n_stages, double *data, int N_data, int N_batch, int num_threads);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_update_params_sparse({{ model.name }}_solver_capsule ** capsules, const int *stages, int n_stages,
+        int *idx, double *p, int n_update, int stride_stage, int stride_batch, int N_batch, int num_threads);
 
 ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_eval_solution_sens_adj_p({{ model.name }}_solver_capsule ** capsules, const char *field, int stage, double *out, int offset, int N_batch);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_eval_solution_sens({{ model.name }}_solver_capsule ** capsules, char *field, int n_seeds,
+        double *sens_x, double *sens_u, int offset_x, int offset_u, int N_batch, int num_threads);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_get_stats_double({{ model.name }}_solver_capsule ** capsules, const char *field, double *out, int N_batch);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_set_rti_phase({{ model.name }}_solver_capsule ** capsules, int rti_phase, int N_batch);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_reset_sens_out({{ model.name }}_solver_capsule ** capsules, int N_batch);
 ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_eval_params_jac({{ model.name }}_solver_capsule ** capsules, int N_batch);
+ACADOS_SYMBOL_EXPORT void {{ model.name }}_acados_batch_set_p_global_and_precompute_dependencies({{ model.name }}_solver_capsule ** capsules, double* data, int data_len, int stride, int N_batch,
+        int num_threads);
 
 
 ACADOS_SYMBOL_EXPORT int {{ model.name }}_acados_free({{ model.name }}_solver_capsule * capsule);
@@ -31,6 +31,8 @@
 from typing import Union, List, Optional
 
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 import casadi as ca
 from .utils import is_empty, casadi_length, check_casadi_version_supports_p_global, print_casadi_expression, set_directory
 from .acados_model import AcadosModel
@@ -43,6 +45,25 @@ def is_casadi_SX(x):
     return False
 
 
+def _generate_function(fun: ca.Function, name: str, output_dir: str, casadi_codegen_opts: dict) -> float:
+    """Generates C code for the function in output_dir, returns the time spent in seconds."""
+    t0 = time.time()
+    with set_directory(output_dir):
+        try:
+            fun.generate(name, casadi_codegen_opts)
+        except Exception as e:
+            print(f"Error while generating function {name} in directory {output_dir}")
+            print(e)
+            raise e
+    return time.time() - t0
+
+
+def _generate_serialized_function(fun_serialized: str, name: str, output_dir: str, casadi_codegen_opts: dict) -> float:
+    """Worker function for parallel code generation, the working directory is process local."""
+    fun = ca.Function.deserialize(fun_serialized)
+    return _generate_function(fun, name, output_dir, casadi_codegen_opts)
+
+
 class GenerateContext:
     def __init__(self, p_global: Optional[Union[ca.SX, ca.MX]], problem_name: str, opts=None):
         self.p_global = p_global
@@ -61,6 +82,8 @@ class GenerateContext:
         self.global_data_sym = None
         self.global_data_expr = None
 
+        self.generation_times = dict()  # function_name -> time in seconds spent in code generation
+
         # check if CasADi version supports cse
         try:
             from casadi import cse
@@ -73,8 +96,12 @@ class GenerateContext:
 
 
     def __generate_functions(self):
+        num_processes = 1 if self.opts is None else self.opts.get('num_processes', 1)
+        verbose = False if self.opts is None else self.opts.get('verbose', False)
+
+        # create functions
+        functions = []
         for (name, output_dir), (inputs, outputs) in zip(self.list_funname_dir_pairs, self.function_input_output_pairs):
-            # create function
             try:
                 fun = ca.Function(name, inputs, outputs, self.__casadi_fun_opts)
                 # print(f"Generating function {name} with inputs {inputs}")
@@ -87,13 +114,22 @@ class GenerateContext:
             if not os.path.exists(output_dir):
                 os.makedirs(output_dir)
 
-            with set_directory(output_dir):
-                try:
-                    fun.generate(name, self.casadi_codegen_opts)
-                except Exception as e:
-                    print(f"Error while generating function {name} in directory {output_dir}")
-                    print(e)
-                    raise e
+            functions.append((name, output_dir, fun))
+
+        # generate C code
+        if num_processes > 1 and len(functions) > 1:
+            # functions are passed to the worker processes in serialized form
+            with ProcessPoolExecutor(max_workers=num_processes) as executor:
+                futures = [executor.submit(_generate_serialized_function, fun.serialize(), name, os.path.abspath(output_dir), self.casadi_codegen_opts)
+                           for name, output_dir, fun in functions]
+                for (name, _, _), future in zip(functions, futures):
+                    self.generation_times[name] = future.result()
+        else:
+            for name, output_dir, fun in functions:
+                self.generation_times[name] = _generate_function(fun, name, output_dir, self.casadi_codegen_opts)
+
+        if verbose and len(functions) > 0:
+            self.print_generation_times()
 
 
     def add_external_function_file(self, fun_name: str, output_dir: str):
@@ -178,6 +214,12 @@ class GenerateContext:
             out.append(f"{rel_fun_dir}/{fun_name}.c")
         return out
 
+    def print_generation_times(self) -> None:
+        total_time = sum(self.generation_times.values())
+        print(f"\nGenerateContext: generated {len(self.generation_times)} functions, total generation time {total_time:.3f}s:")
+        for name, t in sorted(self.generation_times.items(), key=lambda item: item[1], reverse=True):
+            print(f"  {name}: {t:.3f}s")
+
     def print_global_data_summary(self) -> None:
         if casadi_length(self.global_data_expr) == 0:
             print("\nGenerateContext: detected empty global_data_expr.")
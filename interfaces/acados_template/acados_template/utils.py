@@ -30,11 +30,15 @@
 #
 
 from typing import Union
+import hashlib
+import itertools
 import json
 import os
 import shutil
 import sys
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
 from subprocess import DEVNULL, STDOUT, call
 if os.name == 'nt':
     from ctypes import wintypes
@@ -88,6 +92,35 @@ def set_directory(path: str):
         os.chdir(origin)
 
 
+@contextmanager
+def keep_timestamps_of_unchanged_files(path: str, ignored_extensions=('.o', '.so', '.dll', '.dylib', '.a', '.lib')):
+    """
+    Files in path, that are rewritten within the context with unchanged content, keep their previous timestamps.
+    This allows build systems to only recompile files with changed content.
+    """
+    def get_file_hashes():
+        file_hashes = dict()
+        for root, _, files in os.walk(path):
+            for filename in files:
+                if filename.endswith(ignored_extensions):
+                    continue
+                filepath = os.path.join(root, filename)
+                with open(filepath, 'rb') as f:
+                    file_hashes[filepath] = hashlib.sha256(f.read()).hexdigest()
+        return file_hashes
+
+    old_file_hashes = get_file_hashes() if os.path.isdir(path) else dict()
+    old_file_stats = {filepath: os.stat(filepath) for filepath in old_file_hashes}
+    try:
+        yield
+    finally:
+        new_file_hashes = get_file_hashes() if os.path.isdir(path) else dict()
+        for filepath, file_hash in new_file_hashes.items():
+            if old_file_hashes.get(filepath) == file_hash:
+                stat = old_file_stats[filepath]
+                os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
 def check_if_square(mat: np.ndarray, name: str):
     if mat.shape[0] != mat.shape[1]:
         raise ValueError(f"Matrix {name} must be square, got shape {mat.shape}.")
@@ -146,6 +179,27 @@ def get_shared_lib(shared_lib_name: str, winmode = None) -> DllLoader:
     return shared_lib
 
 
+def create_batch_thread_pool(num_threads: int, pin_threads: bool = False) -> ThreadPoolExecutor:
+    """
+    Create a thread pool with `num_threads` workers for batch solves.
+    If `pin_threads` is True, the k-th worker is pinned to the k-th CPU available to the process (Linux only).
+    """
+    if not pin_threads:
+        return ThreadPoolExecutor(max_workers=num_threads)
+
+    if not hasattr(os, 'sched_setaffinity'):
+        raise Exception('Pinning threads is only supported on Linux.')
+
+    cpus = sorted(os.sched_getaffinity(0))
+    worker_ids = itertools.count()
+
+    def pin_worker():
+        # on Linux, pid 0 refers to the calling thread
+        os.sched_setaffinity(0, {cpus[next(worker_ids) % len(cpus)]})
+
+    return ThreadPoolExecutor(max_workers=num_threads, initializer=pin_worker)
+
+
 def check_casadi_version():
     casadi_version = CasadiMeta.version()
     if casadi_version in ALLOWED_CASADI_VERSIONS:
@@ -296,29 +350,109 @@ def get_tera() -> str:
     return tera_path
 
 
-def render_template(in_file, out_file, output_dir, json_path, template_glob=None):
+def _get_render_template_cmd(tera_path, in_file, out_file, json_path, template_glob=None) -> list:
 
-    acados_path = os.path.dirname(os.path.abspath(__file__))
     if template_glob is None:
+        acados_path = os.path.dirname(os.path.abspath(__file__))
         head, in_file = os.path.split(in_file)
         template_glob = os.path.join(acados_path, 'c_templates_tera', head, '**', '*')
 
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    return [tera_path, template_glob, in_file, json_path, out_file]
 
-    with set_directory(output_dir):
-        tera_path = get_tera()
 
-        # call tera as system cmd
-        os_cmd = f"{tera_path} '{template_glob}' '{in_file}' '{json_path}' '{out_file}'"
-        # Windows cmd.exe can not cope with '...', so use "..." instead:
-        if os.name == 'nt':
-            os_cmd = os_cmd.replace('\'', '\"')
+def render_template(in_file, out_file, output_dir, json_path, template_glob=None):
+    render_template_list([(in_file, out_file)], output_dir, json_path, template_glob=template_glob, num_workers=1)
+
+
+def render_template_list(template_list: list, output_dir, json_path, template_glob=None, num_workers=None):
+    """
+    Renders all templates in template_list using the tera renderer.
+
+    The t_renderer binary renders a single template per call, such that one process is started per template
+    and each process parses the json file again.
+    The renderer processes are run concurrently, each one in its output directory.
+    Since parsing a large json file dominates the rendering time, the number of concurrent processes is capped.
+
+    :param template_list: list of tuples (input_filename, output_filename) or (input_filename, output_filename, output_directory)
+    :param output_dir: default output directory
+    :param json_path: absolute path to the json file used for rendering
+    :param template_glob: glob of the template files, if None the templates shipped with acados_template are used
+    :param num_workers: maximum number of concurrent renderer processes, default: min(4, number of CPUs)
+    """
+    if len(template_list) == 0:
+        return
+
+    tera_path = get_tera()
+
+    jobs = []
+    for tup in template_list:
+        out_dir = output_dir if len(tup) <= 2 else tup[2]
+        if not os.path.exists(out_dir):
+            os.makedirs(out_dir, exist_ok=True)
+        jobs.append((_get_render_template_cmd(tera_path, tup[0], tup[1], json_path, template_glob), out_dir))
 
-        status = os.system(os_cmd)
+    if num_workers is None:
+        num_workers = min(4, os.cpu_count() or 1)
+    num_workers = max(1, min(num_workers, len(jobs)))
+
+    def run_job(job):
+        cmd, cwd = job
+        return call(cmd, cwd=cwd)
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        status_list = list(executor.map(run_job, jobs))
+
+    for (cmd, _), status in zip(jobs, status_list):
         if status != 0:
-            raise Exception(f'Rendering of {in_file} failed!\n\nAttempted to execute OS command:\n{os_cmd}\n\n')
+            os_cmd = ' '.join(f"'{arg}'" for arg in cmd)
+            raise Exception(f'Rendering of {cmd[2]} failed!\n\nAttempted to execute OS command:\n{os_cmd}\n\n')
+
 
+def get_build_hash(problem_dict: dict, cmake_builder=None, extra_files: Union[list, None] = None) -> str:
+    """
+    Returns a hash identifying the shared library that is built from the given problem description.
+
+    The hash covers the problem dictionary including all CasADi expressions, the CasADi version,
+    the content of all templates, the compile flags and the content of the acados library.
+
+    :param problem_dict: dictionary describing the problem, see `AcadosOcp.to_dict()`
+    :param cmake_builder: type :py:class:`~acados_template.builders.CMakeBuilder`, if used for building
+    :param extra_files: additional files that are compiled into the shared library, e.g. custom update files,
+        as list of tuples (name, path), where name is the filename as given in the problem description
+    """
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps(problem_dict, default=make_object_json_dumpable, sort_keys=True).encode())
+    hasher.update(CasadiMeta.version().encode())
+
+    # compile flags and build setup
+    if cmake_builder is not None:
+        hasher.update(json.dumps(vars(cmake_builder), default=str, sort_keys=True).encode())
+    for key in ['CC', 'CFLAGS', 'LDFLAGS', 'ACADOS_EXT_FUN_COMPILE_FLAGS']:
+        hasher.update(f"{key}={os.environ.get(key, '')}".encode())
+
+    # templates and extra source files
+    acados_template_path = os.path.dirname(os.path.abspath(__file__))
+    template_files = sorted(glob(os.path.join(acados_template_path, 'c_templates_tera', '**', '*'), recursive=True))
+    template_files += sorted(glob(os.path.join(acados_template_path, 'custom_update_templates', '*')))
+    files = [(os.path.relpath(f, acados_template_path), f) for f in template_files]
+    if extra_files is not None:
+        files += list(extra_files)
+    for key, filename in files:
+        if os.path.isfile(filename):
+            hasher.update(key.encode())
+            with open(filename, 'rb') as f:
+                hasher.update(f.read())
+
+    # acados library the solver is linked against
+    acados_lib_path = problem_dict.get('acados_lib_path', None)
+    if acados_lib_path is not None:
+        libacados_filepath = os.path.join(acados_lib_path, '..', get_shared_lib_dir(), f'{get_shared_lib_prefix()}acados{get_shared_lib_ext()}')
+        if os.path.exists(libacados_filepath):
+            with open(libacados_filepath, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    hasher.update(chunk)
+
+    return hasher.hexdigest()
 
 
 def casadi_expr_to_string(expr) -> str: